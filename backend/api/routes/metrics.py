@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from services.data_store import data_store
+from services.gemini_service import gemini_service
+from services.ml_service import ml_service
+from services.speculation_service import speculation
+from services.tracing import render_gauges, tracer
+from services.tts_service import tts_service
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Stage latency histograms and pipeline counters in Prometheus text format."""
+    lines = [tracer.render().rstrip("\n")]
+    lines += render_gauges("signspeak_playback", tts_service.player.stats())
+    lines += render_gauges("signspeak_audio_cache", tts_service.cache.stats() if tts_service.cache else {})
+    lines += render_gauges("signspeak_sentence_cache", gemini_service.cache_stats())
+    lines += render_gauges("signspeak_speculation", speculation.stats())
+    lines += render_gauges("signspeak_ml_cascade", ml_service.cascade_stats() or {})
+    lines += render_gauges("signspeak", {"devices": len(data_store.devices), "store_version": data_store.version})
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
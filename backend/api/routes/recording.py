@@ -0,0 +1,40 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from services.recording_service import recording_service
+
+router = APIRouter()
+
+class RecordingStart(BaseModel):
+    store: str = "default" # Directory under RECORDINGS_DIR (appended to if it exists)
+    label: Optional[str] = None
+    devices: Optional[List[str]] = None # Gloves to record (all if omitted)
+
+class RecordingLabel(BaseModel):
+    label: Optional[str] = None # None = unlabeled (e.g. between gestures)
+    device: Optional[str] = None # One glove, or all if omitted
+
+@router.post("/start")
+def start_recording(request: RecordingStart):
+    """Start recording the live frame stream of the gloves into a recording store."""
+    try:
+        return recording_service.start(request.store, request.label, request.devices)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/label")
+def label_recording(request: RecordingLabel):
+    """Set the label of the frames recorded from now on."""
+    if not recording_service.active:
+        raise HTTPException(status_code=409, detail="Not recording")
+    recording_service.set_label(request.label, request.device)
+    return recording_service.status()
+
+@router.post("/stop")
+def stop_recording():
+    """Stop recording; returns once queued frames are written."""
+    return recording_service.stop()
+
+@router.get("/status")
+def recording_status():
+    return recording_service.status()
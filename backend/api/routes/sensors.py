@@ -1,19 +1,64 @@
-from fastapi import APIRouter, Query
-from services.data_store import data_store
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from services.data_store import HISTORY_COLUMNS, data_store
+from services.ml_service import ml_service
+from services.speculation_service import speculation
+from services.tracing import tracer
+from services.tts_service import tts_service
+from services.session_service import DEFAULT_DEVICE
 
 router = APIRouter()
 
 @router.get("/sensors")
 def get_sensors(
-    use_gemini: bool = Query(True), 
-    lang: str = Query("en"),
-    auto_speak: bool = Query(False)
+    use_gemini: Optional[bool] = Query(None),
+    lang: Optional[str] = Query(None),
+    auto_speak: Optional[bool] = Query(None),
+    device: Optional[str] = Query(None, description="Glove device id (see /devices); latest glove if omitted")
 ):
-    # Update global config from frontend
-    data_store.update_config({
-        "use_gemini": use_gemini,
-        "lang": lang,
-        "auto_speak": auto_speak
-    })
+    # Legacy clients pass their settings here; only keys actually sent are
+    # applied, so plain polls don't reset what POST /config set
+    sent = {"use_gemini": use_gemini, "lang": lang, "auto_speak": auto_speak}
+    sent = {key: value for key, value in sent.items() if value is not None}
+    if sent:
+        data_store.update_config(sent)
     
-    return data_store.get()
+    data = data_store.get(device)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Unknown device '{device}'")
+    return data
+
+@router.get("/devices")
+def list_devices():
+    """Gloves currently sending data, with their latest gesture and sentence."""
+    return {"devices": data_store.list_devices()}
+
+@router.get("/sensors/history")
+def get_sensor_history(
+    device: Optional[str] = Query(None, description="Glove device id; latest glove if omitted"),
+    n: int = Query(100, ge=1, le=4096, description="Number of recent frames")
+):
+    """Recent raw frames (oldest first), one row per frame in `columns` order."""
+    frames = data_store.history(device, n)
+    if frames is None:
+        raise HTTPException(status_code=404, detail=f"No history for device '{device}'")
+    return {"columns": HISTORY_COLUMNS, "frames": frames.tolist()}
+
+@router.get("/sensors/stats")
+def get_sensor_stats(device: str = Query(DEFAULT_DEVICE)):
+    """Rolling mean/std/min/max per channel (needs ML_MOTION_WINDOW > 0)."""
+    stats = ml_service.motion_stats(device)
+    if stats is None:
+        raise HTTPException(status_code=404, detail=f"No motion stats for device '{device}'")
+    return stats
+
+@router.get("/latency")
+def get_latency():
+    """Time from the last gesture of an utterance to its sentence / audio start."""
+    return {
+        "gesture_to_sentence": tracer.stage_summary("gesture_to_sentence"),
+        "gesture_to_audio": tracer.stage_summary("gesture_to_audio"),
+        "speculation": speculation.stats(),
+        "playback": tts_service.player.stats(),
+        "stages": tracer.summary(), # Full histograms at /metrics
+    }
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from services.data_store import data_store
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+MAX_PUSH_HZ = 60
+KEEPALIVE_SECONDS = 15
+
+class ConfigUpdate(BaseModel):
+    use_gemini: Optional[bool] = None
+    lang: Optional[str] = None
+    auto_speak: Optional[bool] = None
+
+def _delta(previous, current):
+    """Keys whose values changed since the last message (delta encoding)."""
+    return {k: v for k, v in current.items() if previous.get(k) != v}
+
+async def _state_updates(device, max_hz):
+    """
+    Yields (kind, payload) messages for one client: a full snapshot first,
+    then only changed keys. Sleeps on data_store.wait_for_change between
+    messages and sends at most max_hz per second (decimation: changes
+    published in between are coalesced into one delta).
+    """
+    interval = 1.0 / min(max(max_hz, 0.5), MAX_PUSH_HZ)
+    last_sent = {}
+    version = None
+    while True:
+        snapshot = await data_store.wait_for_change(version, timeout=KEEPALIVE_SECONDS)
+        if snapshot.version == version:
+            yield "keepalive", {}
+            continue
+        version = snapshot.version
+
+        current = snapshot.get(device)
+        if current is None:
+            yield "error", {"detail": f"Unknown device '{device}'"}
+            return
+        current.pop("last_updated", None) # Changes every frame; not useful to clients
+
+        if not last_sent:
+            yield "snapshot", current
+            last_sent = current
+        else:
+            changes = _delta(last_sent, current)
+            if changes: # Otherwise another glove / an ignored field changed
+                yield "delta", changes
+                last_sent = current
+
+        await asyncio.sleep(interval)
+
+@router.websocket("/ws")
+async def sensor_socket(
+    websocket: WebSocket,
+    device: Optional[str] = Query(None),
+    max_hz: float = Query(10.0, description="Max messages per second for this client"),
+):
+    """Pushes sensor frames, gestures and sentences as JSON deltas."""
+    await websocket.accept()
+
+    async def push():
+        async for kind, payload in _state_updates(device, max_hz):
+            await websocket.send_json({"type": kind, "data": payload})
+            if kind == "error":
+                await websocket.close(code=1008)
+                return
+
+    sender = asyncio.create_task(push())
+    try:
+        # Notice disconnects right away instead of on the next failed send
+        while not sender.done():
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    except Exception as e:
+        logger.warning(f"WebSocket client dropped: {e}")
+    finally:
+        sender.cancel()
+
+@router.get("/sensors/stream")
+async def sensor_events(
+    device: Optional[str] = Query(None),
+    max_hz: float = Query(10.0, description="Max events per second for this client"),
+):
+    """Server-Sent Events fallback for clients without WebSocket support."""
+    async def events():
+        async for kind, payload in _state_updates(device, max_hz):
+            if kind == "keepalive":
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {kind}\ndata: {json.dumps(payload)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+@router.get("/config")
+def get_config():
+    return dict(data_store.config)
+
+@router.post("/config")
+def update_config(update: ConfigUpdate):
+    """Change settings without piggybacking on every /sensors poll."""
+    changes = {k: v for k, v in update.model_dump().items() if v is not None}
+    if changes:
+        data_store.update_config(changes)
+    return dict(data_store.config)
@@ -0,0 +1,67 @@
+# bench_ml.py
+# Compares per-row DataFrame prediction (old MLService path) with the
+# micro-batched NumPy path on ML/training_data.csv.
+#
+# Usage (from backend/): python bench_ml.py [--rows 2000]
+import argparse
+import os
+import time
+
+import joblib
+import pandas as pd
+
+from services.ml_service import MLService
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_PATH = os.path.join(BASE_DIR, "..", "ML", "training_data.csv")
+MODEL_PATH = os.path.join(BASE_DIR, "models", "signspeak.pkl")
+COLUMNS = ['f1', 'f2', 'f3', 'f4', 'ax', 'ay', 'az']
+
+def load_frames(rows):
+    df = pd.read_csv(CSV_PATH, header=None, names=COLUMNS + ['label']).dropna()
+    return df[COLUMNS].to_numpy(dtype=float)[:rows]
+
+def bench_per_row(frames):
+    """Old path: one-row DataFrame + predict per frame."""
+    model = joblib.load(MODEL_PATH)
+    labels = []
+    start = time.perf_counter()
+    for row in frames:
+        features_df = pd.DataFrame([list(row)], columns=COLUMNS)
+        labels.append(model.predict(features_df)[0])
+    return time.perf_counter() - start, labels
+
+def bench_service(frames, batch_size):
+    """New path: MLService.process_data with the given batch size."""
+    service = MLService(batch_size=batch_size, max_batch_delay=float("inf"))
+    detected = []
+    service.register_callback(lambda word, device_id: detected.append(word))
+    start = time.perf_counter()
+    for row in frames:
+        service.process_data(list(row[:4]), list(row[4:]))
+    service.flush()
+    return time.perf_counter() - start, detected
+
+def main():
+    parser = argparse.ArgumentParser(description="MLService inference benchmark")
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    frames = load_frames(args.rows)
+    print(f"📊 Benchmarking {len(frames)} frames from {os.path.normpath(CSV_PATH)}\n")
+
+    elapsed, _ = bench_per_row(frames)
+    print(f"{'per-row DataFrame':<22} {len(frames) / elapsed:>10.0f} frames/s")
+
+    baseline_words = None
+    for batch_size in (1, 8, 32, 128):
+        elapsed, words = bench_service(frames, batch_size)
+        if baseline_words is None:
+            baseline_words = words
+        same = "✅" if words == baseline_words else "❌ callbacks differ"
+        print(f"{'batch_size=' + str(batch_size):<22} {len(frames) / elapsed:>10.0f} frames/s  {same}")
+
+    print(f"\nDetected words: {baseline_words}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# bench_pipeline.py
+# End-to-end regression benchmark of the backend pipeline: replays a
+# recording into the real UDP receiver as N gloves and runs main.py's own
+# wiring (ML -> stability -> utterance segmenter -> sentence -> playback).
+# Sentence generation and speech synthesis are stubbed with fixed
+# latencies and audio plays into a NullSink, so no network or audio device
+# is needed and results are comparable between runs.
+#
+# Reports ingest throughput, frame drop rate, per-stage latency and whether
+# every glove detected the same words as offline inference on the same
+# frames (and how many of the recording's labels were found).
+#
+# Usage (from backend/):
+#   python bench_pipeline.py [--csv ../ML/training_data.csv] [--gloves 4] [--speed 10] [--batch 4]
+#   python bench_pipeline.py --speed 0      (as fast as possible: max throughput / drops)
+import os
+os.environ.setdefault("AUDIO_SINK", "null")
+os.environ.setdefault("SENTENCE_ENGINE", "local")
+os.environ.setdefault("SERIAL_PORT", "none")
+
+import argparse
+import asyncio
+import difflib
+import json
+import logging
+import time
+
+import main
+from replay_sensors import UdpTarget, load_recording, start_gloves
+from services.data_store import data_store
+from services.ml_service import MLService, ml_service
+from services.sentence_composer import sentence_composer
+from services.sentence_service import sentence_service
+from services.speculation_service import speculation
+from services.tracing import tracer
+from services.tts_service import tts_service
+from services.udp_service import udp_service
+from services.utterance_service import utterance_segmenter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CSV = os.path.join(BASE_DIR, "..", "ML", "training_data.csv")
+
+def label_runs(labels, min_run):
+    """Labels of the recording in order, one per run of at least min_run frames."""
+    runs = []
+    count = 0
+    for i, label in enumerate(labels):
+        count = count + 1 if i and label == labels[i - 1] else 1
+        if count == min_run and (not runs or runs[-1] != label):
+            runs.append(label)
+    return runs
+
+def offline_words(recording):
+    """Words MLService detects when fed the recording directly (no network)."""
+    service = MLService(batch_size=1)
+    words = []
+    service.register_callback(lambda word, device_id: words.append(word))
+    service.process_batch(recording.features)
+    return words
+
+def matched(expected, actual):
+    blocks = difflib.SequenceMatcher(a=expected, b=actual, autojunk=False).get_matching_blocks()
+    return sum(block.size for block in blocks)
+
+def install_stubs(args):
+    """Fixed-latency sentence generation / synthesis instead of Gemini and Edge TTS."""
+    async def generate(words):
+        await asyncio.sleep(args.llm)
+        return sentence_composer.compose(words)
+
+    async def stream(text, voice=None, rate=None, chunk_size=None):
+        await asyncio.sleep(args.tts)
+        yield b"\x00" * 2048
+
+    sentence_service.generate_async = generate
+    speculation.generate = generate
+    tts_service.stream = stream # synthesize() and speculation go through it
+    tts_service.player.stream = stream
+    tts_service.player.sink.speed = 0 # Audio "plays" instantly
+
+async def run(args):
+    recording = load_recording(args.csv, args.rows)
+    expected = label_runs(recording.labels, ml_service.required_stability + 1) if recording.labels is not None else []
+    reference = offline_words(recording)
+
+    install_stubs(args)
+    udp_service.port = args.port
+    await main.startup_event()
+    utterance_segmenter.silence_threshold = args.silence
+    data_store.update_config({"use_gemini": True, "auto_speak": True})
+
+    received = {}
+    detected = {}
+    on_batch = udp_service.on_batch_callback
+    on_word = ml_service.on_prediction_callback
+
+    def count_batch(features, device_id):
+        received[device_id] = received.get(device_id, 0) + len(features)
+        on_batch(features, device_id)
+
+    def record_word(word, device_id):
+        detected.setdefault(device_id, []).append(word)
+        on_word(word, device_id)
+
+    udp_service.on_batch_callback = count_batch
+    ml_service.on_prediction_callback = record_word
+
+    target = UdpTarget("127.0.0.1", args.port)
+    start = time.perf_counter()
+    replays = start_gloves(target, recording, args.gloves, args.hz, args.speed, args.batch, stagger=0.05)
+    while any(replay.is_alive() for replay in replays):
+        await asyncio.sleep(0.05)
+    sent_elapsed = time.perf_counter() - start
+
+    # Let the last datagrams, utterances (silence timer) and playback finish
+    await asyncio.sleep(args.silence + args.llm + args.tts + 1.0)
+    udp_service.stop()
+    target.close()
+
+    sent = sum(replay.sent for replay in replays)
+    total = sum(received.values())
+    gloves = []
+    for replay in replays:
+        device_id = f"glove-{replay.device_id}"
+        words = detected.get(device_id, [])
+        gloves.append({
+            "device": device_id,
+            "sent": replay.sent,
+            "received": received.get(device_id, 0),
+            "lost_seq": udp_service.sequences.lost.get(device_id, 0),
+            "words": len(words),
+            "matches_offline": words == reference,
+            "labels_found": matched(expected, words),
+        })
+
+    return {
+        "csv": os.path.normpath(args.csv),
+        "frames": len(recording),
+        "gloves": args.gloves,
+        "speed": args.speed,
+        "batch": args.batch,
+        "send_seconds": round(sent_elapsed, 2),
+        "frames_per_second": round(total / sent_elapsed, 1) if sent_elapsed else None,
+        "drop_rate": round(1 - total / sent, 4) if sent else None,
+        "expected_labels": len(expected),
+        "offline_words": len(reference),
+        "gloves_detail": gloves,
+        "stages": tracer.summary(),
+        "gesture_to_sentence": tracer.stage_summary("gesture_to_sentence"),
+        "gesture_to_audio": tracer.stage_summary("gesture_to_audio"),
+        "playback": tts_service.player.stats(),
+    }
+
+def report(result):
+    print(f"\n📊 {result['frames']} frames x {result['gloves']} glove(s) from {result['csv']} "
+          f"(speed {result['speed']:g}, {result['batch']} frame(s)/datagram)\n")
+    print(f"Throughput : {result['frames_per_second']:.0f} frames/s over {result['send_seconds']}s")
+    print(f"Drop rate  : {result['drop_rate'] * 100:.2f}%")
+    print(f"Detection  : offline reference {result['offline_words']} words, "
+          f"{result['expected_labels']} labels in the recording")
+    for glove in result["gloves_detail"]:
+        ok = "✅" if glove["matches_offline"] else "❌ differs from offline"
+        print(f"   {glove['device']:<9} {glove['received']:>6}/{glove['sent']} frames, {glove['words']} words, "
+              f"{glove['labels_found']}/{result['expected_labels']} labels  {ok}")
+    print("\nStage latency (ms):")
+    for stage, summary in result["stages"].items():
+        if summary.get("count"):
+            print(f"   {stage:<26} n={summary['count']:<6} p50 {summary['p50_ms']:>8.2f}  "
+                  f"p95 {summary['p95_ms']:>8.2f}  p99 {summary['p99_ms']:>8.2f}  max {summary['max_ms']:>8.2f}")
+    print(f"\nPlayback: {result['playback']['played']} played, {result['playback']['dropped']} dropped")
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Backend pipeline replay benchmark (stubbed LLM / audio)")
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--gloves", type=int, default=4)
+    parser.add_argument("--hz", type=float, default=50.0, help="Recorded frame rate when there are no timestamps")
+    parser.add_argument("--speed", type=float, default=10.0, help="Replay speed (0 = as fast as possible)")
+    parser.add_argument("--batch", type=int, default=1, help="Frames per datagram")
+    parser.add_argument("--port", type=int, default=5055, help="UDP port for the benchmark receiver")
+    parser.add_argument("--silence", type=float, default=0.5, help="Utterance silence threshold (s)")
+    parser.add_argument("--llm", type=float, default=0.2, help="Stub sentence generation latency (s)")
+    parser.add_argument("--tts", type=float, default=0.15, help="Stub synthesis latency (s)")
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    result = asyncio.run(run(args))
+    report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved {args.json}")
+
+if __name__ == "__main__":
+    main_cli()
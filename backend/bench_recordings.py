@@ -0,0 +1,76 @@
+# bench_recordings.py
+# Dataset load time: training_data.csv (pandas.read_csv, as the training
+# scripts did) vs. the columnar RecordingStore (memory-mapped float32),
+# with the recording tiled up to --frames rows.
+#
+# Usage (from backend/): python bench_recordings.py [--frames 1000000] [--csv ../ML/training_data.csv]
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.recording_store import FEATURES, RecordingStore, load_training_frame, read_csv_recording
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=os.path.join(BASE_DIR, "..", "ML", "training_data.csv"))
+    parser.add_argument("--frames", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    base = read_csv_recording(args.csv).dropna()
+    df = pd.concat([base] * (args.frames // len(base) + 1), ignore_index=True).iloc[:args.frames]
+    workdir = tempfile.mkdtemp(prefix="bench_recordings_")
+    try:
+        csv_path = os.path.join(workdir, "training_data.csv")
+        df[FEATURES + ['label']].to_csv(csv_path, header=False, index=False)
+
+        store_dir = os.path.join(workdir, "store")
+        store = RecordingStore(store_dir)
+        start = time.perf_counter()
+        with store.writer(block_rows=65536) as writer:
+            labels = df['label'].to_numpy()
+            features = df[FEATURES].to_numpy(dtype=np.float32)
+            bounds = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1], True])
+            for a, b in zip(bounds[:-1], bounds[1:]):
+                writer.append(features[a:b], labels[a])
+        write_time = time.perf_counter() - start
+        store.compact()
+
+        csv_size = os.path.getsize(csv_path)
+        store_size = sum(os.path.getsize(os.path.join(store_dir, f)) for f in os.listdir(store_dir))
+        print(f"📊 {len(df)} frames: CSV {csv_size / 2**20:.1f} MiB, store {store_size / 2**20:.1f} MiB "
+              f"(written in {write_time:.2f}s)\n")
+
+        t_csv, _ = timed(lambda: pd.read_csv(csv_path, header=None, names=FEATURES + ['label']).dropna())
+        t_mmap, data = timed(lambda: RecordingStore(store_dir).load())
+        t_touch, _ = timed(lambda: np.asarray(RecordingStore(store_dir).load().features).sum())
+        t_frame, _ = timed(lambda: load_training_frame(store_dir))
+        print(f"{'pandas.read_csv':<28} {t_csv * 1000:>9.1f} ms")
+        print(f"{'store.load() (mmap)':<28} {t_mmap * 1000:>9.1f} ms")
+        print(f"{'store.load() + read all':<28} {t_touch * 1000:>9.1f} ms")
+        print(f"{'load_training_frame(store)':<28} {t_frame * 1000:>9.1f} ms")
+        print(f"\nSpeedup (mmap load vs CSV): {t_csv / t_mmap:.0f}x; classes {list(data.classes)}")
+
+        store.compact(compress=True)
+        packed = sum(os.path.getsize(os.path.join(store_dir, f)) for f in os.listdir(store_dir))
+        t_packed, _ = timed(lambda: RecordingStore(store_dir).load())
+        print(f"{'compressed store.load()':<28} {t_packed * 1000:>9.1f} ms  ({packed / 2**20:.1f} MiB)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
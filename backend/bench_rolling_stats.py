@@ -0,0 +1,71 @@
+# bench_rolling_stats.py
+# Per-sample cost of the incremental rolling statistics engine versus
+# rescanning a deque window on every sample (archive/scripts/try1.py style).
+# The incremental columns should stay flat as the window grows.
+#
+# Usage (from backend/): python bench_rolling_stats.py [--samples 5000]
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+from services.rolling_stats import RollingWindow, ThresholdCounter
+
+CHANNELS = 10 # 4 flex + 3 acc + 3 gyro
+THRESHOLD = 80.0
+
+def per_sample(fn, samples):
+    start = time.perf_counter()
+    for x in samples:
+        fn(x)
+    return (time.perf_counter() - start) / len(samples) * 1e6
+
+def naive_stats(window):
+    buf = deque(maxlen=window)
+    def step(x):
+        buf.append(x)
+        arr = np.array(buf)
+        return arr.mean(axis=0), arr.var(axis=0), arr.min(axis=0), arr.max(axis=0)
+    return step
+
+def naive_peaks(window):
+    buf = deque(maxlen=window)
+    def step(x):
+        buf.append(x[-1])
+        return sum(1 for v in buf if abs(v) > THRESHOLD)
+    return step
+
+def rolling_stats(window):
+    r = RollingWindow(window, CHANNELS)
+    def step(x):
+        r.push(x)
+        return r.mean(), r.var(), r.min(), r.max()
+    return step
+
+def rolling_peaks(window):
+    c = ThresholdCounter(window, [THRESHOLD] * CHANNELS)
+    def step(x):
+        c.push(x)
+        return c.peaks
+    return step
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling statistics microbenchmark")
+    parser.add_argument("--samples", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = rng.normal(scale=60, size=(args.samples, CHANNELS))
+
+    print(f"📊 µs per sample, {CHANNELS} channels, {args.samples} samples\n")
+    print(f"{'window':>7} | {'naive stats':>11} {'rolling stats':>13} | {'naive peaks (1 ch)':>18} {'counter (all ch)':>16}")
+    for window in (8, 32, 128, 512, 2048):
+        print(f"{window:>7} | "
+              f"{per_sample(naive_stats(window), samples):>11.1f} "
+              f"{per_sample(rolling_stats(window), samples):>13.1f} | "
+              f"{per_sample(naive_peaks(window), samples):>18.1f} "
+              f"{per_sample(rolling_peaks(window), samples):>16.1f}")
+
+if __name__ == "__main__":
+    main()
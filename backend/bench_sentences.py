@@ -0,0 +1,135 @@
+# bench_sentences.py
+# Sentence generation with a local stub model standing in for Gemini:
+# event loop stalls of the old blocking call vs generate_sentence_async,
+# cache hit rate / latency on a repetitive phrase workload, and the
+# offline SentenceComposer on synthetic (noisy) word sequences.
+#
+# Usage (from backend/): python bench_sentences.py [--utterances 200] [--latency 0.3] [--synthetic 20000]
+import argparse
+import asyncio
+import random
+import time
+
+from services.gemini_service import GeminiService
+from services.sentence_composer import SentenceComposer
+
+PHRASES = [
+    ["HELLO"], ["HELLO", "I", "AM"], ["I", "AM", "HUNGRY"], ["THANK", "YOU"],
+    ["WE", "ARE", "TEAM"], ["HOW", "ARE", "YOU"], ["I", "NEED", "HELP"],
+    ["YES"], ["NO"], ["STOP"], ["GOOD", "MORNING"], ["SEE", "YOU", "LATER"],
+]
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+class StubModel:
+    """Mimics GenerativeModel.generate_content with a fixed network latency."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        time.sleep(self.latency)
+        words = prompt.split("'")[1]
+        return StubResponse(words.capitalize() + ".")
+
+# Sequences the gloves actually produce, signed with typical noise
+SIGNED = [
+    ["HELLO", "I", "AM", "YASH"], ["WE", "ARE", "TEAM FSOCIETY"], ["HELLO"],
+    ["HELLO", "I", "AM", "YASH", "WE", "ARE", "FSOCIETY"], ["I", "AM", "HUNGRY"],
+    ["YES"], ["NO"], ["STOP"], ["THANK", "YOU"], ["I", "AM", "READY"],
+]
+
+def synthetic_sequences(n, seed=0):
+    """Signed phrases with stutters (repeats), dropped verbs and shuffled pairs."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        words = list(rng.choice(SIGNED))
+        if rng.random() < 0.3: # Stutter
+            i = rng.randrange(len(words))
+            words.insert(i, words[i])
+        if rng.random() < 0.2 and ("AM" in words or "ARE" in words): # Missed verb
+            words.remove("AM" if "AM" in words else "ARE")
+        if rng.random() < 0.1 and len(words) > 1: # Swapped pair
+            i = rng.randrange(len(words) - 1)
+            words[i], words[i + 1] = words[i + 1], words[i]
+        out.append(words)
+    return out
+
+def bench_composer(n):
+    composer = SentenceComposer()
+    sequences = synthetic_sequences(n)
+    start = time.perf_counter()
+    for words in sequences:
+        composer.compose(words)
+    elapsed = time.perf_counter() - start
+    print(f"local     : {elapsed * 1e6 / n:7.1f} us/sentence over {n} synthetic sequences (no network)")
+    for words in [w for w in sequences if len(w) >= 3][:6]:
+        print(f"            {' '.join(words):<40} -> {composer.compose(words)}")
+
+def workload(n, seed=0):
+    # Skewed like real use: greetings and short phrases dominate
+    rng = random.Random(seed)
+    weights = [1.0 / (i + 1) for i in range(len(PHRASES))]
+    return [list(rng.choices(PHRASES, weights)[0]) for _ in range(n)]
+
+async def measure_stall(task, tick=0.005):
+    """Worst delay of a 5 ms ticker while `task` runs on the same loop."""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(tick)
+            worst = max(worst, time.perf_counter() - start - tick)
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await task()
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticking
+    return elapsed, worst
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--utterances", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.3, help="Stub model latency (s)")
+    parser.add_argument("--synthetic", type=int, default=20000, help="Sequences for the local composer")
+    args = parser.parse_args()
+    phrases = workload(args.utterances)
+
+    print(f"Stub model latency: {args.latency * 1000:.0f} ms, {len(phrases)} utterances\n")
+
+    # 1. Old path: blocking call inside the loop (first 10 utterances, no cache)
+    blocking = GeminiService(model=StubModel(args.latency), cache_size=0)
+    async def run_blocking():
+        for words in phrases[:10]:
+            blocking._generate(words)
+    elapsed, stall = await measure_stall(run_blocking)
+    print(f"blocking  : {elapsed * 1000 / 10:7.1f} ms/utterance, worst loop stall {stall * 1000:7.1f} ms")
+
+    # 2. Async + cache on the full workload
+    stub = StubModel(args.latency)
+    service = GeminiService(model=stub)
+    async def run_async():
+        for words in phrases:
+            await service.generate_sentence_async(words)
+    elapsed, stall = await measure_stall(run_async)
+    stats = service.cache_stats()
+    print(f"async     : {elapsed * 1000 / len(phrases):7.1f} ms/utterance, worst loop stall {stall * 1000:7.1f} ms")
+    print(f"cache     : hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses), "
+          f"{stub.calls} model calls")
+
+    # 3. Offline composer
+    bench_composer(args.synthetic)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+# bench_speculation.py
+# Last gesture -> audio start, with and without speculative generation.
+# Runs the real UtteranceSegmenter + SpeculativeComposer with stubbed
+# sentence generation / speech synthesis latencies (no network, no audio).
+#
+# Usage (from backend/): python bench_speculation.py [--gen 0.3] [--tts 0.4] [--silence 1.0]
+import argparse
+import asyncio
+import time
+
+from services.session_service import SessionManager
+from services.speculation_service import SpeculativeComposer
+from services.utterance_service import UtteranceSegmenter
+
+UTTERANCES = [
+    ["HELLO", "I", "AM", "YASH"],
+    ["WE", "ARE", "TEAM FSOCIETY"],
+    ["I", "AM", "HUNGRY"],
+    ["HELLO"],
+]
+
+async def run(speculative, args):
+    gen_latency, tts_latency = args.gen, args.tts
+
+    async def generate(words):
+        await asyncio.sleep(gen_latency)
+        return " ".join(words).capitalize() + "."
+
+    async def synthesize(sentence):
+        await asyncio.sleep(tts_latency)
+        return sentence.encode()
+
+    sessions = SessionManager()
+    segmenter = UtteranceSegmenter(sessions=sessions, silence_threshold=args.silence, rest_window=0)
+    speculation = SpeculativeComposer(generate, synthesize, enabled=speculative)
+    latencies = []
+    done = asyncio.Event()
+
+    segmenter.register_buffer_callback(lambda device_id, words: speculation.update(device_id, words, with_audio=True))
+
+    async def form_sentence(device_id, words, reason):
+        last_gesture = sessions.find(device_id).last_detection_time
+        result = await speculation.take(device_id, words)
+        if result is None:
+            sentence = await generate(words)
+            audio = await synthesize(sentence)
+        else:
+            sentence, audio = result
+        # Audio start = playback of ready audio (stub player starts instantly)
+        latencies.append(time.time() - last_gesture)
+        done.set()
+
+    segmenter.register_callback(form_sentence)
+    segmenter.start()
+
+    for words in UTTERANCES:
+        done.clear()
+        for word in words:
+            segmenter.on_word("glove-1", word)
+            await asyncio.sleep(args.gap)
+        await done.wait()
+    return latencies, speculation.stats()
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gen", type=float, default=0.3, help="Sentence generation latency (s)")
+    parser.add_argument("--tts", type=float, default=0.4, help="Speech synthesis latency (s)")
+    parser.add_argument("--silence", type=float, default=1.0, help="Silence threshold (s)")
+    parser.add_argument("--gap", type=float, default=0.6, help="Time between signed words (s)")
+    args = parser.parse_args()
+
+    print(f"generation {args.gen * 1000:.0f} ms, synthesis {args.tts * 1000:.0f} ms, "
+          f"silence {args.silence * 1000:.0f} ms, {len(UTTERANCES)} utterances\n")
+    for label, speculative in (("serial", False), ("speculative", True)):
+        latencies, stats = await run(speculative, args)
+        mean = sum(latencies) / len(latencies)
+        print(f"{label:<12}: last gesture -> audio start {mean * 1000:7.1f} ms avg "
+              f"(max {max(latencies) * 1000:.1f} ms)  {stats}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
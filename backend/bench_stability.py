@@ -0,0 +1,184 @@
+# bench_stability.py
+# Replays recorded CSVs through the live model and compares the stability
+# detectors that turn per-frame predictions into words: the 5-frame
+# counter (StabilityTracker) vs evidence accumulation over predict_proba
+# (ConfidenceTracker) at a few thresholds.
+#
+# For every labeled run in a recording it measures time-to-detect (frames
+# from the start of the run until its word fires), runs detected / missed
+# and false triggers (words fired that do not match the recorded label).
+# Optionally flips a fraction of frames to a random other class to show how
+# each detector copes with isolated outliers. Each recording is tagged as
+# training data or held out (--trained-on), and a verdict line compares
+# every threshold with the counter on both recall and false triggers:
+# fewer false triggers only help if the words still fire.
+#
+# Usage (from backend/):
+#   python bench_stability.py                               (ML/ + yash/ training_data.csv)
+#   python bench_stability.py --csv ../yash/training_data.csv --flip 0 0.05 0.1 --thresholds 6 8 10
+import argparse
+import json
+import logging
+import os
+
+import numpy as np
+
+from services.ml_service import MLService
+from services.recording_store import FEATURES, read_csv_recording
+from services.stability import ConfidenceTracker, StabilityTracker
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CSV = [os.path.join(BASE_DIR, "..", "ML", "training_data.csv"),
+               os.path.join(BASE_DIR, "..", "yash", "training_data.csv")]
+# What models/signspeak.* was fit on (train_model.py / train_search.py default)
+DEFAULT_TRAINED_ON = [os.path.join(BASE_DIR, "..", "ML", "training_data.csv")]
+GLOVE_HZ = 33
+
+def label_runs(labels):
+    """(start, stop, label) of each contiguous label run."""
+    bounds = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1], True])
+    return [(int(start), int(stop), labels[start]) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+def flip_frames(probs, rate, rng):
+    """Replace a `rate` fraction of frames with a confident vote for a random other class."""
+    probs = probs.copy()
+    if rate <= 0:
+        return probs
+    flipped = np.flatnonzero(rng.random(len(probs)) < rate)
+    top = np.argmax(probs[flipped], axis=1)
+    other = (top + rng.integers(1, probs.shape[1], len(flipped))) % probs.shape[1]
+    probs[flipped] = 0.0
+    probs[flipped, other] = 1.0
+    return probs
+
+def replay(tracker, inputs):
+    """(frame index, word) of every word the tracker fires."""
+    fires = []
+    for i, value in enumerate(inputs):
+        word = tracker.update(value)
+        if word is not None:
+            fires.append((i, word))
+    return fires
+
+def evaluate(fires, labels, runs, classes):
+    known = [run for run in runs if run[2] in classes]
+    delays = []
+    for start, stop, label in known:
+        hits = [i for i, word in fires if start <= i < stop and word == label]
+        if hits:
+            delays.append(hits[0] - start + 1) # Frames seen, including the one that fired
+    false = sum(1 for i, word in fires if word != labels[i])
+    return {
+        "runs": len(known),
+        "detected": len(delays),
+        "missed": len(known) - len(delays),
+        "median_frames": float(np.median(delays)) if delays else None,
+        "p95_frames": float(np.percentile(delays, 95)) if delays else None,
+        "mean_frames": float(np.mean(delays)) if delays else None,
+        "false_triggers": false,
+        "fires": len(fires),
+    }
+
+def verdict(rows):
+    """A line per confidence threshold comparing it with the counter (rows of one CSV and flip rate)."""
+    counter, others = rows[0], rows[1:]
+
+    def median(row):
+        return f"median {row['median_frames']:.0f} frames" if row["median_frames"] is not None else "no detections"
+
+    lines = [f"counter (5): {counter['detected']}/{counter['runs']} detected, {counter['false_triggers']} false, "
+             f"{median(counter)}"]
+    for row in others:
+        recall = row["detected"] - counter["detected"]
+        false = row["false_triggers"] - counter["false_triggers"]
+        if recall >= 0 and false <= 0:
+            outcome = "better or equal" if recall or false else "same"
+            if not recall and not false and row["median_frames"] is not None and counter["median_frames"] is not None:
+                if row["median_frames"] < counter["median_frames"]:
+                    outcome = "same words, fires sooner"
+                elif row["median_frames"] > counter["median_frames"]:
+                    outcome = "same words, fires later"
+        elif recall < 0 and false < 0:
+            outcome = "fewer false triggers but misses more runs"
+        elif recall > 0 and false > 0:
+            outcome = "detects more runs but more false triggers"
+        else:
+            outcome = "worse"
+        lines.append(f"{row['detector']}: {row['detected']}/{row['runs']} detected ({recall:+d}), "
+                     f"{row['false_triggers']} false ({false:+d}), {median(row)} -> {outcome}")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Counter vs confidence stability detector replay benchmark")
+    parser.add_argument("--csv", nargs="+", default=DEFAULT_CSV)
+    parser.add_argument("--thresholds", nargs="+", type=float, default=[6.0, 8.0, 10.0],
+                        help="ConfidenceTracker thresholds (log-odds)")
+    parser.add_argument("--flip", nargs="+", type=float, default=[0.0, 0.05],
+                        help="Fractions of frames replaced by a random other class")
+    parser.add_argument("--trained-on", nargs="+", default=DEFAULT_TRAINED_ON,
+                        help="CSVs the model was trained on (the others are reported as held out)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    service = MLService(batch_size=1) # Same model files / cascade settings as the backend
+    model = service.model
+    classes = [str(c) for c in model.classes_]
+    results = []
+    trained_on = {os.path.realpath(p) for p in args.trained_on}
+    verdicts = []
+
+    for path in args.csv:
+        df = read_csv_recording(path).dropna(subset=FEATURES + ['label'])
+        X = df[FEATURES].to_numpy(dtype=np.float64)
+        labels = df['label'].astype(str).str.strip().str.upper().to_numpy()
+        runs = label_runs(labels)
+        base_probs = model.predict_proba(X)
+        unknown = sorted(set(labels) - set(classes))
+        held_out = os.path.realpath(path) not in trained_on
+        source = "held out" if held_out else "training data"
+
+        print(f"\n📊 {os.path.normpath(path)} ({source}): {len(X)} frames, {len(runs)} runs"
+              + (f" (labels unknown to the model, not scored for detection: {unknown})" if unknown else ""))
+        print(f"   {'flip':>5} {'detector':<22} {'detected':>9} {'missed':>7} {'median':>7} {'p95':>6} "
+              f"{'ms @33Hz':>9} {'false':>6}")
+
+        for rate in args.flip:
+            probs = flip_frames(base_probs, rate, np.random.default_rng(args.seed))
+            predictions = np.asarray(classes, dtype=object)[np.argmax(probs, axis=1)]
+            max_frames = service.required_stability + 1 # The counter fires on the 6th equal frame
+            detectors = [("counter (5)", StabilityTracker(service.required_stability), predictions)]
+            detectors += [(f"confidence ({threshold:g})",
+                           ConfidenceTracker(classes, threshold=threshold, max_frames=max_frames), probs)
+                          for threshold in args.thresholds]
+
+            rows = []
+            for name, tracker, inputs in detectors:
+                result = evaluate(replay(tracker, inputs), labels, runs, classes)
+                result.update({"csv": os.path.normpath(path), "held_out": held_out, "flip": rate, "detector": name})
+                results.append(result)
+                rows.append(result)
+                median = f"{result['median_frames']:.0f}" if result["median_frames"] is not None else "-"
+                p95 = f"{result['p95_frames']:.0f}" if result["p95_frames"] is not None else "-"
+                ms = f"{result['median_frames'] * 1000 / GLOVE_HZ:.0f}" if result["median_frames"] is not None else "-"
+                print(f"   {rate:>5.2f} {name:<22} {result['detected']:>4}/{result['runs']:<4} {result['missed']:>7} "
+                      f"{median:>7} {p95:>6} {ms:>9} {result['false_triggers']:>6}")
+            verdicts.append((held_out, f"{os.path.normpath(path)} ({source}), flip {rate:g}", verdict(rows)))
+
+    print("\n(median / p95: frames from the start of a run until its word fires)")
+    # Held-out recordings first: training data flatters every detector
+    print("\nVerdict:")
+    for _, title, lines in sorted(verdicts, key=lambda v: not v[0]):
+        print(f"   {title}")
+        for line in lines:
+            print(f"      {line}")
+    if not any(held_out for held_out, _, _ in verdicts):
+        print("   ⚠️ Every recording was training data: no result on unseen data")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved {args.json}")
+
+if __name__ == "__main__":
+    main()
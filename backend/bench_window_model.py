@@ -0,0 +1,76 @@
+# bench_window_model.py
+# Latency / accuracy of the windowed temporal model vs the single-frame
+# model, trained and tested on the same held-out chunks of a recording.
+#
+# Usage (from backend/): python bench_window_model.py [--csv ../yash/training_data.csv]
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GroupShuffleSplit
+
+from services.flat_forest import FlatForest
+from services.window_features import WindowFeatureExtractor, label_runs, run_chunks
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COLUMNS = ['f1', 'f2', 'f3', 'f4', 'ax', 'ay', 'az']
+CHUNK = 100
+GLOVE_HZ = 33
+
+def live_latency(step, frames):
+    """Mean seconds per frame when frames are fed one at a time."""
+    start = time.perf_counter()
+    for frame in frames:
+        step(frame)
+    return (time.perf_counter() - start) / len(frames)
+
+def main():
+    parser = argparse.ArgumentParser(description="Windowed vs single-frame model benchmark")
+    parser.add_argument("--csv", default=os.path.join(BASE_DIR, "..", "yash", "training_data.csv"))
+    parser.add_argument("--windows", default="10,30", help="Comma-separated window sizes in frames")
+    args = parser.parse_args()
+    windows = tuple(int(w) for w in args.windows.split(","))
+
+    df = pd.read_csv(args.csv, header=None, names=COLUMNS + ['label']).dropna()
+    X_raw = df[COLUMNS].to_numpy(dtype=float)
+    y = df['label'].to_numpy()
+    runs = label_runs(y)
+    # Windows run over whole recordings; rows whose window reaches into the
+    # previous chunk are left out of both models' train/test sets
+    groups, keep = run_chunks(runs, CHUNK, warmup=max(windows))
+    rows = np.flatnonzero(keep)
+    train_idx, test_idx = (rows[i] for i in next(GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+                                                 .split(X_raw[rows], y[rows], groups=groups[rows])))
+
+    extractor = WindowFeatureExtractor(windows, COLUMNS)
+    start = time.perf_counter()
+    X_win = extractor.transform_runs(X_raw, runs)
+    extract_time = (time.perf_counter() - start) / len(X_raw)
+
+    print(f"📊 {os.path.normpath(args.csv)}: {len(y)} frames, {len(np.unique(groups))} chunks, windows {windows}\n")
+    print(f"{'model':<14} {'features':>8} {'accuracy':>9} {'µs/frame':>9} {'x realtime':>11}")
+
+    for name, X in (("single-frame", X_raw), ("windowed", X_win)):
+        model = RandomForestClassifier(n_estimators=100, max_depth=15, random_state=42, n_jobs=-1)
+        model.fit(X[train_idx], y[train_idx])
+        forest = FlatForest.from_sklearn(model)
+        accuracy = np.mean(forest.predict(X[test_idx]) == y[test_idx])
+
+        # Live path: one frame in, one label out
+        sample = X_raw[test_idx[:500]]
+        if name == "windowed":
+            live = WindowFeatureExtractor(windows, COLUMNS)
+            per_frame = live_latency(lambda f: forest.predict(live.update(f)[None, :]), sample)
+        else:
+            per_frame = live_latency(lambda f: forest.predict(f[None, :]), sample)
+
+        realtime = 1.0 / (per_frame * GLOVE_HZ)
+        print(f"{name:<14} {X.shape[1]:>8} {accuracy * 100:>8.2f}% {per_frame * 1e6:>9.0f} {realtime:>10.0f}x")
+
+    print(f"\nFeature extraction alone: {extract_time * 1e6:.0f} µs/frame (x realtime at {GLOVE_HZ} Hz = {1 / (extract_time * GLOVE_HZ):.0f})")
+
+if __name__ == "__main__":
+    main()
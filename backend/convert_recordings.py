@@ -0,0 +1,39 @@
+# convert_recordings.py
+# Converts CSV recordings (training_data.csv, dataset_*.csv) into a columnar
+# RecordingStore directory (float32 .npy segments + meta.json), one session
+# per CSV. Training scripts load the directory with memory maps instead of
+# re-parsing text.
+#
+# Usage (from backend/):
+#   python convert_recordings.py ../yash/training_data.csv --out ../yash/recordings
+#   python convert_recordings.py ../dataset_*.csv --out ../recordings/datasets --gyro
+import argparse
+import os
+import time
+
+from services.recording_store import FEATURES, GYRO, RecordingStore, import_csv
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV recordings -> RecordingStore")
+    parser.add_argument("csv", nargs="+", help="CSV file(s), each becomes one session")
+    parser.add_argument("--out", required=True, help="Store directory (appended to if it exists)")
+    parser.add_argument("--gyro", action="store_true", help="Also keep gx, gy, gz (dataset_*.csv layout)")
+    parser.add_argument("--device", default=None, help="Glove id recorded in the session metadata")
+    parser.add_argument("--no-compact", action="store_true", help="Keep one segment per block")
+    parser.add_argument("--compress", action="store_true", help="One zlib-compressed archive (smaller, no mmap)")
+    args = parser.parse_args()
+
+    store = RecordingStore(args.out, FEATURES + GYRO if args.gyro else None)
+    start = time.perf_counter()
+    for path in args.csv:
+        rows = import_csv(path, store, device=args.device)
+        print(f"✅ {path}: {rows} frames")
+    if not args.no_compact:
+        store.compact(compress=args.compress)
+
+    size = sum(os.path.getsize(os.path.join(args.out, name)) for name in os.listdir(args.out))
+    print(f"\n{args.out}: {len(store)} frames, {len(store.sessions)} sessions, classes {store.classes}, "
+          f"{size / 1024:.0f} KiB ({time.perf_counter() - start:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# distill_model.py
+# Distills the production forest (the teacher) into much smaller students
+# that mimic it: shallow trees / forests trained on the teacher's labels and
+# pure-NumPy linear / one-hidden-layer nets (TinyNet) trained on its class
+# probabilities, over the recorded frames plus jittered copies of them (so
+# the student also learns the teacher's decision boundaries between
+# recorded samples).
+#
+# Every student, and every student as a cascade in front of the teacher
+# (MLService ML_CASCADE_THRESHOLD: small model on every frame, teacher only
+# where the student is unsure), is scored on held-out recording chunks for
+# accuracy, agreement with the teacher and single-frame latency. The report
+# marks the accuracy/latency Pareto front and is saved as JSON + Markdown.
+#
+# Usage (from backend/):
+#   python distill_model.py                       (teacher: models/signspeak.npz or .pkl)
+#   python distill_model.py --budget 0.5 --save   (write the chosen student to models/signspeak_small.npz)
+import argparse
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GroupShuffleSplit
+from sklearn.tree import DecisionTreeClassifier
+
+from services.flat_forest import FlatForest
+from services.tiny_models import CascadeModel, TinyNet, load_flat_model
+from train_search import GLOVE_HZ, frame_latency, load_data, save_checked
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# The teacher's own training recordings: the student should mimic it where it was fit
+DEFAULT_DATA = [os.path.join(BASE_DIR, "..", "ML", "training_data.csv")]
+
+# name -> (kind, params)
+STUDENTS = {
+    "tree-d3": ("tree", {"max_depth": 3}),
+    "tree-d4": ("tree", {"max_depth": 4}),
+    "tree-d6": ("tree", {"max_depth": 6}),
+    "tree-d8": ("tree", {"max_depth": 8}),
+    "forest-5x6": ("forest", {"n_estimators": 5, "max_depth": 6}),
+    "forest-10x8": ("forest", {"n_estimators": 10, "max_depth": 8}),
+    "linear": ("net", {"hidden": ()}),
+    "mlp-16": ("net", {"hidden": (16,)}),
+    "mlp-32": ("net", {"hidden": (32,)}),
+}
+CASCADE_THRESHOLDS = [0.6, 0.8, 0.9, 0.95]
+
+def load_teacher(path):
+    if path.endswith(".npz"):
+        return load_flat_model(path)
+    return FlatForest.from_sklearn(joblib.load(path))
+
+def augment(X, copies, noise, rng):
+    """X plus `copies` jittered copies (Gaussian noise of `noise` x each feature's std)."""
+    if copies <= 0:
+        return X
+    jitter = rng.normal(0.0, 1.0, (copies * len(X), X.shape[1])) * (noise * X.std(axis=0))
+    return np.concatenate([X, np.tile(X, (copies, 1)) + jitter])
+
+def fit_student(kind, params, X, teacher, seed=42):
+    """Train a student on the teacher's outputs for X."""
+    probs = teacher.predict_proba(X)
+    if kind == "net":
+        return TinyNet.fit(X, probs, teacher.classes_, seed=seed, **params)
+    labels = np.asarray(teacher.classes_)[np.argmax(probs, axis=1)].astype(str)
+    if kind == "tree":
+        model = DecisionTreeClassifier(random_state=seed, **params)
+    else:
+        model = RandomForestClassifier(random_state=seed, **params)
+    student = FlatForest.from_sklearn(model.fit(X, labels))
+    if list(student.classes_) != list(teacher.classes_):
+        # A class the teacher never predicted on X: pad it with zero probability
+        columns = [list(student.classes_).index(c) if c in student.classes_ else None for c in teacher.classes_]
+        value = np.zeros((len(student.value), len(columns)))
+        for i, column in enumerate(columns):
+            if column is not None:
+                value[:, i] = student.value[:, column]
+        student = FlatForest(student.feature, student.threshold, student.left, student.right, value,
+                             student.roots, np.asarray(teacher.classes_).astype(str), student.max_depth)
+    return student
+
+def score(model, X, y, teacher_pred):
+    pred = model.predict(X)
+    return float(np.mean(pred == y)), float(np.mean(pred == teacher_pred))
+
+def pareto(rows):
+    """Flag rows no other row beats on both accuracy and latency."""
+    for row in rows:
+        row["pareto"] = not any(
+            other["accuracy"] >= row["accuracy"] and other["latency_us"] <= row["latency_us"]
+            and (other["accuracy"] > row["accuracy"] or other["latency_us"] < row["latency_us"])
+            for other in rows)
+
+def markdown(report):
+    lines = [
+        f"# Distillation {report['created']}",
+        "",
+        f"- teacher: {report['teacher']} ({report['teacher_accuracy'] * 100:.2f}% on held-out chunks, "
+        f"{report['teacher_latency_us']:.0f} µs/frame; the teacher may have been trained on these frames)",
+        f"- data: {', '.join(report['data'])} ({report['train_frames']} train / {report['test_frames']} test frames, "
+        f"{report['augment']} jittered copies at {report['noise']} std)",
+        f"- chosen student: **{report['chosen']['model']}**"
+        + (f" (cascade threshold {report['chosen']['threshold']})" if report['chosen'].get('threshold') else ""),
+        "",
+        "| model | accuracy | agrees w/ teacher | escalated | µs/frame | x teacher speed | pareto |",
+        "|---|---:|---:|---:|---:|---:|:---:|",
+    ]
+    for r in report["results"]:
+        escalated = f"{r['escalation_rate'] * 100:.1f}%" if "escalation_rate" in r else ""
+        lines.append(f"| {r['model']} | {r['accuracy'] * 100:.2f}% | {r['fidelity'] * 100:.2f}% | {escalated} | "
+                     f"{r['latency_us']:.0f} | {r['speedup']:.1f} | {'★' if r['pareto'] else ''} |")
+    return "\n".join(lines) + "\n"
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the gesture forest into a small, fast model")
+    parser.add_argument("--teacher", default=None, help="Default: models/signspeak.npz, else models/signspeak.pkl")
+    parser.add_argument("--data", nargs="+", default=DEFAULT_DATA, help="Recording store dirs and/or CSVs")
+    parser.add_argument("--students", nargs="+", default=list(STUDENTS), choices=list(STUDENTS))
+    parser.add_argument("--augment", type=int, default=3, help="Jittered copies of each training frame")
+    parser.add_argument("--noise", type=float, default=0.05, help="Jitter, as a fraction of each feature's std")
+    parser.add_argument("--test-size", type=float, default=0.25, help="Held-out fraction of recording chunks")
+    parser.add_argument("--chunk", type=int, default=100, help="Frames per recording chunk")
+    parser.add_argument("--budget", type=float, default=0.5, help="Accuracy budget vs the teacher (percentage points)")
+    parser.add_argument("--latency-frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="reports", help="Report directory")
+    parser.add_argument("--save", action="store_true",
+                        help="Retrain the chosen student on all frames and write models/signspeak_small.npz")
+    args = parser.parse_args()
+
+    teacher_path = args.teacher or ("models/signspeak.npz" if os.path.exists("models/signspeak.npz")
+                                    else "models/signspeak.pkl")
+    teacher = load_teacher(teacher_path)
+    X, y, groups = load_data(args.data, args.chunk)
+    known = np.isin(y, teacher.classes_.astype(str))
+    if not known.all():
+        print(f"⚠️ Skipping {int((~known).sum())} frames with labels the teacher does not know: "
+              f"{sorted(set(y[~known]))}")
+        X, y, groups = X[known], y[known], groups[known]
+
+    split = GroupShuffleSplit(n_splits=1, test_size=args.test_size, random_state=args.seed)
+    train_idx, test_idx = next(split.split(X, y, groups))
+    rng = np.random.default_rng(args.seed)
+    X_train = augment(X[train_idx], args.augment, args.noise, rng)
+    X_test, y_test = X[test_idx], y[test_idx]
+    teacher_pred = teacher.predict(X_test)
+    latency_frames = X_test[rng.permutation(len(X_test))[:args.latency_frames]]
+
+    teacher_accuracy = float(np.mean(teacher_pred == y_test))
+    teacher_latency = frame_latency(teacher, latency_frames) * 1e6
+    print(f"📊 Teacher {teacher_path}: {teacher_accuracy * 100:.2f}% on {len(y_test)} held-out frames, "
+          f"{teacher_latency:.0f} µs/frame\n")
+
+    results = []
+    students = {}
+    for name in args.students:
+        kind, params = STUDENTS[name]
+        start = time.perf_counter()
+        student = students[name] = fit_student(kind, params, X_train, teacher, args.seed)
+        fit_seconds = time.perf_counter() - start
+        accuracy, fidelity = score(student, X_test, y_test, teacher_pred)
+        results.append({"model": name, "student": name, "accuracy": accuracy, "fidelity": fidelity,
+                        "latency_us": frame_latency(student, latency_frames) * 1e6, "fit_seconds": fit_seconds})
+
+        for threshold in CASCADE_THRESHOLDS:
+            cascade = CascadeModel(student, teacher, threshold)
+            accuracy, fidelity = score(cascade, X_test, y_test, teacher_pred)
+            escalation = cascade.stats()["escalation_rate"]
+            results.append({"model": f"{name} → teacher <{threshold}", "student": name, "threshold": threshold,
+                            "accuracy": accuracy, "fidelity": fidelity, "escalation_rate": escalation,
+                            "latency_us": frame_latency(cascade, latency_frames) * 1e6})
+
+    results.append({"model": "teacher", "student": None, "accuracy": teacher_accuracy, "fidelity": 1.0,
+                    "latency_us": teacher_latency})
+    for r in results:
+        r["speedup"] = teacher_latency / r["latency_us"]
+        r["realtime"] = 1e6 / (r["latency_us"] * GLOVE_HZ)
+    pareto(results)
+    results.sort(key=lambda r: r["latency_us"])
+
+    # Fastest student (alone or as a cascade) within the budget of the teacher
+    eligible = [r for r in results if r["student"] and r["accuracy"] >= teacher_accuracy - args.budget / 100.0]
+    chosen = eligible[0] if eligible else max((r for r in results if r["student"]), key=lambda r: r["accuracy"])
+
+    for r in results:
+        escalated = f"{r['escalation_rate'] * 100:5.1f}% esc" if "escalation_rate" in r else " " * 9
+        print(f"   {r['model']:<26} {r['accuracy'] * 100:6.2f}%  agree {r['fidelity'] * 100:6.2f}%  {escalated}  "
+              f"{r['latency_us']:6.0f} µs/frame  x{r['speedup']:.1f}{'  ★' if r['pareto'] else ''}")
+
+    created = time.strftime("%Y%m%d-%H%M%S")
+    report = {
+        "created": created,
+        "teacher": os.path.normpath(teacher_path),
+        "teacher_accuracy": teacher_accuracy,
+        "teacher_latency_us": teacher_latency,
+        "data": [os.path.normpath(p) for p in args.data],
+        "train_frames": int(len(train_idx)),
+        "test_frames": int(len(test_idx)),
+        "augment": args.augment,
+        "noise": args.noise,
+        "budget": args.budget,
+        "chosen": chosen,
+        "results": results,
+    }
+    os.makedirs(args.out, exist_ok=True)
+    base = os.path.join(args.out, f"distill-{created}")
+    with open(f"{base}.json", "w") as f:
+        json.dump(report, f, indent=2)
+    with open(f"{base}.md", "w") as f:
+        f.write(markdown(report))
+    print(f"\n⚡ Chosen: {chosen['model']} {chosen['accuracy'] * 100:.2f}%, {chosen['latency_us']:.0f} µs/frame "
+          f"(teacher {teacher_accuracy * 100:.2f}%, {teacher_latency:.0f} µs/frame)")
+    print(f"Report: {base}.json / .md")
+
+    if args.save:
+        kind, params = STUDENTS[chosen["student"]]
+        student = fit_student(kind, params, augment(X, args.augment, args.noise, rng), teacher, args.seed)
+        save_checked(student, os.path.join("models", "signspeak_small.npz"), X) # Reloaded and compared first
+        print(f"✅ Saved {chosen['student']} to models/signspeak_small.npz")
+        if chosen.get("threshold"):
+            print(f"   Run the backend with ML_CASCADE_THRESHOLD={chosen['threshold']} to use it as a cascade")
+        else:
+            print("   Accurate enough alone: copy it over models/signspeak.npz, or use it as a cascade")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# export_model.py
+# Flattens the trained RandomForest pickle into the array format loaded by
+# MLService (services/flat_forest.py). Re-run after every retrain.
+#
+# Usage (from backend/): python export_model.py [models/signspeak.pkl] [models/signspeak.npz]
+import sys
+import time
+
+import joblib
+
+from services.flat_forest import FlatForest
+
+def export(pkl_path, npz_path):
+    model = joblib.load(pkl_path)
+    forest = FlatForest.from_sklearn(model)
+    forest.save(npz_path)
+    print(f"✅ Exported {len(forest.roots)} trees ({len(forest.feature)} nodes, depth {forest.max_depth}) to {npz_path}")
+    print(f"   Classes: {forest.classes_.tolist()}")
+
+    start = time.perf_counter()
+    joblib.load(pkl_path)
+    pkl_time = time.perf_counter() - start
+    start = time.perf_counter()
+    FlatForest.load(npz_path)
+    npz_time = time.perf_counter() - start
+    print(f"   Load time: pickle {pkl_time * 1000:.1f} ms | flat {npz_time * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    pkl_path = sys.argv[1] if len(sys.argv) > 1 else "models/signspeak.pkl"
+    npz_path = sys.argv[2] if len(sys.argv) > 2 else "models/signspeak.npz"
+    export(pkl_path, npz_path)
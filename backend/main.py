@@ -1,10 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import audio, sensors
+from api.routes import audio, metrics, recording, sensors, stream
 from services.udp_service import udp_service
 from services.serial_service import serial_service
 from services.ml_service import ml_service
 from services.tts_service import tts_service
+from services.playback_service import DROP_STALE
 import logging
 
 # Logging
@@ -23,32 +24,35 @@ app.add_middleware(
 )
 
 from services.data_store import data_store
+from services.session_service import session_manager
 
-from services.gemini_service import gemini_service
+from services.sentence_service import sentence_service
+from services.utterance_service import utterance_segmenter
+from services.speculation_service import speculation
+from services.tracing import tracer
+from services.recording_service import recording_service
 import asyncio
 import time
 
 # --- STATE ---
-word_buffer = []
-last_detection_time = 0
-last_spoken_time = 0 # For AI-Off mode cooldown
-SILENCE_THRESHOLD = 3.0 # Seconds
+# Per-glove word buffers live in session_manager; end-of-utterance timers
+# (silence / end gesture / hand rest) in utterance_segmenter
+SESSION_SWEEP_INTERVAL = 30 # Seconds
 
 # --- CALLBACKS ---
-def on_ml_prediction(word):
+def on_ml_prediction(word, device_id):
     """Callback when ML logic detects a new stable gesture"""
-    global last_detection_time, last_spoken_time
-    logger.info(f"Main received stable word: {word}")
+    logger.info(f"Main received stable word: {word} ({device_id})")
+    # Frame that completed the word -> callback: micro-batch wait + predict,
+    # not how long the gesture was held
+    tracer.mark(device_id, "word", since="frame", metric="word_predict")
     
     # Update store for frontend (raw gesture)
-    data_store.update({"gesture": word})
+    data_store.update({"gesture": word}, device_id=device_id)
     
-    # Buffer logic
-    # Dedup: Only add if distinct from last word
-    if not word_buffer or word_buffer[-1] != word:
-        word_buffer.append(word)
-    
-    last_detection_time = time.time()
+    # Buffer the word and re-arm the silence timer (dedup happens in the session)
+    utterance_segmenter.on_word(device_id, word)
+    session = session_manager.get(device_id)
     
     # AI OFF MODE: Speak Immediately (with Delay)
     use_gemini = data_store.config.get("use_gemini", True)
@@ -56,50 +60,91 @@ def on_ml_prediction(word):
 
     if not use_gemini and auto_speak:
         # Check cooldown to avoid repetition spam
-        if time.time() - last_spoken_time > 2.0:
-            tts_service.speak(word)
-            last_spoken_time = time.time() 
+        if time.time() - session.last_spoken_time > 2.0:
+            tts_service.speak(word, policy=DROP_STALE) # Newer words replace queued ones
+            session.last_spoken_time = time.time() 
+
+def on_serial_data(flex, acc, device_id):
+    """Callback when Serial/UDP gets new sensor data"""
+    received = tracer.mark(device_id, "frame")
+    session_manager.get(device_id) # Keep the glove's session alive
+    ml_service.process_data(flex, acc, device_id)
+    frames = [list(flex) + list(acc)] # One row, shared by the segmenter and the recorder
+    utterance_segmenter.on_frames(device_id, frames)
+    recording_service.on_frames(device_id, frames)
+    tracer.observe("ingest", time.monotonic() - received)
+
+def on_sensor_batch(features, device_id):
+    """Callback when the asyncio UDP receiver delivers a block of frames"""
+    received = tracer.mark(device_id, "frame")
+    session_manager.get(device_id)
+    ml_service.process_batch(features, device_id)
+    utterance_segmenter.on_frames(device_id, features)
+    recording_service.on_frames(device_id, features)
+    tracer.observe("ingest", time.monotonic() - received)
+
+def on_buffer_changed(device_id, words):
+    """Runs on the event loop whenever a glove's word buffer changes"""
+    # Speculate: build the sentence (and its audio) while the user keeps signing
+    if data_store.config.get("use_gemini", True):
+        speculation.update(device_id, words, with_audio=data_store.config.get("auto_speak", False))
 
-def on_serial_data(flex, acc):
-    """Callback when Serial gets new sensor data"""
-    ml_service.process_data(flex, acc)
+def on_session_closed(device_id):
+    utterance_segmenter.cancel(device_id)
+    if utterance_segmenter.loop is not None:
+        utterance_segmenter.loop.call_soon_threadsafe(speculation.discard, device_id)
+
+async def form_sentence(device_id, raw_words, reason):
+    """Called by the utterance segmenter once a glove has finished a sentence"""
+    logger.info(f"📝 Forming sentence for {device_id} from: {raw_words}")
+    tracer.mark(device_id, "utterance_end", since="word") # Includes the silence wait
+    session = session_manager.find(device_id)
+    last_gesture = session.last_detection_time if session is not None else time.time()
+
+    # Notify frontend of processing
+    data_store.update({"sentence": "Processing..."}, device_id=device_id)
+
+    # Check Toggle (AI Enhance)
+    use_gemini = data_store.config.get("use_gemini", True)
+    auto_speak = data_store.config.get("auto_speak", False)
+
+    natural_sentence = ""
+    audio = None
+    speculated = await speculation.take(device_id, raw_words) if use_gemini else None
+    if speculated is not None:
+        natural_sentence, audio = speculated # Already formed while the user was signing
+    elif use_gemini:
+        natural_sentence = await sentence_service.generate_async(raw_words) # Local composer or Gemini (SENTENCE_ENGINE)
+    else:
+        # Raw Mode: Just join words
+        natural_sentence = " ".join(raw_words)
+
+    if natural_sentence:
+        elapsed = time.time() - last_gesture
+        tracer.observe("gesture_to_sentence", elapsed)
+        tracer.mark(device_id, "sentence", since="utterance_end")
+        logger.info(f"⏱️ Last gesture -> sentence: {elapsed * 1000:.0f} ms "
+                    f"({'speculative' if speculated is not None else 'on demand'}, {reason})")
+
+        # Update frontend with FULL sentence
+        data_store.update({"sentence": natural_sentence}, device_id=device_id)
+
+        # Speak natural sentence (ONLY IF AUTO-SPEAK IS ON)
+        if auto_speak:
+            def on_audio_start():
+                waited = time.time() - last_gesture
+                tracer.observe("gesture_to_audio", waited)
+                tracer.mark(device_id, "audio", since="sentence")
+                logger.info(f"⏱️ Last gesture -> audio start: {waited * 1000:.0f} ms "
+                            f"({'pre-synthesized' if audio else 'synthesized on demand'})")
+            tts_service.speak(natural_sentence, audio=audio, on_start=on_audio_start)
 
 # --- BACKGROUND TASK ---
-async def sentence_formation_loop():
-    global word_buffer
-    logger.info("⏳ Sentence Formation Loop Started")
-    
+async def session_sweep_loop():
+    """Drops gloves that stopped sending (sentences are event driven)"""
     while True:
-        await asyncio.sleep(1) # Check every second
-        
-        if word_buffer and (time.time() - last_detection_time > SILENCE_THRESHOLD):
-            # Form sentence
-            raw_words = word_buffer.copy()
-            word_buffer.clear() # Reset immediately
-            
-            logger.info(f"📝 Forming sentence from: {raw_words}")
-            
-            # Notify frontend of processing
-            data_store.update({"sentence": "Processing..."})
-            
-            # Check Toggle (AI Enhance)
-            use_gemini = data_store.config.get("use_gemini", True)
-            auto_speak = data_store.config.get("auto_speak", False)
-            
-            natural_sentence = ""
-            if use_gemini:
-                natural_sentence = gemini_service.generate_sentence(raw_words)
-            else:
-                # Raw Mode: Just join words
-                natural_sentence = " ".join(raw_words)
-            
-            if natural_sentence:
-                # Update frontend with FULL sentence
-                data_store.update({"sentence": natural_sentence})
-                
-                # Speak natural sentence (ONLY IF AUTO-SPEAK IS ON)
-                if auto_speak:
-                    tts_service.speak(natural_sentence)
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+        session_manager.evict_idle()
 
 @app.on_event("startup")
 async def startup_event():
@@ -107,25 +152,38 @@ async def startup_event():
     try:
         # Wire up the system
         ml_service.register_callback(on_ml_prediction)
+        session_manager.register_evict_callback(ml_service.drop_device)
+        session_manager.register_evict_callback(data_store.drop_device)
+        session_manager.register_evict_callback(on_session_closed)
+        session_manager.register_evict_callback(tracer.drop_device)
+        utterance_segmenter.register_callback(form_sentence)
+        utterance_segmenter.register_buffer_callback(on_buffer_changed)
+        utterance_segmenter.start()
         serial_service.register_callback(on_serial_data)
-        udp_service.register_callback(on_serial_data) # Reuse same callback for UDP
+        udp_service.register_callback(on_serial_data) # Reuse same callback for UDP (thread mode)
+        udp_service.register_batch_callback(on_sensor_batch)
         
-        udp_service.start()
+        await udp_service.start_async() # Falls back to the threaded receiver
         serial_service.start()
         
         # Start background loop
-        asyncio.create_task(sentence_formation_loop())
+        asyncio.create_task(session_sweep_loop())
     except Exception as e:
         logger.error(f"Error during startup: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     udp_service.stop()
+    ml_service.stop() # Predict frames still waiting in micro-batches
+    recording_service.stop() # Flush what was recorded
     # serial_service.stop()
 
 # Routes
 app.include_router(sensors.router)
+app.include_router(stream.router)
+app.include_router(metrics.router)
 app.include_router(audio.router, prefix="/audio", tags=["Audio"])
+app.include_router(recording.router, prefix="/recording", tags=["Recording"])
 
 @app.get("/")
 def root():
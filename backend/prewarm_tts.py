@@ -0,0 +1,74 @@
+# prewarm_tts.py
+# Synthesizes every gesture word the model can output (plus its composed
+# one-word sentence, e.g. "HELLO" -> "Hello.") into the TTS audio cache, so
+# the first time a word is spoken it already plays with no network.
+# Re-run after retraining with new classes.
+#
+# Usage (from backend/): python prewarm_tts.py [--lang en hi] [--extra "Thank you"] [--dry-run]
+import argparse
+import asyncio
+import os
+import time
+
+import joblib
+
+from services.flat_forest import FlatForest
+from services.sentence_composer import sentence_composer
+from services.tts_service import DEFAULT_VOICE, tts_service, voice_for
+
+def model_classes():
+    classes = set()
+    if os.path.exists("models/signspeak.npz"):
+        classes.update(FlatForest.load("models/signspeak.npz").classes_.tolist())
+    elif os.path.exists("models/signspeak.pkl"):
+        classes.update(str(c) for c in joblib.load("models/signspeak.pkl").classes_)
+    if os.path.exists("models/signspeak_window.pkl"):
+        classes.update(str(c) for c in joblib.load("models/signspeak_window.pkl")["model"].classes_)
+    return sorted(classes)
+
+def phrases(classes, extra):
+    texts = []
+    for word in classes:
+        texts.append(word) # Spoken as-is in AI-off mode
+        texts.append(sentence_composer.compose([word]))
+    texts += extra
+    return list(dict.fromkeys(t for t in texts if t))
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lang", nargs="*", default=["en"], help="Languages (voices from VOICE_MAP)")
+    parser.add_argument("--extra", nargs="*", default=[], help="Additional phrases to cache")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be synthesized")
+    args = parser.parse_args()
+
+    classes = model_classes()
+    texts = phrases(classes, args.extra)
+    voices = list(dict.fromkeys([DEFAULT_VOICE] + [voice_for(lang) for lang in args.lang]))
+    print(f"Classes: {classes}")
+    print(f"{len(texts)} phrases x {len(voices)} voices ({', '.join(voices)})")
+    if args.dry_run:
+        for text in texts:
+            print(f"   {text}")
+        return
+
+    cache = tts_service.cache
+    cached = failed = 0
+    start = time.perf_counter()
+    for voice in voices:
+        for text in texts:
+            if cache.get(text, voice) is not None:
+                cached += 1
+                continue
+            try:
+                audio = await tts_service.synthesize(text, voice)
+                print(f"✅ {voice}: '{text}' ({len(audio)} bytes)")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {voice}: '{text}' failed: {e}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\nDone in {elapsed:.1f}s: {cached} already cached, {failed} failed")
+    print(f"Cache: {cache.stats()}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,265 @@
+# replay_sensors.py
+# Streams recorded glove data into the backend as if N gloves were signing:
+# over UDP (what the ESP32 firmware uses), TCP, or a serial pseudo-terminal.
+# Accepts the repo's recording layouts:
+#   ML/training_data.csv, yash/training_data.csv   f1..f4,ax,ay,az,label (no header)
+#   dataset_<Label>.csv                            timestamp,f1..f4,ax..az,gx..gz,label
+#
+# Recordings with timestamps replay at their recorded pace, others at --hz;
+# --speed scales either (2 = twice as fast, 0 = as fast as possible).
+#
+# Usage (from backend/):
+#   python replay_sensors.py ../yash/training_data.csv --gloves 4 --speed 2
+#   python replay_sensors.py ../dataset_Hello.csv --transport tcp --port 5000
+#   python replay_sensors.py ../ML/training_data.csv --transport serial   (prints the pty path)
+import argparse
+import os
+import socket
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.frame_codec import encode_binary_frame
+
+FEATURES = ['f1', 'f2', 'f3', 'f4', 'ax', 'ay', 'az']
+GYRO = ['gx', 'gy', 'gz']
+
+class Recording:
+    """Frames of one CSV: features [n, 7], gyro [n, 3], labels [n] (or None), timestamps [n] (or None)."""
+
+    def __init__(self, path, features, gyro, labels=None, timestamps=None):
+        self.path = path
+        self.features = features
+        self.gyro = gyro
+        self.labels = labels
+        self.timestamps = timestamps
+
+    def __len__(self):
+        return len(self.features)
+
+    def integer_flex(self):
+        """True if flex values are raw ADC counts (sendable as binary int16 frames)."""
+        flex = self.features[:, :4]
+        return bool(np.all(flex == np.round(flex)) and flex.max(initial=0) > 1)
+
+def load_recording(path, rows=None):
+    with open(path) as f:
+        has_header = "f1" in f.readline()
+    if has_header:
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_csv(path, header=None, names=FEATURES + ['label'])
+    df = df.dropna(subset=FEATURES)
+    if rows:
+        df = df.iloc[:rows]
+    gyro = df[GYRO].to_numpy(dtype=np.float64) if set(GYRO) <= set(df.columns) else np.zeros((len(df), 3))
+    return Recording(
+        path,
+        df[FEATURES].to_numpy(dtype=np.float64),
+        gyro,
+        labels=df['label'].astype(str).str.upper().to_numpy() if 'label' in df.columns else None,
+        timestamps=df['timestamp'].to_numpy(dtype=np.float64) if 'timestamp' in df.columns else None,
+    )
+
+def schedule(recording, hz=50.0, speed=1.0):
+    """Send time of every frame (seconds from start), or None to send as fast as possible."""
+    if not speed:
+        return None
+    if recording.timestamps is not None and len(recording) > 1:
+        offsets = np.maximum.accumulate(recording.timestamps - recording.timestamps[0])
+        if offsets[-1] > 0:
+            return offsets / speed
+    return np.arange(len(recording)) / (hz * speed)
+
+def encode_frames(recording, device_id, start, stop, seq, binary):
+    """One datagram / stream chunk for frames [start, stop) of a recording."""
+    if binary:
+        now_ms = int(time.time() * 1000)
+        return b"".join(
+            encode_binary_frame(device_id, seq + i, now_ms, recording.features[row, :4],
+                                recording.features[row, 4:7], recording.gyro[row])
+            for i, row in enumerate(range(start, stop))
+        )
+    # Text "f1,...,az,glove-<id>" (keeps fractional flex values, e.g. dataset_*.csv)
+    lines = [",".join(f"{v:g}" for v in recording.features[row]) + f",glove-{device_id}"
+             for row in range(start, stop)]
+    return ("\n".join(lines) + "\n").encode()
+
+# ---------------- Transports ----------------
+
+class UdpTarget:
+    def __init__(self, host, port):
+        self.address = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def connect(self):
+        return self # Datagrams: one socket is shared by every glove
+
+    def send(self, data):
+        self.sock.sendto(data, self.address)
+
+    def close(self):
+        self.sock.close()
+
+class TcpTarget:
+    def __init__(self, host, port):
+        self.address = (host, port)
+        self.sock = None
+
+    def connect(self):
+        # One connection per glove, like separate devices
+        target = TcpTarget(*self.address)
+        target.sock = socket.create_connection(self.address)
+        target.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return target
+
+    def send(self, data):
+        self.sock.sendall(data)
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+
+class PtyTarget:
+    """A pseudo-terminal the backend can open as its serial port (SERIAL_PORT=<path>)."""
+
+    def __init__(self):
+        import pty
+        self.master, self.slave = pty.openpty()
+        self.path = os.ttyname(self.slave)
+        self.lock = threading.Lock()
+
+    def connect(self):
+        return self # One serial line carries every glove (binary frames have device ids)
+
+    def send(self, data):
+        with self.lock:
+            os.write(self.master, data)
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+# ---------------- Replay ----------------
+
+class GloveReplay(threading.Thread):
+    """Sends one recording as one glove on an absolute schedule (no drift at high rates)."""
+
+    def __init__(self, target, recording, device_id, offsets, batch=1, binary=True, loops=1, delay=0.0):
+        super().__init__(daemon=True, name=f"replay-glove-{device_id}")
+        self.target = target
+        self.recording = recording
+        self.device_id = device_id
+        self.offsets = offsets
+        self.batch = max(1, batch)
+        self.binary = binary
+        self.loops = loops
+        self.delay = delay
+        self.sent = 0
+        self.stop_event = threading.Event()
+
+    def run(self):
+        connection = self.target.connect()
+        n = len(self.recording)
+        period = (self.offsets[-1] + self.offsets[1] - self.offsets[0]) if self.offsets is not None and n > 1 else 0.0
+        start = time.perf_counter() + self.delay
+        seq = 0
+        try:
+            for loop in range(self.loops):
+                for first in range(0, n, self.batch):
+                    if self.stop_event.is_set():
+                        return
+                    last = min(first + self.batch, n)
+                    if self.offsets is not None:
+                        due = start + loop * period + self.offsets[last - 1]
+                        time.sleep(max(0.0, due - time.perf_counter()))
+                    connection.send(encode_frames(self.recording, self.device_id, first, last, seq, self.binary))
+                    seq += last - first
+                    self.sent += last - first
+        finally:
+            if connection is not self.target:
+                connection.close()
+
+    def stop(self):
+        self.stop_event.set()
+
+def make_target(transport, host, port):
+    if transport == "udp":
+        return UdpTarget(host, port)
+    if transport == "tcp":
+        return TcpTarget(host, port)
+    if transport == "serial":
+        return PtyTarget()
+    raise ValueError(f"Unknown transport '{transport}'")
+
+def start_gloves(target, recording, gloves=1, hz=50.0, speed=1.0, batch=1, binary=None, loops=1,
+                 stagger=0.0, first_id=1):
+    """Start one GloveReplay thread per simulated glove; returns the threads."""
+    offsets = schedule(recording, hz, speed)
+    if binary is None:
+        binary = recording.integer_flex()
+    replays = []
+    for i in range(gloves):
+        replay = GloveReplay(target, recording, first_id + i, offsets, batch, binary, loops, delay=i * stagger)
+        replay.start()
+        replays.append(replay)
+    return replays
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded glove data into the backend")
+    parser.add_argument("csv", nargs="+", help="Recording(s); concatenated in order")
+    parser.add_argument("--transport", choices=["udp", "tcp", "serial"], default="udp")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Default 5005 (udp) / 5000 (tcp)")
+    parser.add_argument("--gloves", type=int, default=1, help="Simulated gloves (glove-1..N)")
+    parser.add_argument("--hz", type=float, default=50.0, help="Frame rate for recordings without timestamps")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed factor (0 = as fast as possible)")
+    parser.add_argument("--batch", type=int, default=1, help="Frames per datagram / write")
+    parser.add_argument("--text", action="store_true", help="Send CSV text frames instead of binary v1")
+    parser.add_argument("--loops", type=int, default=1, help="Times to replay the recording (0 = forever)")
+    parser.add_argument("--stagger", type=float, default=0.25, help="Start delay between gloves (s)")
+    parser.add_argument("--rows", type=int, default=None, help="Only replay the first N frames")
+    args = parser.parse_args()
+
+    recordings = [load_recording(path, args.rows) for path in args.csv]
+    recording = Recording(
+        ", ".join(args.csv),
+        np.concatenate([r.features for r in recordings]),
+        np.concatenate([r.gyro for r in recordings]),
+    )
+    port = args.port or (5000 if args.transport == "tcp" else 5005)
+    target = make_target(args.transport, args.host, port)
+    binary = False if args.text else None
+    if binary is None and not recording.integer_flex():
+        binary = False
+        print("ℹ️ Fractional flex values: sending text frames")
+
+    if args.transport == "serial":
+        print(f"🔌 Serial pty: {target.path} (start the backend with SERIAL_PORT={target.path})")
+        input("Press Enter once the backend is connected...")
+    else:
+        print(f"📡 Replaying to {args.transport}://{args.host}:{port}")
+    print(f"   {len(recording)} frames x {args.gloves} glove(s), speed {args.speed:g}, "
+          f"{args.batch} frame(s)/write, {'text' if binary is False else 'binary'} frames")
+
+    loops = args.loops or 10 ** 9
+    start = time.perf_counter()
+    replays = start_gloves(target, recording, args.gloves, args.hz, args.speed, args.batch, binary, loops,
+                           args.stagger)
+    try:
+        for replay in replays:
+            while replay.is_alive():
+                replay.join(timeout=0.5)
+    except KeyboardInterrupt:
+        for replay in replays:
+            replay.stop()
+        print("\nStopped.")
+    elapsed = time.perf_counter() - start
+    sent = sum(r.sent for r in replays)
+    print(f"✅ Sent {sent} frames in {elapsed:.1f}s ({sent / elapsed:.0f} frames/s)")
+    target.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+def audio_key(text, voice, rate="+0%"):
+    """Content address of synthesized speech: hash of text + voice + rate."""
+    text = " ".join(str(text).split())
+    return hashlib.sha256(f"{voice}\n{rate}\n{text}".encode("utf-8")).hexdigest()
+
+class AudioCache:
+    """
+    Two-tier cache of synthesized speech (MP3 bytes).
+
+    - disk: one `<sha256>.mp3` per phrase in `directory`, bounded to
+      `max_bytes` with least-recently-used eviction (file mtime is the
+      last use, so the order survives restarts)
+    - memory: the `hot_items` most recently played phrases, so repeats
+      never touch the disk
+    """
+
+    def __init__(self, directory="cache/tts", max_bytes=64 * 1024 * 1024, hot_items=64):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hot_items = hot_items
+        self.hot = OrderedDict() # key -> bytes
+        self.index = OrderedDict() # key -> size on disk, least recently used first
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.hot_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._load_index()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def _load_index(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.directory):
+                if name.endswith(".mp3"):
+                    stat = os.stat(os.path.join(self.directory, name))
+                    entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        except OSError as e:
+            logger.error(f"❌ Audio cache unavailable ({self.directory}): {e}")
+            return
+        for _, key, size in sorted(entries):
+            self.index[key] = size
+            self.total_bytes += size
+        if entries:
+            logger.info(f"✅ Audio cache: {len(entries)} phrases, {self.total_bytes / 1024:.0f} KiB")
+
+    def get(self, text, voice, rate="+0%"):
+        key = audio_key(text, voice, rate)
+        with self.lock:
+            audio = self.hot.get(key)
+            if audio is not None:
+                self.hot.move_to_end(key)
+                if key in self.index:
+                    self.index.move_to_end(key)
+                self.hot_hits += 1
+                return audio
+            if key not in self.index:
+                self.misses += 1
+                return None
+
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._path(key)) # Last use, for LRU across restarts
+        except OSError:
+            with self.lock:
+                self.total_bytes -= self.index.pop(key, 0)
+                self.misses += 1
+            return None
+
+        with self.lock:
+            if key in self.index:
+                self.index.move_to_end(key)
+            self.disk_hits += 1
+            self._remember(key, audio)
+        return audio
+
+    def put(self, text, voice, audio, rate="+0%"):
+        if not audio:
+            return
+        key = audio_key(text, voice, rate)
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path) # Readers never see a partial file
+        except OSError as e:
+            logger.warning(f"⚠️ Audio cache write failed: {e}")
+            return
+
+        with self.lock:
+            self.total_bytes += len(audio) - self.index.pop(key, 0)
+            self.index[key] = len(audio)
+            self._remember(key, audio)
+            evicted = self._evict()
+        for old in evicted:
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                pass
+
+    def _remember(self, key, audio):
+        # Called with the lock held
+        self.hot[key] = audio
+        self.hot.move_to_end(key)
+        while len(self.hot) > self.hot_items:
+            self.hot.popitem(last=False)
+
+    def _evict(self):
+        # Called with the lock held; returns keys whose files should be deleted
+        evicted = []
+        while self.total_bytes > self.max_bytes and len(self.index) > 1:
+            key, size = self.index.popitem(last=False)
+            self.total_bytes -= size
+            self.hot.pop(key, None)
+            evicted.append(key)
+        return evicted
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hot_hits + self.disk_hits + self.misses
+            return {
+                "phrases": len(self.index),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hot_phrases": len(self.hot),
+                "hot_hits": self.hot_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hot_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
@@ -1,35 +1,265 @@
+import asyncio
 import threading
 import time
+from types import MappingProxyType
+import numpy as np
+
+HISTORY_COLUMNS = ["t", "f1", "f2", "f3", "f4", "f5", "ax", "ay", "az", "gx", "gy", "gz"]
+
+def _frozen(data):
+    return MappingProxyType(data)
+
+class Snapshot:
+    """
+    One immutable published state of the store. Readers grab the current
+    snapshot with a single attribute read and never take a lock; writers
+    build a new snapshot and swap the reference.
+    """
+    __slots__ = ("version", "latest", "devices", "config")
+
+    def __init__(self, version, latest, devices, config):
+        self.version = version
+        self.latest = latest # Mapping: legacy "most recent glove wins" view
+        self.devices = devices # Mapping: device_id -> Mapping
+        self.config = config # Mapping
+
+    def get(self, device_id=None):
+        """Data merged with config as a new dict; None if device_id is unknown."""
+        if device_id is None:
+            data = dict(self.latest)
+        else:
+            device_data = self.devices.get(device_id)
+            if device_data is None:
+                return None
+            data = dict(device_data)
+        data.update(self.config) # Merge config into response
+        return data
+
+class FrameHistory:
+    """Bounded ring of recent sensor frames in a preallocated array."""
+
+    def __init__(self, capacity=512):
+        self.capacity = int(capacity)
+        self.frames = np.zeros((self.capacity, len(HISTORY_COLUMNS)), dtype=np.float64)
+        self.count = 0
+
+    def append(self, now, data):
+        row = self.frames[self.count % self.capacity]
+        row.fill(0.0)
+        row[0] = now
+        flex = data.get("flex") or ()
+        row[1:1 + min(len(flex), 5)] = flex[:5]
+        row[6:12] = [data.get(k, 0.0) for k in ("ax", "ay", "az", "gx", "gy", "gz")]
+        self.count += 1
+
+    def extend(self, now, flex, acc, gyro):
+        """Append a block of frames: flex [n, <=5], acc [n, 3], gyro [n, 3]."""
+        n = len(flex)
+        if n > self.capacity: # Only the newest frames fit
+            flex, acc, gyro = flex[-self.capacity:], acc[-self.capacity:], gyro[-self.capacity:]
+            self.count += n - self.capacity
+            n = self.capacity
+        rows = np.zeros((n, len(HISTORY_COLUMNS)), dtype=np.float64)
+        rows[:, 0] = now
+        width = min(np.shape(flex)[1], 5)
+        rows[:, 1:1 + width] = np.asarray(flex)[:, :width]
+        rows[:, 6:9] = acc
+        rows[:, 9:12] = gyro
+        idx = np.arange(self.count, self.count + n) % self.capacity
+        self.frames[idx] = rows
+        self.count += n
+
+    def recent(self, n=None):
+        """Last n frames (oldest first) as a copy."""
+        size = min(self.count, self.capacity)
+        n = size if n is None else max(0, min(int(n), size))
+        end = self.count % self.capacity
+        idx = np.arange(end - n, end) % self.capacity
+        return self.frames[idx].copy()
 
 class DataStore:
-    def __init__(self):
-        self.lock = threading.Lock()
-        self.latest_data = {
-            "ax": 0.0, "ay": 0.0, "az": 0.0,
-            "gx": 0.0, "gy": 0.0, "gz": 0.0,
-            "flex": [0, 0, 0, 0, 0],
-            "last_updated": 0
-        }
-        self.config = {
-            "use_gemini": True,
-            "lang": "en",
-            "auto_speak": False 
-        }
-
-    def update(self, new_data):
+    """
+    Latest sensor / gesture / sentence state, published as versioned
+    immutable snapshots.
+
+    - update() (ingest threads, event loop) builds a new snapshot under a
+      writer-only lock and swaps it in with one reference assignment
+    - get() / snapshot() read the current reference without locking
+    - wait_for_change() lets async consumers sleep until a newer version
+      is published instead of polling
+    """
+
+    def __init__(self, history_size=512):
+        self.lock = threading.Lock() # Writers (and waiter registration) only
+        self.history_size = history_size
+        self._history = {} # device_id -> FrameHistory
+        self._waiters = [] # (loop, future) pairs
+        self._snapshot = Snapshot(
+            version=0,
+            latest=_frozen({
+                "ax": 0.0, "ay": 0.0, "az": 0.0,
+                "gx": 0.0, "gy": 0.0, "gz": 0.0,
+                "flex": [0, 0, 0, 0, 0],
+                "last_updated": 0
+            }),
+            # Latest data per glove (device_id -> dict). latest above keeps
+            # the legacy "most recent glove wins" view for single-glove setups.
+            devices=_frozen({}),
+            config=_frozen({
+                "use_gemini": True,
+                "lang": "en",
+                "auto_speak": False
+            }),
+        )
+
+    # ---------------- Readers (lock-free) ----------------
+
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    @property
+    def latest_data(self):
+        return self._snapshot.latest
+
+    @property
+    def devices(self):
+        return self._snapshot.devices
+
+    @property
+    def config(self):
+        return self._snapshot.config
+
+    def get(self, device_id=None):
+        """Latest data merged with config; None if device_id is unknown."""
+        return self._snapshot.get(device_id)
+
+    def list_devices(self):
+        return [
+            {
+                "device_id": device_id,
+                "last_updated": data.get("last_updated", 0),
+                "gesture": data.get("gesture"),
+                "sentence": data.get("sentence"),
+            }
+            for device_id, data in self._snapshot.devices.items()
+        ]
+
+    def history(self, device_id=None, n=None):
+        """Recent frames for a glove (or the legacy view) as an [n, len(HISTORY_COLUMNS)] array."""
+        with self.lock: # Rare reader; keeps the ring copy consistent
+            history = self._history.get(device_id)
+            if history is None:
+                return None
+            return history.recent(n)
+
+    async def wait_for_change(self, version, timeout=None):
+        """
+        Wait until a snapshot newer than `version` is published and return
+        it. On timeout the current snapshot is returned (same version).
+        """
+        snapshot = self._snapshot
+        if snapshot.version != version:
+            return snapshot
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self.lock:
+            if self._snapshot.version != version:
+                return self._snapshot
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return self._snapshot
+        finally:
+            with self.lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    # ---------------- Writers ----------------
+
+    def update(self, new_data, device_id=None, frames=None):
+        """
+        Merge fields into the latest state. `frames` (a list of (flex, acc,
+        gyro) arrays, e.g. every frame of a multi-frame datagram) goes to the
+        history instead of the single frame in new_data, so coalesced
+        dashboard updates don't drop frames from /sensors/history.
+        """
         with self.lock:
-            self.latest_data.update(new_data)
-            self.latest_data["last_updated"] = time.time()
+            now = time.time()
+            current = self._snapshot
+            latest = dict(current.latest)
+            latest.update(new_data)
+            latest["last_updated"] = now
+
+            devices = current.devices
+            if device_id is not None:
+                device_data = dict(current.devices.get(device_id) or {"device_id": device_id})
+                device_data.update(new_data)
+                device_data["last_updated"] = now
+                devices = dict(current.devices)
+                devices[device_id] = _frozen(device_data)
+                devices = _frozen(devices)
+
+            if frames:
+                for target in (None, device_id) if device_id is not None else (None,):
+                    history = self._history_for(target)
+                    for flex, acc, gyro in frames:
+                        history.extend(now, flex, acc, gyro)
+            elif "flex" in new_data:
+                self._record(None, now, new_data)
+                if device_id is not None:
+                    self._record(device_id, now, new_data)
+
+            self._publish(Snapshot(current.version + 1, _frozen(latest), devices, current.config))
 
-    def get(self):
+    def drop_device(self, device_id):
         with self.lock:
-            data = self.latest_data.copy()
-            data.update(self.config) # Merge config into response
-            return data
+            current = self._snapshot
+            self._history.pop(device_id, None)
+            if device_id not in current.devices:
+                return
+            devices = {k: v for k, v in current.devices.items() if k != device_id}
+            self._publish(Snapshot(current.version + 1, current.latest, _frozen(devices), current.config))
 
     def update_config(self, new_config):
         with self.lock:
-            self.config.update(new_config)
+            current = self._snapshot
+            if all(current.config.get(k) == v for k, v in new_config.items()):
+                return # Unchanged (e.g. every /sensors poll); don't wake consumers
+            config = dict(current.config)
+            config.update(new_config)
+            self._publish(Snapshot(current.version + 1, current.latest, current.devices, _frozen(config)))
+
+    def _history_for(self, device_id):
+        history = self._history.get(device_id)
+        if history is None:
+            history = self._history[device_id] = FrameHistory(self.history_size)
+        return history
+
+    def _record(self, device_id, now, data):
+        self._history_for(device_id).append(now, data)
+
+    def _publish(self, snapshot):
+        # Called with the lock held
+        self._snapshot = snapshot
+        if not self._waiters:
+            return
+        waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future, snapshot)
+            except RuntimeError:
+                pass # Loop already closed
+
+def _wake(future, snapshot):
+    if not future.done():
+        future.set_result(snapshot)
 
 # Global Instance
 data_store = DataStore()
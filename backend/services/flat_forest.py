@@ -0,0 +1,134 @@
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+class FlatForest:
+    """
+    A RandomForestClassifier flattened into contiguous NumPy node arrays.
+
+    All trees share one set of arrays; `roots` holds each tree's first node.
+    Leaves point to themselves, so every sample can be walked down every
+    tree in lock-step for `max_depth` steps without per-node branching.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, classes, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = np.asarray(classes).astype(object) # Plain str labels, like sklearn
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(feature.max()) + 1 if len(feature) else 0
+
+        # Walk state uses doubled node ids ("slots"): slot 2i is node i's right
+        # branch and 2i+1 its left, so `slot + (x <= threshold)` picks the next
+        # slot with a single take and no multiply.
+        self._children = np.empty(2 * len(left), dtype=np.int64)
+        self._children[0::2] = 2 * right
+        self._children[1::2] = 2 * left
+        self._feature = np.repeat(feature.astype(np.int64), 2)
+        self._threshold = np.repeat(threshold, 2)
+        self._roots = 2 * roots.astype(np.int64)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Flatten a fitted sklearn RandomForestClassifier (or single tree)."""
+        estimators = getattr(model, "estimators_", [model])
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for est in estimators:
+            tree = est.tree_
+            n = tree.node_count
+            idx = np.arange(n, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+
+            left = np.where(is_leaf, idx, tree.children_left).astype(np.int32) + offset
+            right = np.where(is_leaf, idx, tree.children_right).astype(np.int32) + offset
+
+            # Normalise leaf values to class probabilities like predict_proba does
+            value = tree.value[:, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(left)
+            rights.append(right)
+            values.append(value / totals)
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.array(roots, dtype=np.int32),
+            classes=np.asarray(model.classes_).astype(str),
+            max_depth=max_depth,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                feature=data["feature"],
+                threshold=data["threshold"],
+                left=data["left"],
+                right=data["right"],
+                value=data["value"],
+                roots=data["roots"],
+                classes=data["classes"],
+                max_depth=data["max_depth"],
+            )
+
+    def save(self, path):
+        np.savez(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            value=self.value,
+            roots=self.roots,
+            classes=np.asarray(self.classes_).astype(str), # Object arrays would need allow_pickle
+            max_depth=np.int32(self.max_depth),
+        )
+
+    def apply(self, X):
+        """Return the leaf index reached in every tree, shape [n_samples, n_trees]."""
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        n_samples, n_features = X.shape
+        n_trees = len(self._roots)
+
+        # Walk all (sample, tree) pairs at once on flat 1-D index arrays
+        flat_x = X.ravel()
+        slot = np.tile(self._roots, n_samples)
+        if n_samples == 1:
+            for _ in range(self.max_depth):
+                x = flat_x.take(self._feature.take(slot))
+                slot = self._children.take(slot + (x <= self._threshold.take(slot)))
+        else:
+            row_offset = np.repeat(np.arange(n_samples) * n_features, n_trees)
+            for _ in range(self.max_depth):
+                x = flat_x.take(row_offset + self._feature.take(slot))
+                slot = self._children.take(slot + (x <= self._threshold.take(slot)))
+        return (slot >> 1).reshape(n_samples, n_trees)
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        # Summing over the tree axis adds trees in order, matching sklearn
+        return self.value[leaves].sum(axis=1) / leaves.shape[1]
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
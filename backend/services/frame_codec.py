@@ -0,0 +1,257 @@
+import struct
+from collections import namedtuple
+import numpy as np
+
+# ================= BINARY FRAME (v1) =================
+# Little-endian, 46 bytes, sent by the ESP32 firmware when USE_BINARY_FRAMES=1
+# (see hardware/esp32.ino):
+#
+#   offset size  field
+#   0      2     magic        b"SG"
+#   2      1     version      1
+#   3      1     flags        reserved (0)
+#   4      2     device_id    uint16, glove id ("glove-<id>" in the backend)
+#   6      4     seq          uint32, +1 per frame (wraps), used for loss detection
+#   10     4     timestamp_ms uint32, millis() on the glove
+#   14     8     flex[4]      int16, smoothed ADC counts (0-4095)
+#   22     12    acc[3]       float32, m/s^2
+#   34     12    gyro[3]      float32, rad/s
+MAGIC = b"SG"
+VERSION = 1
+FRAME_STRUCT = struct.Struct("<2sBBHII4h3f3f")
+FRAME_SIZE = FRAME_STRUCT.size
+FRAME_DTYPE = np.dtype([
+    ("magic", "S2"),
+    ("version", "u1"),
+    ("flags", "u1"),
+    ("device_id", "<u2"),
+    ("seq", "<u4"),
+    ("timestamp_ms", "<u4"),
+    ("flex", "<i2", (4,)),
+    ("acc", "<f4", (3,)),
+    ("gyro", "<f4", (3,)),
+])
+assert FRAME_DTYPE.itemsize == FRAME_SIZE
+
+# One or more frames from the same glove, as arrays (one row per frame).
+# seq is None for text frames; for_ml marks the 4 flex + 3 accel layout
+# the gesture model was trained on.
+FrameBlock = namedtuple("FrameBlock", ["device_id", "seq", "flex", "acc", "gyro", "for_ml"])
+
+def frame_features(block):
+    """[n, 7] float64 model input (f1..f4, ax, ay, az) for a FrameBlock."""
+    return np.hstack((block.flex, block.acc)).astype(np.float64)
+
+def dashboard_fields(block, frames_lost=None):
+    """Data store fields for the newest frame in a block."""
+    flex, acc, gyro = block.flex[-1], block.acc[-1], block.gyro[-1]
+    fields = {
+        "flex": flex.tolist(),
+        "ax": float(acc[0]), "ay": float(acc[1]), "az": float(acc[2]),
+        "gx": float(gyro[0]), "gy": float(gyro[1]), "gz": float(gyro[2]),
+    }
+    if block.seq is not None:
+        fields["seq"] = int(block.seq[-1])
+    if frames_lost is not None:
+        fields["frames_lost"] = frames_lost
+    return fields
+
+def encode_binary_frame(device_id, seq, timestamp_ms, flex, acc, gyro=(0.0, 0.0, 0.0)):
+    """Pack one v1 frame (used by test senders; mirrors the firmware)."""
+    return FRAME_STRUCT.pack(MAGIC, VERSION, 0, device_id, seq & 0xFFFFFFFF,
+                             timestamp_ms & 0xFFFFFFFF, *[int(v) for v in flex], *acc, *gyro)
+
+def is_binary(data):
+    return data[:2] == MAGIC
+
+def decode_binary(data):
+    """
+    Decode v1 frames with numpy.frombuffer. Returns a FrameBlock, or None if
+    the payload is not a whole number of valid frames.
+    """
+    if len(data) < FRAME_SIZE or len(data) % FRAME_SIZE:
+        return None
+    frames = np.frombuffer(data, dtype=FRAME_DTYPE)
+    if np.any(frames["magic"] != MAGIC) or np.any(frames["version"] != VERSION):
+        return None
+    return FrameBlock(
+        device_id=f"glove-{int(frames['device_id'][0])}",
+        seq=frames["seq"].astype(np.int64),
+        flex=frames["flex"].astype(np.float64),
+        acc=frames["acc"].astype(np.float64),
+        gyro=frames["gyro"].astype(np.float64),
+        for_ml=True,
+    )
+
+def _block(device_id, flex, acc, gyro, for_ml):
+    return FrameBlock(device_id, None, np.array([flex], dtype=np.float64),
+                      np.array([acc], dtype=np.float64), np.array([gyro], dtype=np.float64), for_ml)
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+def decode_text(line, default_device=None):
+    """
+    Decode one text line. Supported layouts:
+      f1,f2,f3,f4,ax,ay,az[,device_id]    UDP / Serial (model input)
+      f1,f2,f3,ax,ay,az,gx,gy,gz          TCP, 3 flex (mapped to 5 slots)
+      f1,...,f5,ax,ay,az,gx,gy,gz         TCP, 5 flex
+      FLEX:f1,.. | ACC:ax,.. | GYR:gx,..  Legacy UDP
+    Returns a FrameBlock or None; raises ValueError/IndexError on corrupt input.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    # Old Format: "FLEX:f1,f2,f3,f4 | ACC:ax,ay,az | GYR:gx,gy,gz"
+    if "FLEX:" in line and "| ACC:" in line:
+        parts = line.split('|')
+        flex = [float(x) for x in parts[0].split(':')[1].split(',')]
+        acc = [float(x) for x in parts[1].split(':')[1].split(',')]
+        gyro = [float(x) for x in parts[2].split(':')[1].split(',')]
+        return _block(default_device, flex, acc, gyro, False) # Dashboard only
+
+    if "," not in line or "|" in line:
+        return None
+    parts = line.split(',')
+
+    if len(parts) == 8 and not _is_number(parts[7]):
+        device_id = parts[7].strip() or default_device
+        vals = [float(x) for x in parts[:7]]
+        return _block(device_id, vals[0:4], vals[4:7], [0, 0, 0], True)
+
+    if len(parts) == 9:
+        # Map the TCP firmware's 3 sensors to the 5-slot array as [Flex1, Flex2, Flex3, 0, 0]
+        vals = [float(x) for x in parts]
+        return _block(default_device, [vals[0], vals[1], vals[2], 0, 0], vals[3:6], vals[6:9], False)
+
+    if len(parts) == 11:
+        vals = [float(x) for x in parts]
+        return _block(default_device, vals[0:5], vals[5:8], vals[8:11], False)
+
+    if len(parts) >= 7:
+        vals = [float(x) for x in parts[:7]]
+        return _block(default_device, vals[0:4], vals[4:7], [0, 0, 0], True)
+
+    return None
+
+def decode_text_lines(text, default_device=None):
+    """
+    Decode newline-delimited text frames. When every line has the same
+    7-value (or 7 + device id) layout, all lines are parsed in one NumPy
+    conversion; otherwise lines are decoded one by one.
+    Returns a list of FrameBlocks.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if len(lines) == 1:
+        block = decode_text(lines[0], default_device)
+        return [block] if block is not None else []
+    if not lines:
+        return []
+
+    # Fast path: uniform "f1,...,az[,device_id]" rows. Every line must have
+    # the same field count: a short line next to a long one could otherwise
+    # add up to a whole number of rows and be reshaped into shifted values.
+    commas = {line.count(",") for line in lines}
+    width = commas.pop() + 1 if len(commas) == 1 else 0
+    if width in (7, 8) and "|" not in text:
+        fields = ",".join(lines).split(",")
+        table = np.array(fields, dtype=object).reshape(len(lines), width)
+        device_ids = set(table[:, 7].tolist()) if width == 8 else {default_device}
+        # A numeric 8th column is not a device id (decode_text ignores it):
+        # only one shared, non-numeric id keeps the fast path
+        if len(device_ids) == 1 and not (width == 8 and _is_number(next(iter(device_ids)))):
+            try:
+                values = table[:, :7].astype(np.float64)
+                device_id = (device_ids.pop() or "").strip() or default_device
+                return [FrameBlock(device_id, None, values[:, 0:4], values[:, 4:7],
+                                   np.zeros((len(lines), 3)), True)]
+            except ValueError:
+                pass # Corrupt value somewhere: decode line by line
+
+    blocks = []
+    for line in lines:
+        try:
+            block = decode_text(line, default_device)
+        except (ValueError, IndexError):
+            continue # Drop only the corrupt line
+        if block is not None:
+            blocks.append(block)
+    return blocks
+
+def decode_packet(data, default_device=None):
+    """
+    Decode one datagram: one or more binary frames (fixed size, so packed
+    back to back) or one or more newline-delimited text lines.
+    Returns a list of FrameBlocks.
+    """
+    if is_binary(data):
+        block = decode_binary(data)
+        return [block] if block is not None else []
+    return decode_text_lines(data.decode('utf-8', errors='ignore'), default_device)
+
+class FrameStreamDecoder:
+    """
+    Splits a byte stream (TCP / Serial) into FrameBlocks. Binary frames are
+    found by their magic and fixed size; anything else is newline-delimited text.
+    """
+
+    def __init__(self, default_device=None, max_buffer=64 * 1024):
+        self.default_device = default_device
+        self.max_buffer = max_buffer
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        self.buffer += data
+        blocks = []
+        buf = self.buffer
+        pos = 0
+        while pos < len(buf):
+            if buf[pos:pos + 2] == MAGIC:
+                if len(buf) - pos < FRAME_SIZE:
+                    break # Wait for the rest of the frame
+                block = decode_binary(bytes(buf[pos:pos + FRAME_SIZE]))
+                if block is not None:
+                    blocks.append(block)
+                    pos += FRAME_SIZE
+                    continue
+            end = buf.find(b"\n", pos)
+            if end == -1:
+                break
+            try:
+                block = decode_text(buf[pos:end].decode('utf-8', errors='ignore'), self.default_device)
+                if block is not None:
+                    blocks.append(block)
+            except (ValueError, IndexError):
+                pass # Ignore corrupt lines (common during startup)
+            pos = end + 1
+
+        del buf[:pos]
+        if len(buf) > self.max_buffer:
+            buf.clear() # Garbage with no delimiter; resync on new data
+        return blocks
+
+class SequenceTracker:
+    """Counts frames lost per glove from gaps in binary sequence numbers."""
+
+    def __init__(self):
+        self.last_seq = {}
+        self.lost = {}
+
+    def observe(self, device_id, seq):
+        """Record a block's sequence numbers; returns total frames lost for the glove."""
+        if seq is None or len(seq) == 0:
+            return self.lost.get(device_id, 0)
+        lost = self.lost.get(device_id, 0)
+        prev = self.last_seq.get(device_id)
+        seqs = seq if prev is None else np.concatenate(([prev], seq))
+        gaps = (np.diff(seqs) - 1) & 0xFFFFFFFF # uint32 wrap-around
+        # Huge gaps are a reboot / reordering rather than loss
+        lost += int(gaps[gaps < 0x10000].sum())
+        self.last_seq[device_id] = int(seq[-1])
+        self.lost[device_id] = lost
+        return lost
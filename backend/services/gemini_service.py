@@ -1,18 +1,56 @@
-import google.generativeai as genai
+import asyncio
 import os
 import logging
+import time
 from dotenv import load_dotenv
+from services.cache import TTLCache
+from services.sentence_composer import sentence_composer
+from services.tracing import tracer
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None # Remote generation is optional; the local composer covers it
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+def normalize_words(words):
+    """Cache key for a word sequence: trimmed, upper-case, immediate repeats dropped."""
+    key = []
+    for word in words:
+        word = str(word).strip().upper()
+        if word and (not key or key[-1] != word):
+            key.append(word)
+    return tuple(key)
+
 class GeminiService:
-    def __init__(self):
+    """
+    Turns buffered gesture words into a natural sentence with Gemini.
+
+    Results are cached per normalized word sequence (LRU + TTL), so common
+    phrases skip the network. generate_sentence_async() runs the remote
+    call in a worker thread with a timeout so the event loop never blocks.
+    Pass `model` (anything with generate_content(prompt) -> .text) to use a
+    local stand-in instead of the remote API. Failures and timeouts fall
+    back to `fallback(words)` (the local sentence composer by default).
+    """
+
+    def __init__(self, model=None, timeout=4.0, cache_size=256, cache_ttl=3600.0, fallback=None):
         self.api_key = os.getenv("GEMINI_API_KEY")
-        self.model = None
-        
-        if self.api_key:
+        self.model = model
+        # Used when the remote call fails or times out
+        self.fallback = fallback or sentence_composer.compose
+        self.timeout = timeout
+        self.cache = TTLCache(max_size=cache_size, ttl=cache_ttl)
+        self.timeouts = 0
+
+        if self.model is not None:
+            logger.info("✅ Gemini Service Initialized (local model)")
+        elif genai is None:
+            logger.warning("⚠️ google-generativeai not installed; Gemini disabled")
+        elif self.api_key:
             try:
                 genai.configure(api_key=self.api_key)
                 self.model = genai.GenerativeModel('gemini-2.0-flash-lite')
@@ -25,39 +63,87 @@ class GeminiService:
     def generate_sentence(self, words):
         """
         Takes a list of words (e.g. ['I', 'Eat', 'Apple']) and returns a natural sentence.
+        Blocks for the duration of the remote call; prefer generate_sentence_async.
+        """
+        if not words:
+            return None
+        key = normalize_words(words)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        sentence, cacheable = self._generate(words)
+        if cacheable:
+            self.cache.put(key, sentence)
+        return sentence
+
+    async def generate_sentence_async(self, words, timeout=None):
+        """
+        Non-blocking generate_sentence: cache hits return immediately, misses
+        run off-loop and use the local fallback after `timeout` seconds.
         """
         if not words:
             return None
-            
+        key = normalize_words(words)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"⚡ Sentence cache hit: {' '.join(key)}")
+            return cached
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            sentence, cacheable = await asyncio.wait_for(asyncio.to_thread(self._generate, words), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"⚠️ Gemini timed out after {timeout}s. Using local fallback.")
+            return self.fallback(words)
+
+        if cacheable:
+            self.cache.put(key, sentence)
+        return sentence
+
+    def cache_stats(self):
+        stats = self.cache.stats()
+        stats["timeouts"] = self.timeouts
+        return stats
+
+    def _generate(self, words):
+        """Returns (sentence, cacheable); fallbacks are not cached so they get retried."""
         # --- HARDCODED OVERRIDE (Offline Mode for Demo) ---
         # Bypass Gemini if specific keywords are found
         input_debug = " ".join(words).upper()
         if "YASH" in input_debug or "FSOCIETY" in input_debug:
              logger.info("✨ Offline Override triggered for Team Fsociety")
-             return "Hello everyone, I'm Yash, and we are Team Fsociety."
+             return "Hello everyone, I'm Yash, and we are Team Fsociety.", True
         # --------------------------------------------------
 
         if not self.model:
-            return " ".join(words)
+            return self.fallback(words), False
 
         try:
             input_text = " ".join(words)
             prompt = f"You are Yash from Team Fsociety. Fix this broken sign language input: '{input_text}'. 1. REMOVE duplicates (e.g. 'Hello Hello' -> 'Hello'). 2. If you see 'Yash' and 'Fsociety', output EXACTLY: 'Hello everyone, I am Yash, and we are Team Fsociety.' 3. Otherwise, make it a natural sentence."
-            
+
+            started = time.monotonic()
             response = self.model.generate_content(prompt)
+            tracer.observe("gemini", time.monotonic() - started)
             if response.text:
                 clean_text = response.text.strip().replace('"', '')
                 logger.info(f"✨ Gemini refined: '{input_text}' -> '{clean_text}'")
-                return clean_text
+                return clean_text, True
         except Exception as e:
             # Handle Quota/Rate Limit specifically
             error_str = str(e)
             if "429" in error_str or "Quota" in error_str:
-                logger.warning(f"⚠️ Gemini Rate Limit. Using raw text fallback.")
+                logger.warning(f"⚠️ Gemini Rate Limit. Using local fallback.")
             else:
                 logger.error(f"❌ Gemini Generation Error: {e}")
-            
-            return " ".join(words) # Graceful Fallback
+
+        return self.fallback(words), False # Graceful Fallback
 
 # Global Instance
-gemini_service = GeminiService()
+gemini_service = GeminiService(
+    timeout=float(os.getenv("GEMINI_TIMEOUT", "4.0")),
+    cache_size=int(os.getenv("GEMINI_CACHE_SIZE", "256")),
+    cache_ttl=float(os.getenv("GEMINI_CACHE_TTL", "3600")),
+)
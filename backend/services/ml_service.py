@@ -1,25 +1,87 @@
 import joblib
-import pandas as pd
+import numpy as np
 import logging
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from services.flat_forest import FlatForest
+from services.tiny_models import CascadeModel, load_flat_model
+from services.stability import ConfidenceTracker, StabilityTracker
+from services.window_features import WindowFeatureExtractor
+from services.rolling_stats import RollingStats
+from services.session_service import DEFAULT_DEVICE
+from services.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+class DeviceState:
+    """Frame buffer and debounce state for one glove."""
+
+    def __init__(self, n_features, batch_size, tracker, extractor=None, motion=None):
+        self.lock = threading.Lock()
+        self.frame_buffer = np.empty((batch_size, n_features), dtype=np.float64)
+        self.buffer_len = 0
+        self.buffer_started = 0.0
+        self.tracker = tracker # StabilityTracker (labels) or ConfidenceTracker (probabilities)
+        self.extractor = extractor # Windowed features (temporal model only)
+        self.motion = motion # RollingStats over raw frames (optional)
+
 class MLService:
-    def __init__(self, model_path="models/signspeak.pkl"):
+    def __init__(self, model_path="models/signspeak.pkl", flat_model_path="models/signspeak.npz",
+                 batch_size=1, max_batch_delay=0.05, max_devices=64,
+                 feature_mode="frame", window_model_path="models/signspeak_window.pkl",
+                 motion_window=0, small_model_path="models/signspeak_small.npz", cascade_threshold=0.0,
+                 stability_mode="count", confidence_threshold=8.0):
         self.model = None
         self.model_path = model_path
+        self.flat_model_path = flat_model_path # Exported by export_model.py, preferred when present
         self.columns = ['f1', 'f2', 'f3', 'f4', 'ax', 'ay', 'az']
-        
+
+        # "frame": classify each frame on its own
+        # "window": temporal model over rolling window features (yash/train_window.py)
+        self.feature_mode = feature_mode
+        self.window_model_path = window_model_path
+        self.windows = None
+
+        # Cascade (frame mode): the distilled small model (distill_model.py)
+        # runs on every frame, the main model only on frames where the small
+        # model's confidence is below cascade_threshold (0 disables)
+        self.small_model_path = small_model_path
+        self.cascade_threshold = cascade_threshold
+
+        # Rolling per-glove motion statistics (0 disables)
+        self.motion_window = motion_window
+
         # Stability tracking
-        self.last_prediction = ""
-        self.stability_counter = 0
+        # "count": the same label `required_stability` more frames in a row
+        # "confidence": accumulated class probabilities cross confidence_threshold
+        # (log-odds; ConfidenceTracker), so confident gestures fire earlier and
+        # a label that keeps winning fires no later than with the counter
+        # (compare both with bench_stability.py)
+        self.stability_mode = stability_mode
         self.required_stability = 5
-        self.last_stable_word = ""
-        
+        self.confidence_threshold = confidence_threshold
+
+        # Micro-batching: frames are collected in a preallocated buffer and
+        # predicted in one call once it fills, or once the oldest frame is
+        # max_batch_delay old (checked on each frame and by a flusher thread,
+        # so a glove that pauses still gets its last frames predicted).
+        # batch_size=1 predicts every frame immediately.
+        self.batch_size = max(1, int(batch_size))
+        self.max_batch_delay = max_batch_delay
+        self._flusher = None
+        self._stop_flusher = threading.Event()
+
+        # Per-glove state (frame buffer + stability tracker), least recently
+        # used first so the oldest glove is dropped beyond max_devices
+        self.max_devices = max_devices
+        self.devices = OrderedDict()
+        self._devices_lock = threading.Lock()
+
         # Callbacks
-        self.on_prediction_callback = None # Function(word)
+        self.on_prediction_callback = None # Function(word, device_id)
 
         self._load_model()
 
@@ -28,19 +90,92 @@ class MLService:
             # Handle relative paths safely
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             full_path = os.path.join(base_dir, self.model_path)
-            
-            if os.path.exists(full_path):
-                self.model = joblib.load(full_path)
+            flat_path = os.path.join(base_dir, self.flat_model_path) if self.flat_model_path else None
+
+            if self.feature_mode == "window":
+                self._load_window_model(os.path.join(base_dir, self.window_model_path))
+            elif flat_path and os.path.exists(flat_path):
+                self.model = load_flat_model(flat_path)
+                logger.info(f"✅ ML Model loaded from {flat_path} ({type(self.model).__name__})")
+                if os.path.exists(full_path) and os.path.getmtime(full_path) > os.path.getmtime(flat_path):
+                    logger.warning(f"⚠️ {full_path} is newer than the flat model. Re-run export_model.py")
+            elif os.path.exists(full_path):
+                self.model = self._prepare_model(joblib.load(full_path))
                 logger.info(f"✅ ML Model loaded from {full_path}")
             else:
                 logger.error(f"❌ ML Model NOT FOUND at {full_path}")
+
+            if self.model is not None and self.feature_mode == "frame" and self.cascade_threshold > 0:
+                self._load_cascade(os.path.join(base_dir, self.small_model_path))
         except Exception as e:
             logger.error(f"❌ Error loading ML model: {e}")
 
+    def _load_window_model(self, path):
+        if not os.path.exists(path):
+            logger.error(f"❌ Window ML Model NOT FOUND at {path}")
+            return
+        bundle = joblib.load(path)
+        if list(bundle["columns"]) != self.columns:
+            raise ValueError(f"Window model columns {bundle['columns']} do not match {self.columns}")
+        self.windows = tuple(bundle["windows"])
+        self.model = FlatForest.from_sklearn(bundle["model"])
+        logger.info(f"✅ Window ML Model loaded from {path} (windows {self.windows})")
+
+    def _load_cascade(self, path):
+        if not os.path.exists(path):
+            logger.error(f"❌ Small ML Model NOT FOUND at {path}; running the main model on every frame")
+            return
+        small = load_flat_model(path)
+        self.model = CascadeModel(small, self.model, self.cascade_threshold)
+        logger.info(f"✅ Cascade: {type(small).__name__} from {path}, main model below {self.cascade_threshold:.2f} confidence")
+
+    def cascade_stats(self):
+        """Escalation counters of the small/big cascade, or None when it is off."""
+        return self.model.stats() if isinstance(self.model, CascadeModel) else None
+
+    def _prepare_model(self, model):
+        """
+        Validate the model's feature names once so frames can be predicted as
+        plain NumPy arrays (no per-call DataFrame construction or name check).
+        """
+        names = getattr(model, "feature_names_in_", None)
+        if names is not None and list(names) != self.columns:
+            raise ValueError(f"Model features {list(names)} do not match {self.columns}")
+        if names is not None:
+            # Columns are verified above; drop the names so sklearn does not
+            # warn about ndarray input on every predict call.
+            del model.feature_names_in_
+        return model
+
     def register_callback(self, callback):
         self.on_prediction_callback = callback
 
-    def process_data(self, flex_vals, acc_vals):
+    def _device(self, device_id):
+        with self._devices_lock:
+            state = self.devices.get(device_id)
+            if state is None:
+                extractor = WindowFeatureExtractor(self.windows, self.columns) if self.windows else None
+                motion = RollingStats(self.motion_window, self.columns) if self.motion_window else None
+                state = DeviceState(len(self.columns), self.batch_size, self._new_tracker(), extractor, motion)
+                self.devices[device_id] = state
+                while len(self.devices) > self.max_devices:
+                    self.devices.popitem(last=False)
+            else:
+                self.devices.move_to_end(device_id)
+            return state
+
+    def _new_tracker(self):
+        if self.stability_mode == "confidence":
+            return ConfidenceTracker(self.model.classes_, threshold=self.confidence_threshold,
+                                     max_frames=self.required_stability + 1)
+        return StabilityTracker(self.required_stability)
+
+    def drop_device(self, device_id):
+        """Forget a glove's buffered frames and stability state."""
+        with self._devices_lock:
+            self.devices.pop(device_id, None)
+
+    def process_data(self, flex_vals, acc_vals, device_id=DEFAULT_DEVICE):
         """
         Process sensor data and return prediction if stable
         """
@@ -50,40 +185,135 @@ class MLService:
         try:
             # Combine into feature vector
             features = flex_vals + acc_vals # [f1, f2, f3, f4, ax, ay, az]
-            
-            # DataFrame for sklearn
-            features_df = pd.DataFrame([features], columns=self.columns)
-            
-            # Predict
-            prediction = self.model.predict(features_df)[0]
-            
-            # Debug: Print raw prediction to see if model is working
-            # print(f"Raw ML: {prediction}") 
-            
-            # Stability Logic
-            if prediction == self.last_prediction:
-                self.stability_counter += 1
-            else:
-                self.last_prediction = prediction
-                self.stability_counter = 0
-
-            # Trigger Action on Stability
-            if self.stability_counter >= self.required_stability:
-                # Only trigger if it's a NEW stable word (debouncing repetitions)
-                if prediction != self.last_stable_word:
-                    self.last_stable_word = prediction
-                    self.stability_counter = 0 # Reset to require re-stabilization or keep it high? 
-                    # Original logic reset it, but technically if I hold 'A', it stays 'A'
-                    # If I want to speak 'A' again, I need to break gesture.
-                    # Implementing "Edge Trigger":
-                    
-                    if self.on_prediction_callback:
-                        self.on_prediction_callback(prediction)
-                    
-                    logger.info(f"🗣️ DETECTED: {prediction}")
+            state = self._device(device_id)
+
+            if self._flusher is None and self.batch_size > 1:
+                self._start_flusher()
 
+            with state.lock:
+                if state.buffer_len == 0:
+                    state.buffer_started = time.monotonic()
+                state.frame_buffer[state.buffer_len] = features
+                state.buffer_len += 1
+
+                if (state.buffer_len >= self.batch_size
+                        or time.monotonic() - state.buffer_started >= self.max_batch_delay):
+                    self._flush_locked(state, device_id)
+
+        except Exception as e:
+            logger.error(f"ML Prediction Error: {e}")
+
+    def process_batch(self, features, device_id=DEFAULT_DEVICE):
+        """
+        Predict a block of frames (shape [n, 7]) in one call and feed each
+        result through the stability logic in arrival order.
+        """
+        if not self.model:
+            return
+
+        try:
+            state = self._device(device_id)
+            with state.lock:
+                # Keep ordering: anything already buffered goes first
+                self._flush_locked(state, device_id)
+                features = np.asarray(features, dtype=np.float64)
+                if len(features):
+                    self._apply_predictions(state, device_id, self._predict(state, features))
         except Exception as e:
             logger.error(f"ML Prediction Error: {e}")
 
+    def flush(self, device_id=None):
+        """Predict any frames still waiting in the batch buffer(s)."""
+        if not self.model:
+            return
+        with self._devices_lock:
+            targets = list(self.devices.items()) if device_id is None else [(device_id, self.devices.get(device_id))]
+        for dev_id, state in targets:
+            if state:
+                with state.lock:
+                    self._flush_locked(state, dev_id)
+
+    def flush_stale(self):
+        """Predict buffers whose oldest frame has waited max_batch_delay."""
+        with self._devices_lock:
+            targets = list(self.devices.items())
+        now = time.monotonic()
+        for dev_id, state in targets:
+            with state.lock:
+                if state.buffer_len and now - state.buffer_started >= self.max_batch_delay:
+                    self._flush_locked(state, dev_id)
+
+    def _start_flusher(self):
+        with self._devices_lock:
+            if self._flusher is not None:
+                return
+            self._stop_flusher.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="ml-batch-flush")
+            self._flusher.start()
+
+    def _flush_loop(self):
+        interval = max(self.max_batch_delay / 2, 0.005)
+        while not self._stop_flusher.wait(interval):
+            try:
+                self.flush_stale()
+            except Exception as e:
+                logger.error(f"ML Prediction Error: {e}")
+
+    def stop(self):
+        """Stop the flusher thread after predicting whatever is still buffered."""
+        self._stop_flusher.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _flush_locked(self, state, device_id):
+        if state.buffer_len == 0:
+            return
+        batch = state.frame_buffer[:state.buffer_len]
+        state.buffer_len = 0
+        self._apply_predictions(state, device_id, self._predict(state, batch))
+
+    def motion_stats(self, device_id):
+        """Rolling statistics of a glove's recent frames, or None."""
+        with self._devices_lock:
+            state = self.devices.get(device_id)
+        if state is None or state.motion is None:
+            return None
+        with state.lock:
+            return state.motion.snapshot()
+
+    def _predict(self, state, frames):
+        if state.motion is not None:
+            for frame in frames:
+                state.motion.push(frame)
+        if state.extractor is not None:
+            # Rolling features advance one frame at a time, in arrival order
+            frames = state.extractor.transform(frames)
+        started = time.monotonic()
+        if self.stability_mode == "confidence":
+            predictions = self.model.predict_proba(frames) # One probability row per frame
+        else:
+            predictions = self.model.predict(frames)
+        tracer.observe("ml_predict", time.monotonic() - started)
+        return predictions
+
+    def _apply_predictions(self, state, device_id, predictions):
+        for prediction in predictions:
+            # Edge trigger: fires once per newly stable word
+            word = state.tracker.update(prediction)
+            if word is not None:
+                if self.on_prediction_callback:
+                    self.on_prediction_callback(word, device_id)
+
+                logger.info(f"🗣️ DETECTED: {word} ({device_id})")
+
 # Global Instance
-ml_service = MLService()
+ml_service = MLService(
+    batch_size=int(os.getenv("ML_BATCH_SIZE", "1")),
+    feature_mode=os.getenv("ML_FEATURES", "frame"),
+    motion_window=int(os.getenv("ML_MOTION_WINDOW", "0")),
+    cascade_threshold=float(os.getenv("ML_CASCADE_THRESHOLD", "0")),
+    stability_mode=os.getenv("ML_STABILITY", "count"),
+    confidence_threshold=float(os.getenv("ML_CONFIDENCE_THRESHOLD", "8.0")),
+)
@@ -0,0 +1,319 @@
+import asyncio
+import heapq
+import io
+import itertools
+import logging
+import re
+import threading
+import time
+from services.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Queue policies for submit()
+INTERRUPT = "interrupt" # Stop what is playing, drop the queue, play this now
+ENQUEUE = "enqueue" # Play after what is queued (by priority, then arrival)
+DROP_STALE = "drop_stale" # Drop queued (not playing) items, then queue this
+
+PHRASE_BREAK = re.compile(r"(?<=[,.;:!?])\s+")
+
+def split_phrases(text, min_words=6):
+    """Phrases synthesized / played one after another (short text stays whole)."""
+    if len(text.split()) < min_words:
+        return [text]
+    return [p for p in PHRASE_BREAK.split(text.strip()) if p]
+
+class PygameSink:
+    """
+    Plays MP3 on the local audio device; the mixer is initialized once.
+    SDL_mixer needs a whole MP3 to decode, so streamed chunks are collected
+    and each phrase starts as soon as its stream ends.
+    """
+
+    def __init__(self):
+        import pygame
+        self.pygame = pygame
+        pygame.mixer.init()
+        self.buffer = bytearray()
+
+    def begin(self):
+        self.buffer = bytearray()
+
+    def feed(self, chunk):
+        """Returns True once audio is actually playing."""
+        self.buffer += chunk
+        return False
+
+    def end(self):
+        if self.buffer:
+            self.pygame.mixer.music.load(io.BytesIO(bytes(self.buffer)), "mp3")
+            self.pygame.mixer.music.play()
+        return bool(self.buffer)
+
+    def is_busy(self):
+        return self.pygame.mixer.music.get_busy()
+
+    def stop(self):
+        self.pygame.mixer.music.stop()
+
+class NullSink:
+    """
+    Headless stand-in for the audio device. Plays chunks as they arrive
+    (like a streaming decoder would) for as long as the MP3 would last at
+    ~48 kbit/s (Edge TTS' default), scaled by `speed`, and records what
+    was played.
+    """
+
+    def __init__(self, bytes_per_second=6000, speed=1.0):
+        self.bytes_per_second = bytes_per_second
+        self.speed = speed
+        self.played = []
+        self._until = 0.0
+
+    def begin(self):
+        self.played.append(b"")
+
+    def feed(self, chunk):
+        self.played[-1] += chunk
+        duration = len(chunk) / self.bytes_per_second / self.speed if self.speed else 0.0
+        self._until = max(self._until, time.monotonic()) + duration
+        return True
+
+    def end(self):
+        return bool(self.played and self.played[-1])
+
+    def is_busy(self):
+        return time.monotonic() < self._until
+
+    def stop(self):
+        self._until = 0.0
+
+class PlaybackItem:
+    """One queued utterance; returned by submit() as a handle."""
+
+    def __init__(self, worker, seq, text, audio, priority, voice, on_start):
+        self.worker = worker
+        self.seq = seq
+        self.text = text
+        self.audio = audio # Pre-synthesized MP3, or None to synthesize
+        self.priority = priority
+        self.voice = voice
+        self.on_start = on_start
+        self.created_at = time.monotonic()
+        self.cancelled = False
+        self.started = threading.Event()
+        self.done = threading.Event()
+
+    def cancel(self):
+        self.cancelled = True
+        if self.worker.current is self:
+            self.worker.sink.stop() # Cut the audio now, not on the worker's next poll
+
+class PlaybackWorker:
+    """
+    Single long-lived playback thread fed by a bounded priority queue.
+
+    Text is split into phrases that are synthesized concurrently and played
+    in order; each phrase's MP3 chunks are fed to the sink as they stream
+    in, so playback starts with the first audio rather than the whole
+    sentence. Items waiting longer than `max_age` seconds are dropped.
+
+    stream: Function(text, voice) -> async iterator of MP3 chunks
+    fallback: Function(text), blocking offline speech if synthesis fails
+    """
+
+    def __init__(self, stream, sink, fallback=None, max_queue=8, max_age=10.0, voice=None):
+        self.stream = stream
+        self.sink = sink
+        self.fallback = fallback
+        self.max_queue = max_queue
+        self.max_age = max_age
+        self.voice = voice
+        self.queue = [] # heap of (priority, seq, item)
+        self.lock = threading.Lock()
+        self.seq = itertools.count()
+        self.current = None
+        self.loop = None
+        self._wakeup = None
+        self._ready = threading.Event()
+        self.thread = None
+
+        # Metrics
+        self.max_depth = 0
+        self.played = 0
+        self.dropped = 0
+        self.interrupted = 0
+        self.rejected = 0 # Refused by submit(max_pending=...)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=lambda: asyncio.run(self._run()), daemon=True,
+                                           name="playback-worker")
+            self.thread.start()
+            self._ready.wait(timeout=5)
+        return self
+
+    def submit(self, text, audio=None, priority=1, policy=ENQUEUE, voice=None, on_start=None, max_pending=None):
+        """
+        Queue text (or pre-synthesized audio) for playback; lower priority plays first.
+        With `max_pending`, an enqueue is refused (returns None) when that many
+        items are already waiting; checked under the queue lock, so
+        concurrent callers cannot overshoot it.
+        """
+        self.start()
+        item = PlaybackItem(self, next(self.seq), text, audio, priority, voice or self.voice, on_start)
+        with self.lock:
+            if policy == ENQUEUE and max_pending is not None and len(self.queue) >= max_pending:
+                self.rejected += 1
+                return None
+            if policy in (INTERRUPT, DROP_STALE):
+                self.dropped += len(self.queue)
+                for _, _, queued in self.queue:
+                    queued.cancel()
+                    queued.done.set()
+                self.queue.clear()
+            if policy == INTERRUPT and self.current is not None:
+                self.current.cancel()
+                self.interrupted += 1
+
+            heapq.heappush(self.queue, (priority, item.seq, item))
+            if len(self.queue) > self.max_queue:
+                # Full: drop the least important (lowest priority, newest) entry
+                worst = max(self.queue)
+                self.queue.remove(worst)
+                heapq.heapify(self.queue)
+                worst[2].cancel()
+                worst[2].done.set()
+                self.dropped += 1
+            self.max_depth = max(self.max_depth, len(self.queue))
+        self.loop.call_soon_threadsafe(self._wakeup.set)
+        return item
+
+    def stop(self):
+        """Stop playback and drop everything queued."""
+        with self.lock:
+            self.dropped += len(self.queue)
+            for _, _, queued in self.queue:
+                queued.cancel()
+                queued.done.set()
+            self.queue.clear()
+            if self.current is not None:
+                self.current.cancel()
+                self.interrupted += 1
+
+    def is_playing(self):
+        return self.current is not None
+
+    def stats(self):
+        with self.lock:
+            depth = len(self.queue)
+        return {
+            "queue_depth": depth,
+            "max_queue_depth": self.max_depth,
+            "playing": self.current.text if self.current is not None else None,
+            "played": self.played,
+            "dropped": self.dropped,
+            "interrupted": self.interrupted,
+            "rejected": self.rejected,
+            "time_to_first_audio": tracer.stage_summary("playback_first_audio"),
+        }
+
+    # ---------------- Worker thread ----------------
+
+    async def _run(self):
+        self.loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._ready.set()
+        while True:
+            item = self._pop()
+            if item is None:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            try:
+                await self._play(item)
+            except Exception as e:
+                logger.error(f"Playback Error: {e}")
+            finally:
+                with self.lock:
+                    self.current = None
+                item.done.set()
+
+    def _pop(self):
+        with self.lock:
+            while self.queue:
+                _, _, item = heapq.heappop(self.queue)
+                if item.cancelled:
+                    continue
+                if time.monotonic() - item.created_at > self.max_age:
+                    self.dropped += 1
+                    item.done.set()
+                    continue
+                self.current = item
+                return item
+        return None
+
+    async def _prefetch(self, phrase, voice, chunks):
+        # Producer: synthesis stream -> queue (None = end, Exception = failed)
+        try:
+            async for chunk in self.stream(phrase, voice):
+                chunks.put_nowait(chunk)
+            chunks.put_nowait(None)
+        except Exception as e:
+            chunks.put_nowait(e)
+
+    async def _play(self, item):
+        if item.audio:
+            phrases = [item.text]
+            queues = [asyncio.Queue()]
+            queues[0].put_nowait(item.audio)
+            queues[0].put_nowait(None)
+            tasks = []
+        else:
+            # All phrases synthesize concurrently; each plays as its chunks arrive
+            phrases = split_phrases(item.text)
+            queues = [asyncio.Queue() for _ in phrases]
+            tasks = [asyncio.ensure_future(self._prefetch(p, item.voice, q)) for p, q in zip(phrases, queues)]
+        try:
+            for i, chunks in enumerate(queues):
+                self.sink.begin()
+                while True:
+                    chunk = await chunks.get()
+                    if item.cancelled:
+                        self.sink.stop()
+                        return
+                    if isinstance(chunk, Exception):
+                        logger.warning(f"⚠️ Edge TTS Failed ({chunk}), switching to fallback...")
+                        self.sink.stop()
+                        if self.fallback is not None:
+                            self._started(item)
+                            await asyncio.to_thread(self.fallback, " ".join(phrases[i:]))
+                        return
+                    if chunk is None:
+                        break
+                    if self.sink.feed(chunk):
+                        self._started(item)
+                if self.sink.end():
+                    self._started(item)
+
+                while self.sink.is_busy() and not item.cancelled:
+                    await asyncio.sleep(0.005)
+                if item.cancelled:
+                    self.sink.stop()
+                    return
+            self.played += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _started(self, item):
+        if item.started.is_set():
+            return
+        item.started.set()
+        waited = time.monotonic() - item.created_at
+        tracer.observe("playback_first_audio", waited)
+        if item.on_start:
+            try:
+                item.on_start()
+            except Exception as e:
+                logger.error(f"Playback start callback error: {e}")
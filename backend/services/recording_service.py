@@ -0,0 +1,159 @@
+import logging
+import os
+import queue
+import threading
+import time
+import numpy as np
+from services.recording_store import RecordingStore
+
+logger = logging.getLogger(__name__)
+
+class RecordingService:
+    """
+    Records labeled training data from the live frame stream (UDP / Serial),
+    for any number of gloves at once, while the backend keeps running.
+
+    on_frames() is called on the ingest path: when not recording it returns
+    after one attribute check; when recording it stamps the frames with the
+    glove's current label and hands them to a bounded queue without
+    blocking (frames are counted as dropped if the writer falls behind).
+    A background thread drains the queue into one RecordingStore session
+    per glove; the store buffers frames and writes them in blocks. Every
+    recording gets its own queue and writer, and a new one cannot start
+    until the previous writer has finished.
+    """
+
+    def __init__(self, directory="recordings", max_queue=4096, block_rows=4096):
+        self.directory = directory
+        self.max_queue = max_queue
+        self.block_rows = block_rows
+        self.queue = queue.Queue(maxsize=max_queue) # Replaced by start(): one queue per recording
+        self.lock = threading.Lock()
+        self.active = False
+        self.devices = None # Only these gloves (None = all)
+        self.default_label = None
+        self.labels = {} # device_id -> label (overrides default_label)
+        self.store_name = None
+        self.started = None
+        self.frames = {} # device_id -> frames written (writer thread)
+        self.dropped = 0
+        self.thread = None
+        self._done = None
+
+    # ---------------- Control (API) ----------------
+
+    def start(self, store="default", label=None, devices=None):
+        """Start recording into <directory>/<store>; raises RuntimeError if already recording."""
+        store = os.path.basename(str(store).strip()) or "default"
+        with self.lock:
+            if self.active:
+                raise RuntimeError(f"Already recording into '{self.store_name}'")
+            if self.thread is not None and self.thread.is_alive():
+                raise RuntimeError(f"Still writing the previous recording into '{self.store_name}'")
+            self.store_name = store
+            self.devices = set(devices) if devices else None
+            self.default_label = label
+            self.labels = {}
+            self.frames = {}
+            self.dropped = 0
+            self.started = time.time()
+            self.queue = queue.Queue(maxsize=self.max_queue) # Late frames of the previous recording stay in its queue
+            self._done = threading.Event()
+            self.thread = threading.Thread(target=self._run,
+                                           args=(os.path.join(self.directory, store), self.queue, self._done),
+                                           daemon=True, name="recording-writer")
+            self.thread.start()
+            self.active = True
+        logger.info(f"⏺️ Recording into {self.directory}/{store} (label {label}, gloves {devices or 'all'})")
+        return self.status()
+
+    def stop(self, timeout=10.0):
+        """Stop recording; waits for queued frames to be written. Returns the final status."""
+        with self.lock:
+            was_active = self.active
+            self.active = False
+            done = self._done
+            frames = self.queue
+        if not was_active:
+            return self.status()
+        frames.put(None) # Writer closes its sessions after everything queued before this
+        if not done.wait(timeout):
+            logger.warning(f"⚠️ Recording writer still flushing after {timeout:g}s; "
+                           "a new recording can start once it has finished")
+            return self.status()
+        logger.info(f"⏹️ Recording stopped: {sum(self.frames.values())} frames, {self.dropped} dropped")
+        return self.status()
+
+    def set_label(self, label, device=None):
+        """Label for the frames that follow (one glove, or all gloves); None = unlabeled."""
+        with self.lock:
+            if device is None:
+                self.default_label = label
+                self.labels = {}
+            else:
+                self.labels[device] = label
+
+    def status(self):
+        with self.lock:
+            return {
+                "recording": self.active,
+                "store": self.store_name,
+                "directory": os.path.join(self.directory, self.store_name) if self.store_name else None,
+                "started": self.started,
+                "label": self.default_label,
+                "device_labels": dict(self.labels),
+                "devices": sorted(self.devices) if self.devices else None,
+                "frames": dict(self.frames),
+                "dropped": self.dropped,
+                "queue_depth": self.queue.qsize(),
+            }
+
+    # ---------------- Ingest path ----------------
+
+    def on_frames(self, device_id, frames):
+        """Raw [n, 7] frames (f1..f4, ax, ay, az) from any receiver thread."""
+        if not self.active:
+            return
+        if self.devices is not None and device_id not in self.devices:
+            return
+        label = self.labels.get(device_id, self.default_label)
+        try:
+            self.queue.put_nowait((device_id, frames, label, time.time()))
+        except queue.Full:
+            with self.lock:
+                self.dropped += len(frames)
+
+    # ---------------- Writer thread ----------------
+
+    def _run(self, path, frames_queue, done):
+        store = RecordingStore(path)
+        writers = {} # device_id -> RecordingWriter (one session per glove)
+        try:
+            while True:
+                item = frames_queue.get()
+                if item is None:
+                    break
+                device_id, frames, label, timestamp = item
+                writer = writers.get(device_id)
+                if writer is None:
+                    writer = writers[device_id] = store.writer(device=device_id, block_rows=self.block_rows)
+                try:
+                    frames = np.asarray(frames, dtype=np.float32)
+                    writer.append(frames, label, timestamp)
+                    with self.lock:
+                        self.frames[device_id] = self.frames.get(device_id, 0) + len(frames)
+                except (ValueError, OSError) as e:
+                    logger.error(f"❌ Recording write failed for {device_id}: {e}")
+        finally:
+            for writer in writers.values():
+                try:
+                    writer.close()
+                except OSError as e:
+                    logger.error(f"❌ Recording flush failed: {e}")
+            done.set()
+
+# Global Instance
+recording_service = RecordingService(
+    directory=os.getenv("RECORDINGS_DIR", "recordings"),
+    max_queue=int(os.getenv("RECORDING_QUEUE", "4096")),
+)
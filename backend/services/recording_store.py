@@ -0,0 +1,317 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FEATURES = ['f1', 'f2', 'f3', 'f4', 'ax', 'ay', 'az'] # Model input layout
+GYRO = ['gx', 'gy', 'gz']
+FORMAT_VERSION = 1
+
+# Frames of a store (or of some of its sessions). features is float32
+# [n, len(columns)]; labels are int16 codes into classes (-1 = unlabeled);
+# sessions are session ids per row; timestamps are Unix seconds.
+Dataset = namedtuple("Dataset", ["features", "labels", "classes", "sessions", "timestamps", "columns"])
+
+class RecordingStore:
+    """
+    Columnar store of labeled glove recordings, replacing append-only CSV.
+
+    A store is a directory:
+      meta.json          columns, label classes, sessions, segment list
+      seg-<n>.x.npy      float32 [rows, columns] sensor values
+      seg-<n>.y.npy      int16 [rows] label codes (index into classes)
+      seg-<n>.t.npy      float64 [rows] capture time
+      seg-<n>.s.npy      int32 [rows] session ids (compacted segments only)
+      seg-<n>.npz        all of the above, zlib-compressed (compact(compress=True))
+
+    Writers fill an in-memory block and write it out as one segment when
+    it is full (or on close), so capture never formats text per sample.
+    Segments are plain .npy files, so load() memory-maps them instead of
+    parsing; compact() merges them so a large store loads as one mmap, or
+    into one compressed archive for storage / transfer (loaded into memory).
+    """
+
+    def __init__(self, root, columns=None):
+        self.root = root
+        self.lock = threading.Lock()
+        self.meta = self._read_meta()
+        if self.meta is None:
+            self.meta = {"version": FORMAT_VERSION, "columns": list(columns or FEATURES), "classes": [],
+                         "sessions": [], "segments": [], "next_segment": 0}
+        elif columns is not None and list(columns) != self.meta["columns"]:
+            raise ValueError(f"Store {root} has columns {self.meta['columns']}, not {list(columns)}")
+
+    @property
+    def columns(self):
+        return list(self.meta["columns"])
+
+    @property
+    def classes(self):
+        with self.lock:
+            return list(self.meta["classes"])
+
+    @property
+    def sessions(self):
+        with self.lock:
+            return [dict(s) for s in self.meta["sessions"]]
+
+    def __len__(self):
+        with self.lock:
+            return sum(segment["rows"] for segment in self.meta["segments"])
+
+    # ---------------- Writing ----------------
+
+    def writer(self, device=None, block_rows=4096, **info):
+        """Start a new recording session; returns its RecordingWriter."""
+        with self.lock:
+            session = len(self.meta["sessions"])
+            self.meta["sessions"].append({"id": session, "device": device, "started": time.time(), "rows": 0, **info})
+            self._write_meta()
+        return RecordingWriter(self, session, block_rows)
+
+    def label_code(self, label):
+        """Categorical code of a label (new labels are added to the classes)."""
+        if label is None:
+            return -1
+        label = str(label).strip().upper()
+        with self.lock:
+            classes = self.meta["classes"]
+            if label not in classes:
+                classes.append(label)
+                self._write_meta()
+            return classes.index(label)
+
+    def _add_segment(self, session, features, labels, timestamps):
+        with self.lock:
+            name = f"seg-{self.meta['next_segment']:06d}"
+            self.meta["next_segment"] += 1
+        self._save(f"{name}.x.npy", features.astype(np.float32, copy=False))
+        self._save(f"{name}.y.npy", labels.astype(np.int16, copy=False))
+        self._save(f"{name}.t.npy", timestamps.astype(np.float64, copy=False))
+        with self.lock:
+            self.meta["segments"].append({"name": name, "session": session, "rows": int(len(features))})
+            self.meta["sessions"][session]["rows"] += int(len(features))
+            self._write_meta()
+
+    def _save(self, filename, array):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, filename)
+        with open(f"{path}.tmp", "wb") as f:
+            np.save(f, array)
+        os.replace(f"{path}.tmp", path) # Readers never see a partial segment
+
+    def _read_meta(self):
+        try:
+            with open(os.path.join(self.root, "meta.json")) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording store version {meta.get('version')} in {self.root}")
+        return meta
+
+    def _write_meta(self):
+        # Called with the lock held
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, "meta.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(self.meta, f, indent=1)
+        os.replace(f"{path}.tmp", path)
+
+    # ---------------- Reading ----------------
+
+    def _segment(self, segment, column, mmap):
+        if segment.get("compressed"):
+            with np.load(os.path.join(self.root, f"{segment['name']}.npz")) as archive:
+                return archive[column]
+        return np.load(os.path.join(self.root, f"{segment['name']}.{column}.npy"), mmap_mode="r" if mmap else None)
+
+    def load(self, sessions=None, mmap=True):
+        """
+        Frames of all sessions (or of the given session ids) as a Dataset.
+        With a single segment the arrays are read-only memory maps;
+        several segments are concatenated.
+        """
+        with self.lock:
+            segments = list(self.meta["segments"])
+        return self._load(segments, sessions, mmap)
+
+    def _load(self, segments, sessions, mmap):
+        with self.lock:
+            classes = np.array(self.meta["classes"], dtype=object)
+            columns = list(self.meta["columns"])
+        wanted = None if sessions is None else np.asarray(sorted(sessions), dtype=np.int32)
+
+        parts = {"x": [], "y": [], "t": [], "s": []}
+        for segment in segments:
+            if segment["session"] is None:
+                ids = self._segment(segment, "s", mmap) # Compacted: per-row session ids
+            elif wanted is not None and segment["session"] not in wanted:
+                continue
+            else:
+                ids = np.full(segment["rows"], segment["session"], dtype=np.int32)
+            rows = None
+            if wanted is not None and segment["session"] is None:
+                rows = np.isin(ids, wanted)
+                ids = ids[rows]
+            parts["s"].append(ids)
+            for column in ("x", "y", "t"):
+                values = self._segment(segment, column, mmap)
+                parts[column].append(values if rows is None else values[rows])
+
+        def join(arrays, empty):
+            if not arrays:
+                return empty
+            return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+        return Dataset(
+            features=join(parts["x"], np.empty((0, len(columns)), dtype=np.float32)),
+            labels=join(parts["y"], np.empty(0, dtype=np.int16)),
+            classes=classes,
+            sessions=join(parts["s"], np.empty(0, dtype=np.int32)),
+            timestamps=join(parts["t"], np.empty(0, dtype=np.float64)),
+            columns=columns,
+        )
+
+    def to_frame(self, sessions=None):
+        """Frames as a DataFrame: one column per sensor, categorical `label`, `session`."""
+        data = self.load(sessions)
+        df = pd.DataFrame(np.asarray(data.features), columns=data.columns)
+        df["label"] = pd.Categorical.from_codes(np.asarray(data.labels), categories=list(data.classes))
+        df["session"] = np.asarray(data.sessions)
+        return df
+
+    def compact(self, compress=False):
+        """Merge all segments into one (a single memory map, or one compressed archive)."""
+        with self.lock:
+            old = list(self.meta["segments"])
+            if not old or (len(old) == 1 and bool(old[0].get("compressed")) == compress):
+                return
+            name = f"seg-{self.meta['next_segment']:06d}"
+            self.meta["next_segment"] += 1
+        data = self._load(old, None, mmap=False)
+        columns = {"x": data.features, "y": data.labels, "t": data.timestamps, "s": data.sessions}
+        if compress:
+            path = os.path.join(self.root, f"{name}.npz")
+            with open(f"{path}.tmp", "wb") as f:
+                np.savez_compressed(f, **columns)
+            os.replace(f"{path}.tmp", path)
+        else:
+            for column, values in columns.items():
+                self._save(f"{name}.{column}.npy", values)
+        merged = {"name": name, "session": None, "rows": int(len(data.features))}
+        if compress:
+            merged["compressed"] = True
+        with self.lock:
+            # Segments written while compacting stay after the merged one
+            self.meta["segments"] = [merged] + [s for s in self.meta["segments"] if s not in old]
+            self._write_meta()
+        for segment in old:
+            for suffix in (".x.npy", ".y.npy", ".t.npy", ".s.npy", ".npz"):
+                try:
+                    os.remove(os.path.join(self.root, f"{segment['name']}{suffix}"))
+                except FileNotFoundError:
+                    pass
+        logger.info(f"✅ Compacted {len(old)} segments into {name} ({len(data.features)} frames)")
+
+class RecordingWriter:
+    """
+    Buffered writer for one session: frames go into a preallocated float32
+    block, and each full block becomes a segment. Use one writer per thread
+    (the store itself may be shared between writers).
+    """
+
+    def __init__(self, store, session, block_rows=4096):
+        self.store = store
+        self.session = session
+        self.block_rows = block_rows
+        self.features = np.empty((block_rows, len(store.columns)), dtype=np.float32)
+        self.labels = np.empty(block_rows, dtype=np.int16)
+        self.timestamps = np.empty(block_rows, dtype=np.float64)
+        self.size = 0
+        self.rows = 0
+        self.closed = False
+
+    def append(self, features, label=None, timestamps=None):
+        """Add one frame or an [n, columns] block with one label (timestamps: scalar or [n])."""
+        features = np.asarray(features, dtype=np.float32)
+        if features.ndim == 1:
+            features = features[np.newaxis, :]
+        code = self.store.label_code(label)
+        timestamps = np.broadcast_to(time.time() if timestamps is None else timestamps, len(features))
+        start = 0
+        while start < len(features):
+            n = min(len(features) - start, self.block_rows - self.size)
+            self.features[self.size:self.size + n] = features[start:start + n]
+            self.labels[self.size:self.size + n] = code
+            self.timestamps[self.size:self.size + n] = timestamps[start:start + n]
+            self.size += n
+            start += n
+            if self.size == self.block_rows:
+                self.flush()
+        self.rows += len(features)
+
+    def flush(self):
+        if self.size:
+            self.store._add_segment(self.session, self.features[:self.size], self.labels[:self.size],
+                                    self.timestamps[:self.size])
+            self.size = 0
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_csv_recording(path):
+    """
+    A CSV recording as a DataFrame. Reads the training_data.csv layout
+    (f1..az,label, no header) and the headered dataset_*.csv layout
+    (timestamp, f1..az, gx..gz, label).
+    """
+    with open(path) as f:
+        has_header = "f1" in f.readline()
+    if has_header:
+        return pd.read_csv(path)
+    return pd.read_csv(path, header=None, names=FEATURES + ['label'])
+
+def import_csv(path, store, device=None, block_rows=65536):
+    """Append a CSV recording to a store as one session; returns the frame count."""
+    df = read_csv_recording(path).dropna(subset=store.columns + ['label'])
+    if df.empty:
+        return 0
+    features = df[store.columns].to_numpy(dtype=np.float32)
+    labels = df['label'].astype(str).str.strip().str.upper().to_numpy()
+    timestamps = df['timestamp'].to_numpy(dtype=np.float64) if 'timestamp' in df.columns else None
+
+    with store.writer(device=device, block_rows=block_rows, source=os.path.basename(path)) as writer:
+        # One append per contiguous label run
+        bounds = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1], True])
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            writer.append(features[start:stop], labels[start],
+                          timestamps[start:stop] if timestamps is not None else None)
+    return len(df)
+
+def load_training_frame(path):
+    """
+    Training data as a DataFrame of FEATURES + `label`, from a recording
+    store directory or a training_data.csv-style file. Labels are stripped
+    and upper-cased either way, as the store does when it records them.
+    """
+    if os.path.isdir(path):
+        df = RecordingStore(path).to_frame()
+        df = df[FEATURES + ['label']].dropna()
+        return df.astype({'label': str})
+    df = read_csv_recording(path)[FEATURES + ['label']].dropna()
+    return df.assign(label=df['label'].astype(str).str.strip().str.upper())
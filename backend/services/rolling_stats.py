@@ -0,0 +1,202 @@
+import numpy as np
+
+class RollingWindow:
+    """
+    Rolling statistics over the last `window` samples of a multi-channel
+    stream, updated in O(1) (amortised) per sample for every channel at once.
+
+    - sum / sum of squares are kept incrementally and re-summed exactly once
+      per `window` samples so float error cannot build up
+    - min / max use the van Herk/Gil-Werman block scheme: the ring buffer is
+      split into window-sized blocks; the max over the window is the max of
+      the running prefix of the current block and the suffix max of the
+      previous block (suffixes are computed once per block)
+    """
+
+    def __init__(self, window, channels):
+        self.window = int(window)
+        self.channels = int(channels)
+        self.buffer = np.zeros((self.window, self.channels), dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self.count = 0 # Samples seen since reset
+        self.buffer.fill(0.0)
+        self._sum = np.zeros(self.channels)
+        self._sumsq = np.zeros(self.channels)
+        self._prefix_max = np.full(self.channels, -np.inf)
+        self._prefix_min = np.full(self.channels, np.inf)
+        self._suffix_max = np.full((self.window + 1, self.channels), -np.inf)
+        self._suffix_min = np.full((self.window + 1, self.channels), np.inf)
+        self._last = np.zeros(self.channels)
+
+    def push(self, x):
+        """Add one sample (array of `channels` values)."""
+        x = np.asarray(x, dtype=np.float64)
+        pos = self.count % self.window
+
+        if pos == 0 and self.count:
+            # Previous block complete: the buffer holds it in time order
+            block = self.buffer
+            self._suffix_max[:-1] = np.maximum.accumulate(block[::-1])[::-1]
+            self._suffix_min[:-1] = np.minimum.accumulate(block[::-1])[::-1]
+            self._sum = block.sum(axis=0) # Exact re-sum, drops accumulated error
+            self._sumsq = np.square(block).sum(axis=0)
+            self._prefix_max = x.copy()
+            self._prefix_min = x.copy()
+        else:
+            np.maximum(self._prefix_max, x, out=self._prefix_max)
+            np.minimum(self._prefix_min, x, out=self._prefix_min)
+
+        old = self.buffer[pos]
+        if self.count >= self.window:
+            self._sum -= old
+            self._sumsq -= old * old
+        self._sum += x
+        self._sumsq += x * x
+        self.buffer[pos] = x
+        self._last = x
+        self.count += 1
+
+    @property
+    def size(self):
+        """Number of samples currently in the window."""
+        return min(self.count, self.window)
+
+    def sum(self):
+        return self._sum.copy()
+
+    def mean(self):
+        return self._sum / max(self.size, 1)
+
+    def var(self):
+        n = max(self.size, 1)
+        mean = self._sum / n
+        return np.maximum(self._sumsq / n - mean * mean, 0.0)
+
+    def std(self):
+        return np.sqrt(self.var())
+
+    def energy(self):
+        """Mean of squares over the window."""
+        return self._sumsq / max(self.size, 1)
+
+    def max(self):
+        # Window = current block [0..pos] + previous block (pos+1..end]
+        pos = (self.count - 1) % self.window
+        return np.maximum(self._prefix_max, self._suffix_max[pos + 1])
+
+    def min(self):
+        pos = (self.count - 1) % self.window
+        return np.minimum(self._prefix_min, self._suffix_min[pos + 1])
+
+    def oldest(self):
+        """Oldest sample still in the window."""
+        if self.count <= self.window:
+            return self.buffer[0].copy()
+        return self.buffer[self.count % self.window].copy()
+
+    def delta(self):
+        """Newest minus oldest sample in the window."""
+        return self._last - self.oldest()
+
+    def zscore(self, x):
+        """How far a sample sits from the window mean, in standard deviations."""
+        std = self.std()
+        std[std == 0] = 1e-6
+        return (np.asarray(x, dtype=np.float64) - self.mean()) / std
+
+class ThresholdCounter:
+    """
+    Per-channel counts over the last `window` samples, updated in O(1):
+
+    - peaks: samples with |x| above the channel's threshold
+    - crossings: transitions between below and above the threshold
+
+    This replaces rescanning a deque on every sample (e.g. counting strong
+    gyro peaks for wave / nod / shake detection).
+    """
+
+    def __init__(self, window, thresholds):
+        # thresholds: one value per channel
+        self.window = int(window)
+        self.thresholds = np.atleast_1d(np.asarray(thresholds, dtype=np.float64))
+        channels = len(self.thresholds)
+        self._above = np.zeros((self.window, channels), dtype=np.int64)
+        self._crossed = np.zeros((self.window, channels), dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self._above.fill(0)
+        self._crossed.fill(0)
+        self.peaks = np.zeros(len(self.thresholds), dtype=np.int64)
+        self.crossings = np.zeros(len(self.thresholds), dtype=np.int64)
+        self._prev_above = np.zeros(len(self.thresholds), dtype=np.int64)
+
+    def push(self, x):
+        above = (np.abs(np.asarray(x, dtype=np.float64)) > self.thresholds).astype(np.int64)
+        crossed = (above != self._prev_above).astype(np.int64) if self.count else np.zeros_like(above)
+        pos = self.count % self.window
+
+        if self.count >= self.window:
+            self.peaks -= self._above[pos]
+            self.crossings -= self._crossed[pos]
+        self._above[pos] = above
+        self._crossed[pos] = crossed
+        self.peaks += above
+        self.crossings += crossed
+        self._prev_above = above
+        self.count += 1
+
+    @property
+    def size(self):
+        return min(self.count, self.window)
+
+class RollingStats:
+    """
+    Rolling statistics engine for one glove stream: mean / variance / min /
+    max over `window` samples for every channel, plus optional peak and
+    threshold-crossing counters (channels with a threshold of None are
+    not counted).
+    """
+
+    def __init__(self, window, columns, thresholds=None):
+        self.columns = list(columns)
+        self.stats = RollingWindow(window, len(self.columns))
+        self.counter = None
+        self._counted = None
+        if thresholds:
+            self._counted = [i for i, c in enumerate(self.columns) if thresholds.get(c) is not None]
+            self.counter = ThresholdCounter(window, [thresholds[self.columns[i]] for i in self._counted])
+
+    def push(self, frame):
+        frame = np.asarray(frame, dtype=np.float64)
+        self.stats.push(frame)
+        if self.counter is not None:
+            self.counter.push(frame[self._counted])
+
+    def reset(self):
+        self.stats.reset()
+        if self.counter is not None:
+            self.counter.reset()
+
+    def _by_column(self, values, columns):
+        return dict(zip(columns, values.tolist()))
+
+    def snapshot(self):
+        """All current statistics keyed by stat then column (JSON friendly)."""
+        if self.stats.size == 0:
+            return {"samples": 0}
+        out = {
+            "samples": self.stats.size,
+            "mean": self._by_column(self.stats.mean(), self.columns),
+            "std": self._by_column(self.stats.std(), self.columns),
+            "min": self._by_column(self.stats.min(), self.columns),
+            "max": self._by_column(self.stats.max(), self.columns),
+        }
+        if self.counter is not None:
+            counted = [self.columns[i] for i in self._counted]
+            out["peaks"] = self._by_column(self.counter.peaks, counted)
+            out["crossings"] = self._by_column(self.counter.crossings, counted)
+        return out
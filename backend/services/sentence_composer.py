@@ -0,0 +1,194 @@
+import re
+
+# Word classes for the gestures the gloves can produce (model classes,
+# recorded labels and the gyro rules) plus a few common extras.
+# word -> (class, surface form)
+VOCABULARY = {
+    "HELLO": ("greeting", "Hello"),
+    "HI": ("greeting", "Hi"),
+    "I": ("pronoun", "I"),
+    "WE": ("pronoun", "we"),
+    "YOU": ("pronoun", "you"),
+    "AM": ("be", "am"),
+    "ARE": ("be", "are"),
+    "IS": ("be", "is"),
+    "YASH": ("name", "Yash"),
+    "FSOCIETY": ("team", "Team Fsociety"),
+    "TEAM FSOCIETY": ("team", "Team Fsociety"),
+    "TEAM": ("noun", "a team"),
+    "YES": ("interjection", "Yes"),
+    "NO": ("interjection", "No"),
+    "STOP": ("interjection", "Stop"),
+    "THANK YOU": ("interjection", "Thank you"),
+    "THANKS": ("interjection", "Thanks"),
+    "PLEASE": ("interjection", "Please"),
+    "SORRY": ("interjection", "Sorry"),
+    "HAPPY": ("adjective", "happy"),
+    "FINE": ("adjective", "fine"),
+    "HUNGRY": ("adjective", "hungry"),
+    "TIRED": ("adjective", "tired"),
+    "READY": ("adjective", "ready"),
+}
+
+# Subject implied by a complement that shows up without one
+IMPLIED_SUBJECT = {"name": "I", "team": "WE", "noun": "WE", "adjective": "I"}
+BE_FORMS = {"I": "am", "WE": "are", "YOU": "are"}
+COMPLEMENTS = ("name", "team", "noun", "adjective")
+
+class _Clause:
+    def __init__(self, subject=None):
+        self.subject = subject # Vocabulary key of the pronoun
+        self.has_be = False
+        self.complement = [] # Surface forms
+        self.complement_kind = None
+        self.other = [] # Unknown words, kept in order
+
+    def render(self):
+        subject = VOCABULARY[self.subject][1] if self.subject else ""
+        if self.complement:
+            be = BE_FORMS.get(self.subject, "is")
+            return " ".join(p for p in [subject, be] + self.complement + self.other if p)
+        words = [subject] if subject else []
+        if self.has_be and not self.other:
+            words.append(BE_FORMS.get(self.subject, "is"))
+        return " ".join(words + self.other)
+
+class SentenceComposer:
+    """
+    Offline, rule-based sentence formation over the project vocabulary.
+
+    - normalizes and deduplicates the buffered words (immediate repeats and
+      a phrase signed twice in a row)
+    - groups words into clauses (pronoun + "to be" + complement), inferring
+      a missing subject or verb and fixing agreement ("WE AM" -> "we are")
+    - moves greetings to the front and joins clauses with commas / "and"
+
+    Unknown words pass through in order, so the output is never worse than
+    the raw join. Runs in microseconds with no network.
+    """
+
+    def __init__(self, vocabulary=None):
+        self.vocabulary = dict(VOCABULARY if vocabulary is None else vocabulary)
+        self._multiword = sorted((k for k in self.vocabulary if " " in k), key=len, reverse=True)
+
+    def normalize(self, words):
+        tokens = []
+        for word in words:
+            word = re.sub(r"\s+", " ", str(word).strip().upper())
+            if word:
+                tokens.append(word)
+        tokens = self._join_multiword(tokens)
+
+        deduped = []
+        for token in tokens:
+            if not deduped or deduped[-1] != token:
+                deduped.append(token)
+        return self._drop_repeated_phrases(deduped)
+
+    def _join_multiword(self, tokens):
+        # "THANK", "YOU" -> "THANK YOU" when it is a known label
+        out = []
+        i = 0
+        while i < len(tokens):
+            for phrase in self._multiword:
+                parts = phrase.split(" ")
+                if tokens[i:i + len(parts)] == parts:
+                    out.append(phrase)
+                    i += len(parts)
+                    break
+            else:
+                out.append(tokens[i])
+                i += 1
+        return out
+
+    def _drop_repeated_phrases(self, tokens):
+        # "HELLO I AM HELLO I AM" -> "HELLO I AM"
+        n = len(tokens)
+        for size in range(n // 2, 1, -1):
+            for start in range(n - 2 * size + 1):
+                if tokens[start:start + size] == tokens[start + size:start + 2 * size]:
+                    return self._drop_repeated_phrases(tokens[:start + size] + tokens[start + 2 * size:])
+        return tokens
+
+    def compose(self, words):
+        """Natural sentence for a list of gesture words (None if empty)."""
+        tokens = self.normalize(words)
+        if not tokens:
+            return None
+
+        greeting = None
+        interjections = []
+        clauses = []
+        current = None
+        dangling = [] # Complements seen before any subject (e.g. "YASH I AM")
+
+        for token in tokens:
+            kind, surface = self.vocabulary.get(token, ("other", token.lower()))
+            if kind == "greeting":
+                greeting = greeting or surface
+            elif kind == "interjection":
+                interjections.append(surface)
+            elif current is not None and current.other and not current.subject and kind in ("pronoun", "be"):
+                current.other.append(surface) # Free text like "HOW ARE YOU" stays as signed
+            elif kind == "pronoun":
+                current = _Clause(token)
+                clauses.append(current)
+            elif kind == "be":
+                if current is None or current.has_be or current.complement:
+                    subject = next((s for s, form in BE_FORMS.items() if form == surface), None)
+                    current = _Clause(subject)
+                    clauses.append(current)
+                current.has_be = True
+            elif kind in COMPLEMENTS:
+                if current is not None and not current.complement and not current.other:
+                    current.complement.append(surface)
+                    current.complement_kind = kind
+                elif current is None:
+                    dangling.append((kind, surface))
+                else:
+                    current = _Clause(IMPLIED_SUBJECT[kind])
+                    current.complement.append(surface)
+                    current.complement_kind = kind
+                    clauses.append(current)
+            else:
+                if current is None:
+                    current = _Clause()
+                    clauses.append(current)
+                current.other.append(surface)
+
+        # Attach complements signed before their subject
+        leading = []
+        for kind, surface in dangling:
+            target = next((c for c in clauses if c.subject and not c.complement and not c.other
+                           and IMPLIED_SUBJECT[kind] == c.subject), None)
+            if target is None:
+                target = _Clause(IMPLIED_SUBJECT[kind])
+                leading.append(target)
+            target.complement.append(surface)
+            target.complement_kind = kind
+        clauses = leading + clauses
+
+        parts = [c.render() for c in clauses]
+        parts = list(dict.fromkeys(p for p in parts if p)) # Same clause signed twice
+        return self._render(greeting, interjections, parts)
+
+    def _render(self, greeting, interjections, parts):
+        if len(parts) > 2:
+            body = ", ".join(parts[:-1]) + ", and " + parts[-1]
+        elif len(parts) == 2:
+            body = f"{parts[0]}, and {parts[1]}"
+        else:
+            body = parts[0] if parts else ""
+
+        pieces = []
+        if greeting:
+            pieces.append(f"{greeting} everyone" if body else greeting)
+        pieces += interjections
+        if body:
+            pieces.append(body)
+        sentence = ", ".join(pieces)
+        sentence = sentence[0].upper() + sentence[1:]
+        return sentence + ("!" if sentence == "Stop" else ".")
+
+# Global Instance
+sentence_composer = SentenceComposer()
@@ -0,0 +1,45 @@
+import logging
+import os
+from services.sentence_composer import sentence_composer
+from services.gemini_service import gemini_service
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("local", "gemini", "auto")
+
+class SentenceService:
+    """
+    Picks the sentence formation engine:
+
+    - local:  offline rule-based composer (milliseconds, no network)
+    - gemini: remote model, with the composer as fallback on errors / timeouts
+    - auto:   gemini when a model is configured, local otherwise
+    """
+
+    def __init__(self, engine="auto", composer=sentence_composer, remote=gemini_service):
+        if engine not in ENGINES:
+            logger.warning(f"⚠️ Unknown SENTENCE_ENGINE '{engine}', using 'auto'")
+            engine = "auto"
+        self.engine = engine
+        self.composer = composer
+        self.remote = remote
+        logger.info(f"✅ Sentence engine: {self.active_engine()}")
+
+    def active_engine(self):
+        if self.engine == "auto":
+            return "gemini" if self.remote is not None and self.remote.model else "local"
+        return self.engine
+
+    def generate(self, words):
+        if self.active_engine() == "gemini":
+            return self.remote.generate_sentence(words)
+        return self.composer.compose(words)
+
+    async def generate_async(self, words):
+        """Sentence for the buffered words without blocking the event loop."""
+        if self.active_engine() == "gemini":
+            return await self.remote.generate_sentence_async(words)
+        return self.composer.compose(words) # Pure CPU, microseconds
+
+# Global Instance
+sentence_service = SentenceService(engine=os.getenv("SENTENCE_ENGINE", "auto"))
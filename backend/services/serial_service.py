@@ -1,9 +1,11 @@
 import serial
 import serial.tools.list_ports
+import os
 import threading
 import time
 import logging
 from services.data_store import data_store
+from services.frame_codec import FrameStreamDecoder, frame_features, dashboard_fields, SequenceTracker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -17,7 +19,8 @@ class SerialService:
         self.running = False
         self.thread = None
         self.lock = threading.Lock()
-        self.on_data_callback = None # Callback function(flex_vals, acc_vals)
+        self.on_data_callback = None # Callback function(flex_vals, acc_vals, device_id)
+        self.sequences = SequenceTracker() # Loss detection for binary frames
 
     def register_callback(self, callback):
         """Register a function to be called when valid data is received"""
@@ -39,8 +42,12 @@ class SerialService:
         if self.running:
             return
         
+        if self.port and self.port.lower() == "none":
+            logger.info("Serial disabled (SERIAL_PORT=none)")
+            return
+
         target_port = self.port if self.port else self._find_esp32_port()
-        
+
         try:
             self.ser = serial.Serial(target_port, self.baud_rate, timeout=1)
             self.running = True
@@ -61,36 +68,28 @@ class SerialService:
             self.ser.close()
 
     def _read_loop(self):
+        # Text lines and binary frames can be mixed on the same port
+        decoder = FrameStreamDecoder(default_device=self.ser.port)
         while self.running and self.ser and self.ser.is_open:
             try:
-                line = self.ser.readline().decode('utf-8', errors='ignore').strip()
-                if not line:
+                data = self.ser.read(self.ser.in_waiting or 1)
+                if not data:
                     continue
-                
-                # Expecting format: "f1,f2,f3,f4,ax,ay,az" (7 values)
-                if "," in line:
-                    parts = line.split(',')
-                    if len(parts) >= 7:
-                        # Parse values
-                        vals = [float(x) for x in parts[:7]]
-                        
-                        flex_vals = vals[0:4]
-                        acc_vals = vals[4:7] # ax, ay, az
 
-                        # Update Global Data Store (Legacy support for frontend)
-                        data_store.update({
-                            "flex": flex_vals,
-                            "ax": acc_vals[0], "ay": acc_vals[1], "az": acc_vals[2],
-                            # Zero out gyro/others if not present in this format
-                            "gx": 0, "gy": 0, "gz": 0
-                        })
+                for block in decoder.feed(data):
+                    # Device id from the frame, else keyed by port name
+                    device_id = block.device_id
+                    lost = self.sequences.observe(device_id, block.seq) if block.seq is not None else None
+
+                    # Update Global Data Store (Legacy support for frontend)
+                    data_store.update(dashboard_fields(block, lost), device_id=device_id,
+                                      frames=[(block.flex, block.acc, block.gyro)])
 
-                        # Trigger Callback for ML
-                        if self.on_data_callback:
-                            self.on_data_callback(flex_vals, acc_vals)
+                    # Trigger Callback for ML
+                    if block.for_ml and self.on_data_callback:
+                        for row in frame_features(block).tolist():
+                            self.on_data_callback(row[0:4], row[4:7], device_id)
 
-            except (ValueError, IndexError):
-                continue # Ignore parse errors (common during startup)
             except serial.SerialException:
                 logger.error("Serial connection lost")
                 break
@@ -99,4 +98,4 @@ class SerialService:
                 time.sleep(1)
 
 # Global instance
-serial_service = SerialService()
+serial_service = SerialService(port=os.getenv("SERIAL_PORT") or None) # e.g. COM10, /dev/ttyUSB0, a replay pty; "none" disables
@@ -0,0 +1,104 @@
+import threading
+import time
+import logging
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEVICE = "default"
+
+class GloveSession:
+    """Per-glove pipeline state: buffered words and sentence timing."""
+
+    def __init__(self, device_id, max_words=32):
+        self.device_id = device_id
+        self.lock = threading.Lock()
+        self.word_buffer = deque(maxlen=max_words) # Bounded: oldest words drop first
+        self.last_detection_time = 0
+        self.last_spoken_time = 0 # For AI-Off mode cooldown
+        self.last_seen = time.time()
+
+    def add_word(self, word):
+        """Buffer a detected word (deduplicating immediate repeats)."""
+        with self.lock:
+            if not self.word_buffer or self.word_buffer[-1] != word:
+                self.word_buffer.append(word)
+            self.last_detection_time = time.time()
+
+    def words(self):
+        """Snapshot of the buffered words."""
+        with self.lock:
+            return list(self.word_buffer)
+
+    def take_words(self):
+        """Return and clear the buffered words (end of utterance)."""
+        with self.lock:
+            words = list(self.word_buffer)
+            self.word_buffer.clear()
+            return words
+
+class SessionManager:
+    """
+    Tracks one GloveSession per device id (source address or the device id
+    sent in the packet). Memory is bounded by `max_sessions` (least recently
+    seen is evicted) and by dropping sessions idle for `idle_timeout` seconds.
+    """
+
+    def __init__(self, max_sessions=64, idle_timeout=600, max_words=32):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_words = max_words
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+        self.on_evict_callbacks = [] # Function(device_id)
+
+    def register_evict_callback(self, callback):
+        self.on_evict_callbacks.append(callback)
+
+    def get(self, device_id=DEFAULT_DEVICE):
+        """Return the session for device_id, creating it if needed."""
+        evicted = []
+        with self.lock:
+            session = self.sessions.get(device_id)
+            if session is None:
+                session = GloveSession(device_id, max_words=self.max_words)
+                self.sessions[device_id] = session
+                logger.info(f"🧤 New glove session: {device_id}")
+                while len(self.sessions) > self.max_sessions:
+                    evicted.append(self.sessions.popitem(last=False)[0])
+            else:
+                self.sessions.move_to_end(device_id)
+            session.last_seen = time.time()
+
+        for old_id in evicted:
+            self._notify_evicted(old_id)
+        return session
+
+    def find(self, device_id):
+        with self.lock:
+            return self.sessions.get(device_id)
+
+    def all(self):
+        with self.lock:
+            return list(self.sessions.values())
+
+    def evict_idle(self):
+        cutoff = time.time() - self.idle_timeout
+        with self.lock:
+            idle = [d for d, s in self.sessions.items() if s.last_seen < cutoff]
+            for device_id in idle:
+                del self.sessions[device_id]
+
+        for device_id in idle:
+            self._notify_evicted(device_id)
+
+    def _notify_evicted(self, device_id):
+        logger.info(f"🧤 Glove session closed: {device_id}")
+        for callback in self.on_evict_callbacks:
+            try:
+                callback(device_id)
+            except Exception as e:
+                logger.error(f"Session evict callback error: {e}")
+
+# Global Instance
+session_manager = SessionManager()
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import os
+from services.gemini_service import normalize_words
+from services.sentence_service import sentence_service
+from services.tts_service import tts_service
+
+logger = logging.getLogger(__name__)
+
+class SpeculativeComposer:
+    """
+    Forms the sentence (and optionally its audio) while the user is still
+    signing. Every time a glove's word buffer changes, the candidate for
+    the new buffer is started and the stale one cancelled; when the
+    utterance ends, take() returns the finished (or nearly finished)
+    result instead of starting generation and synthesis from scratch.
+
+    generate: async Function(words) -> sentence
+    synthesize: async Function(sentence) -> audio bytes (optional)
+    """
+
+    def __init__(self, generate, synthesize=None, enabled=True):
+        self.generate = generate
+        self.synthesize = synthesize
+        self.enabled = enabled
+        self.pending = {} # device_id -> (word key, task); event loop only
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+
+    def update(self, device_id, words, with_audio=False):
+        """Start the candidate for the glove's current words (call on the event loop)."""
+        if not self.enabled or not words:
+            return
+        key = normalize_words(words)
+        current = self.pending.get(device_id)
+        if current is not None:
+            if current[0] == key:
+                return # Same words (repeat was deduplicated)
+            current[1].cancel()
+            self.cancelled += 1
+        task = asyncio.get_running_loop().create_task(self._run(list(words), with_audio))
+        self.pending[device_id] = (key, task)
+
+    async def take(self, device_id, words):
+        """(sentence, audio) speculated for exactly these words, or None."""
+        entry = self.pending.pop(device_id, None)
+        if entry is None or entry[0] != normalize_words(words) or entry[1].cancelled():
+            if entry is not None:
+                entry[1].cancel()
+            self.misses += 1
+            return None
+        try:
+            result = await entry[1]
+        except Exception as e:
+            logger.warning(f"⚠️ Speculative generation failed for {device_id}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def discard(self, device_id):
+        entry = self.pending.pop(device_id, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cancelled": self.cancelled,
+                "in_flight": len(self.pending)}
+
+    async def _run(self, words, with_audio):
+        sentence = await self.generate(words)
+        audio = None
+        if with_audio and sentence and self.synthesize is not None:
+            try:
+                audio = await self.synthesize(sentence)
+            except Exception as e:
+                logger.warning(f"⚠️ Speculative synthesis failed: {e}")
+        return sentence, audio
+
+# Global Instance
+speculation = SpeculativeComposer(
+    generate=sentence_service.generate_async,
+    synthesize=tts_service.synthesize,
+    enabled=os.getenv("SPECULATIVE", "1") != "0",
+)
@@ -0,0 +1,91 @@
+import numpy as np
+
+class StabilityTracker:
+    """
+    Debounces raw per-frame predictions into stable words.
+
+    A word fires once it has been predicted `required_stability` frames in a
+    row, and only if it differs from the last word that fired (edge trigger:
+    to repeat a word the gesture has to be broken first).
+    """
+
+    def __init__(self, required_stability=5):
+        self.required_stability = required_stability
+        self.last_prediction = ""
+        self.stability_counter = 0
+        self.last_stable_word = ""
+
+    def update(self, prediction):
+        """Feed one prediction; returns the word if it just became stable, else None."""
+        if prediction == self.last_prediction:
+            self.stability_counter += 1
+        else:
+            self.last_prediction = prediction
+            self.stability_counter = 0
+
+        if self.stability_counter >= self.required_stability:
+            if prediction != self.last_stable_word:
+                self.last_stable_word = prediction
+                self.stability_counter = 0
+                return prediction
+        return None
+
+    def reset(self):
+        self.last_prediction = ""
+        self.stability_counter = 0
+        self.last_stable_word = ""
+
+class ConfidenceTracker:
+    """
+    Debounces per-frame class probabilities into stable words by
+    accumulating evidence (a leaky, one-sided sequential probability ratio
+    test per class).
+
+    Each frame adds, for every class, the log-odds of that class against its
+    strongest competitor, clipped to +/- `max_step`. The frame's top class
+    gains at least threshold / `max_frames`, and its evidence is never
+    decayed, so a class that keeps winning fires within `max_frames` frames
+    (the counter's 6 by default) and sooner when the model is confident
+    (threshold / max_step frames). Only losing frames leak: the score decays
+    by `decay` before the negative step, and never drops below zero, so a
+    single outlier frame costs one step instead of restarting the count.
+    Same edge trigger as StabilityTracker: a word fires again only after
+    another word has fired.
+    """
+
+    def __init__(self, classes, threshold=8.0, max_step=3.0, decay=0.3, max_frames=6, eps=1e-3):
+        self.classes = [str(c) for c in classes]
+        self.threshold = threshold
+        self.max_step = max_step
+        self.decay = decay
+        self.min_step = threshold / max_frames * (1 + 1e-9) # Slack: max_frames float steps must reach threshold
+        self.eps = eps
+        self.scores = np.zeros(len(self.classes))
+        self.last_stable_word = ""
+
+    def update(self, probabilities):
+        """Feed one frame's class probabilities; returns the word if it just became stable, else None."""
+        log_p = np.log(np.asarray(probabilities, dtype=np.float64) + self.eps)
+        # Best competitor of each class: the top class competes with the runner-up
+        order = np.argsort(log_p)
+        rival = np.full(len(log_p), log_p[order[-1]])
+        rival[order[-1]] = log_p[order[-2]] if len(log_p) > 1 else np.log(self.eps)
+        step = np.clip(log_p - rival, -self.max_step, self.max_step)
+        step[order[-1]] = max(step[order[-1]], self.min_step)
+        self.scores = np.maximum(np.where(step > 0, self.scores, self.decay * self.scores) + step, 0.0)
+
+        # The last word keeps its (high) score while it is held; a new word
+        # fires on its own evidence rather than having to outscore it
+        ready = self.scores >= self.threshold
+        if self.last_stable_word in self.classes:
+            ready[self.classes.index(self.last_stable_word)] = False
+        if not ready.any():
+            return None
+        word = self.classes[int(np.argmax(np.where(ready, self.scores, -1.0)))]
+        self.last_stable_word = word
+        self.scores[:] = 0.0
+        return word
+
+    def reset(self):
+        self.scores[:] = 0.0
+        self.last_stable_word = ""
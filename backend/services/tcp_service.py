@@ -2,6 +2,7 @@ import socket
 import threading
 import logging
 from services.data_store import data_store
+from services.frame_codec import FrameStreamDecoder, frame_features, dashboard_fields, SequenceTracker
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,11 @@ class TcpService:
         self.server_socket = None
         self.running = False
         self.thread = None
+        self.on_data_callback = None # Callback function(flex_vals, acc_vals, device_id)
+        self.sequences = SequenceTracker() # Loss detection for binary frames
+
+    def register_callback(self, callback):
+        self.on_data_callback = callback
 
     def start(self):
         if self.running:
@@ -42,68 +48,38 @@ class TcpService:
                 client_sock, addr = self.server_socket.accept()
                 print(f"📱 ESP32 CONNECTED from {addr}") # DEBUG PRINT
                 logger.info(f"📱 ESP32 CONNECTED from {addr}")
-                self._handle_client(client_sock)
+                self._handle_client(client_sock, addr)
             except OSError:
                 if self.running:
                     logger.error("TCP Accept failed")
                 break
 
-    def _handle_client(self, conn):
-        buffer = ""
+    def _handle_client(self, conn, addr):
+        # Newline-delimited text and binary frames (see frame_codec.py)
+        decoder = FrameStreamDecoder(default_device=addr[0])
         try:
             while self.running:
-                data = conn.recv(1024).decode(errors="ignore")
+                data = conn.recv(1024)
                 if not data:
                     break
-                
-                buffer += data
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
-                    if line:
-                        # logger.info(f"raw: {line}") # Uncomment for extreme debug
-                        if len(line) > 0: print(f"RAW: {line}") # DEBUG PRINT
-                        self._parse_line(line)
+
+                for block in decoder.feed(data):
+                    self._handle_block(block)
         except Exception as e:
             logger.error(f"TCP Error: {e}")
         finally:
             conn.close()
             logger.info("📱 ESP32 DISCONNECTED")
 
-    def _parse_line(self, line):
-        try:
-            # Expected: f1,f2,f3,ax,ay,az,gx,gy,gz (9 values)
-            parts = line.split(',')
-            
-            # Support both 9 (3 Flex) and 11 (5 Flex) formats
-            if len(parts) == 9:
-                flex_raw = [float(x) for x in parts[:3]]
-                # Map 3 sensors to 5-slot array
-                # Assuming setup: [Thumb, Index, Middle, Ring, Pinky]
-                # Firmware sends: [Flex1, Flex2, Flex3]
-                # Map to: [0, Flex1, Flex2, Flex3, 0] (Adjust as needed!)
-                flex = [flex_raw[0], flex_raw[1], flex_raw[2], 0, 0] 
-
-                imu = [float(x) for x in parts[3:]]
-                
-                data_store.update({
-                    "flex": flex,
-                    "ax": imu[0], "ay": imu[1], "az": imu[2],
-                    "gx": imu[3], "gy": imu[4], "gz": imu[5]
-                })
-
-            elif len(parts) == 11:
-                flex = [float(x) for x in parts[:5]]
-                imu = [float(x) for x in parts[5:]]
-                
-                data_store.update({
-                    "flex": flex,
-                    "ax": imu[0], "ay": imu[1], "az": imu[2],
-                    "gx": imu[3], "gy": imu[4], "gz": imu[5]
-                })
+    def _handle_block(self, block):
+        device_id = block.device_id
+        lost = self.sequences.observe(device_id, block.seq) if block.seq is not None else None
+        data_store.update(dashboard_fields(block, lost), device_id=device_id,
+                          frames=[(block.flex, block.acc, block.gyro)])
 
-        except ValueError:
-            pass # Ignore corrupt packets
+        if block.for_ml and self.on_data_callback:
+            for row in frame_features(block).tolist():
+                self.on_data_callback(row[0:4], row[4:7], device_id)
 
 # Global Instance
 tcp_service = TcpService()
@@ -0,0 +1,158 @@
+import numpy as np
+import logging
+import threading
+from services.flat_forest import FlatForest
+
+logger = logging.getLogger(__name__)
+
+class TinyNet:
+    """
+    A small softmax classifier in pure NumPy: standardized inputs, optional
+    ReLU hidden layers, softmax output. With no hidden layers it is a
+    multinomial linear model.
+
+    Trained by distillation (fit() takes the teacher's class probabilities
+    as soft targets), saved as .npz with the same predict / predict_proba /
+    classes_ interface as FlatForest.
+    """
+
+    def __init__(self, weights, biases, mean, scale, classes):
+        self.weights = [np.asarray(w, dtype=np.float64) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float64) for b in biases]
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.classes_ = np.asarray(classes).astype(object)
+        self.n_features_in_ = len(self.mean)
+
+    @property
+    def hidden(self):
+        return tuple(w.shape[1] for w in self.weights[:-1])
+
+    @classmethod
+    def fit(cls, X, targets, classes, hidden=(), epochs=400, learning_rate=0.01, weight_decay=1e-4, seed=0):
+        """Full-batch Adam on cross-entropy against soft targets [n, n_classes]."""
+        X = np.asarray(X, dtype=np.float64)
+        targets = np.asarray(targets, dtype=np.float64)
+        mean = X.mean(axis=0)
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1.0
+        Z = (X - mean) / scale
+
+        rng = np.random.default_rng(seed)
+        sizes = [X.shape[1], *hidden, targets.shape[1]]
+        weights = [rng.normal(0.0, np.sqrt(2.0 / n_in), (n_in, n_out)) for n_in, n_out in zip(sizes[:-1], sizes[1:])]
+        biases = [np.zeros(n_out) for n_out in sizes[1:]]
+        params = weights + biases
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+        for step in range(1, epochs + 1):
+            # Forward
+            activations = [Z]
+            for w, b in zip(weights[:-1], biases[:-1]):
+                activations.append(np.maximum(activations[-1] @ w + b, 0.0))
+            probs = _softmax(activations[-1] @ weights[-1] + biases[-1])
+
+            # Backward (softmax + cross-entropy)
+            delta = (probs - targets) / len(Z)
+            grad_w, grad_b = [None] * len(weights), [None] * len(biases)
+            for layer in range(len(weights) - 1, -1, -1):
+                grad_w[layer] = activations[layer].T @ delta + weight_decay * weights[layer]
+                grad_b[layer] = delta.sum(axis=0)
+                if layer:
+                    delta = (delta @ weights[layer].T) * (activations[layer] > 0)
+
+            for i, (param, grad) in enumerate(zip(params, grad_w + grad_b)):
+                moments[i] = beta1 * moments[i] + (1 - beta1) * grad
+                velocities[i] = beta2 * velocities[i] + (1 - beta2) * grad * grad
+                m_hat = moments[i] / (1 - beta1 ** step)
+                v_hat = velocities[i] / (1 - beta2 ** step)
+                param -= learning_rate * m_hat / (np.sqrt(v_hat) + eps) # In place: weights/biases share these arrays
+
+        return cls(weights, biases, mean, scale, classes)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            layers = int(data["layers"])
+            return cls(
+                weights=[data[f"w{i}"] for i in range(layers)],
+                biases=[data[f"b{i}"] for i in range(layers)],
+                mean=data["mean"],
+                scale=data["scale"],
+                classes=data["classes"],
+            )
+
+    def save(self, path):
+        arrays = {f"w{i}": w for i, w in enumerate(self.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        np.savez(path, layers=np.int32(len(self.weights)), mean=self.mean, scale=self.scale,
+                 classes=np.asarray(self.classes_).astype(str), **arrays)
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        h = (X - self.mean) / self.scale
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            h = np.maximum(h @ w + b, 0.0)
+        return _softmax(h @ self.weights[-1] + self.biases[-1])
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+class CascadeModel:
+    """
+    Small model on every frame, big model only where the small one is
+    unsure (top class probability below `threshold`). Both models must have
+    the same classes, in the same order.
+    """
+
+    def __init__(self, small, big, threshold=0.8):
+        if list(map(str, small.classes_)) != list(map(str, big.classes_)):
+            raise ValueError(f"Cascade classes differ: {list(small.classes_)} vs {list(big.classes_)}")
+        self.small = small
+        self.big = big
+        self.threshold = threshold
+        self.classes_ = big.classes_
+        self.n_features_in_ = getattr(big, "n_features_in_", None)
+        self.lock = threading.Lock() # Counters only; gloves predict concurrently
+        self.frames = 0
+        self.escalated = 0
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        probs = self.small.predict_proba(X)
+        unsure = probs.max(axis=1) < self.threshold
+        if unsure.any():
+            probs[unsure] = self.big.predict_proba(X[unsure])
+        with self.lock:
+            self.frames += len(X)
+            self.escalated += int(unsure.sum())
+        return probs
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "threshold": self.threshold,
+                "frames": self.frames,
+                "escalated": self.escalated,
+                "escalation_rate": round(self.escalated / self.frames, 4) if self.frames else 0.0,
+            }
+
+def load_flat_model(path):
+    """A FlatForest or TinyNet .npz (told apart by its arrays)."""
+    with np.load(path, allow_pickle=False) as data:
+        kind = "tiny_net" if "layers" in data.files else "flat_forest"
+    return TinyNet.load(path) if kind == "tiny_net" else FlatForest.load(path)
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    return logits / logits.sum(axis=1, keepdims=True)
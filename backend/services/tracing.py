@@ -0,0 +1,168 @@
+import bisect
+import math
+import os
+import threading
+import time
+
+# Upper bounds (seconds) of the latency buckets; +Inf is implicit
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (Prometheus style). Recording is one
+    bisect and two additions, so it is cheap enough for the per-frame path;
+    percentiles are estimated from the buckets when asked for.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1) # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(self.bounds, seconds)
+        with self.lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.count, self.sum, self.max
+
+    def quantile(self, q, snapshot=None):
+        """Linear interpolation inside the bucket holding the q-th sample (like histogram_quantile)."""
+        counts, count, _, largest = snapshot or self.snapshot()
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for i, n in enumerate(counts):
+            if seen + n >= rank and n:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = min(self.bounds[i], largest) if i < len(self.bounds) else largest
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return largest
+
+    def summary(self):
+        snapshot = self.snapshot()
+        _, count, total, largest = snapshot
+        if not count:
+            return {"count": 0}
+        return {
+            "count": count,
+            "mean_ms": round(total / count * 1000.0, 2),
+            "p50_ms": round(self.quantile(0.50, snapshot) * 1000.0, 2),
+            "p95_ms": round(self.quantile(0.95, snapshot) * 1000.0, 2),
+            "p99_ms": round(self.quantile(0.99, snapshot) * 1000.0, 2),
+            "max_ms": round(largest * 1000.0, 2),
+        }
+
+class Tracer:
+    """
+    Per-stage latency histograms for the glove -> speech pipeline.
+
+    - observe(stage, seconds): record how long a stage took
+    - mark(device_id, stage, since=...): stamp when a glove's frame or
+      derived event (word, utterance end, sentence, audio) reached a stage,
+      and record the time since an earlier stamp as "<since>_to_<stage>"
+      (or under `metric`)
+
+    Stamps are time.monotonic() values kept per glove (latest only), so
+    marking a frame is a dict store. Everything is a no-op when disabled.
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.histograms = {} # stage -> Histogram
+        self.marks = {} # device_id -> {stage: monotonic time}
+        self.lock = threading.Lock()
+
+    def histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(stage, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, stage, seconds):
+        if self.enabled:
+            self.histogram(stage).observe(seconds)
+
+    def mark(self, device_id, stage, since=None, now=None, metric=None):
+        """Stamp a stage for a glove; returns the timestamp."""
+        now = time.monotonic() if now is None else now
+        if not self.enabled:
+            return now
+        marks = self.marks.get(device_id)
+        if marks is None:
+            marks = self.marks.setdefault(device_id, {})
+        if since is not None:
+            start = marks.get(since)
+            if start is not None:
+                self.histogram(metric or f"{since}_to_{stage}").observe(now - start)
+        marks[stage] = now
+        return now
+
+    def drop_device(self, device_id):
+        self.marks.pop(device_id, None)
+
+    def stage_summary(self, stage):
+        """One stage's summary ({"count": 0} if nothing was recorded yet)."""
+        histogram = self.histograms.get(stage)
+        return histogram.summary() if histogram is not None else {"count": 0}
+
+    def summary(self):
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+        return {stage: histogram.summary() for stage, histogram in histograms}
+
+    def render(self, prefix="signspeak"):
+        """Stage histograms (plus p50/p95/p99 gauges) in Prometheus text format."""
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+        name = f"{prefix}_stage_seconds"
+        lines = [f"# HELP {name} Pipeline stage latency.", f"# TYPE {name} histogram"]
+        quantiles = []
+        for stage, histogram in histograms:
+            snapshot = histogram.snapshot()
+            counts, count, total, _ = snapshot
+            cumulative = 0
+            for bound, n in zip(histogram.bounds + (math.inf,), counts):
+                cumulative += n
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+            for q in (0.5, 0.95, 0.99):
+                value = histogram.quantile(q, snapshot)
+                if value is not None:
+                    quantiles.append(f'{name}_quantile{{stage="{stage}",quantile="{q}"}} {value!r}')
+        if quantiles:
+            lines += [f"# HELP {name}_quantile Estimated stage latency percentiles.",
+                      f"# TYPE {name}_quantile gauge"] + quantiles
+        return "\n".join(lines) + "\n"
+
+def render_gauges(prefix, stats):
+    """Numeric values of a (nested) stats dict as Prometheus gauges: prefix_key value."""
+    lines = []
+    for key, value in stats.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict):
+            lines += render_gauges(name, value)
+        elif isinstance(value, bool):
+            lines += [f"# TYPE {name} gauge", f"{name} {int(value)}"]
+        elif isinstance(value, (int, float)):
+            lines += [f"# TYPE {name} gauge", f"{name} {value!r}"]
+    return lines
+
+# Global Instance
+tracer = Tracer(enabled=os.getenv("TRACING", "1") != "0")
@@ -1,25 +1,53 @@
 import pyttsx3
-import threading
 import logging
-import asyncio
 import edge_tts
 import os
-import tempfile
-import pygame
+import time
+from services.audio_cache import AudioCache
+from services.playback_service import ENQUEUE, NullSink, PlaybackWorker, PygameSink
+from services.tracing import tracer
+
+DEFAULT_VOICE = "en-US-AriaNeural"
+DEFAULT_RATE = "+0%"
+
+# VOICE MAPPING (Neural Voices)
+VOICE_MAP = {
+    "en": "en-US-ChristopherNeural",   # Male, Deep, Clear
+    "hi": "hi-IN-MadhurNeural",        # Male, Natural Hindi
+    "mr": "mr-IN-ManoharNeural",       # Male, Natural Marathi
+    "bn": "bn-IN-BashkarNeural",       # Bengali
+    "gu": "gu-IN-NiranjanNeural",      # Gujarati
+    "ta": "ta-IN-ValluvarNeural",      # Tamil
+    "te": "te-IN-MohanNeural",         # Telugu
+    "kn": "kn-IN-GaganNeural",         # Kannada
+    "ml": "ml-IN-MidhunNeural",        # Malayalam
+    # Fallback
+    "default": "en-US-ChristopherNeural"
+}
+
+def voice_for(lang):
+    return VOICE_MAP.get((lang or "").lower(), VOICE_MAP["default"])
 
 logger = logging.getLogger(__name__)
 
 class TTSService:
-    def __init__(self):
+    """
+    Text to speech: Edge TTS (cached) played through one long-lived
+    PlaybackWorker, with pyttsx3 as the offline fallback. AUDIO_SINK=null
+    (or no audio device) plays into a NullSink, for headless use.
+    """
+
+    def __init__(self, cache=None, sink=None):
         self.engine = None
-        self.lock = threading.Lock()
-        self.loop = None
-        
-        # Initialize Pygame Mixer for Audio Playback
-        try:
-            pygame.mixer.init()
-        except Exception as e:
-            logger.error(f"Pygame Init Error: {e}")
+        self.cache = cache # AudioCache of synthesized phrases (optional)
+
+        # Audio device: pygame mixer, initialized once
+        if sink is None:
+            try:
+                sink = PygameSink()
+            except Exception as e:
+                logger.error(f"Pygame Init Error: {e} (using null audio sink)")
+                sink = NullSink()
 
         # Initialize Fallback Engine
         try:
@@ -29,52 +57,54 @@ class TTSService:
         except Exception as e:
             logger.error(f"❌ TTS Fallback Init Error: {e}")
 
-    def speak(self, text):
-        # Run in a separate thread to avoid blocking
-        threading.Thread(target=self._speak_thread, args=(text,), daemon=True).start()
+        self.player = PlaybackWorker(self.stream, sink, fallback=self._speak_fallback, voice=DEFAULT_VOICE)
 
-    def _speak_thread(self, text):
-        with self.lock:
-            try:
-                # 1. Try Edge TTS (High Quality)
-                asyncio.run(self._speak_edge(text))
-            except Exception as e:
-                # Ignore shutdown errors
-                if "atexit" in str(e) or "shutdown" in str(e):
-                    return
-
-                logger.warning(f"⚠️ Edge TTS Failed ({e}), switching to fallback...")
-                # 2. Fallback to Offline TTS
-                self._speak_fallback(text)
-
-    async def _speak_edge(self, text):
-        # Voice: en-US-AriaNeural or en-US-GuyNeural
-        voice = "en-US-AriaNeural"
-        temp_file = os.path.join(tempfile.gettempdir(), "sign_speak_temp.mp3")
-        
-        communicate = edge_tts.Communicate(text, voice)
-        await communicate.save(temp_file)
-        
-        # Play with Pygame
-        try:
-             # Re-init mixer to ensure fresh handle
-            pygame.mixer.quit()
-            pygame.mixer.init()
-            
-            pygame.mixer.music.load(temp_file)
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-        except Exception as e:
-            logger.error(f"Pygame Playback Error: {e}")
-            raise e
-            
-        # Cleanup
-        try:
-            pygame.mixer.music.unload()
-            # os.remove(temp_file) # Optional: Keep for debugging or delete
-        except:
-            pass
+    def speak(self, text, audio=None, on_start=None, policy=ENQUEUE, priority=1, voice=None, max_pending=None):
+        """
+        Speak text in the background and return its playback handle (None if
+        refused: `max_pending` items already queued).
+        `audio` is pre-synthesized MP3 for the text (skips synthesis);
+        `on_start()` is called when playback starts.
+        """
+        return self.player.submit(text, audio=audio, priority=priority, policy=policy,
+                                  voice=voice, on_start=on_start, max_pending=max_pending)
+
+    def stop(self):
+        """Stop what is playing and drop the queue."""
+        self.player.stop()
+
+    async def stream(self, text, voice=DEFAULT_VOICE, rate=DEFAULT_RATE, chunk_size=16 * 1024):
+        """
+        MP3 chunks for text as they are produced by Edge TTS (in memory; no
+        temp files or subprocesses). Cached phrases are replayed from the
+        audio cache; a fully streamed phrase is added to it.
+        """
+        if self.cache is not None:
+            audio = self.cache.get(text, voice, rate)
+            if audio is not None:
+                for start in range(0, len(audio), chunk_size):
+                    yield audio[start:start + chunk_size]
+                return
+
+        audio = bytearray()
+        started = time.monotonic()
+        async for chunk in edge_tts.Communicate(text, voice, rate=rate).stream():
+            if chunk["type"] == "audio":
+                if not audio:
+                    tracer.observe("tts_first_chunk", time.monotonic() - started)
+                audio += chunk["data"]
+                yield chunk["data"]
+        # Only reached when the stream completed (not when the consumer stopped early)
+        tracer.observe("tts_synthesize", time.monotonic() - started)
+        if self.cache is not None and audio:
+            self.cache.put(text, voice, bytes(audio), rate)
+
+    async def synthesize(self, text, voice=DEFAULT_VOICE, rate=DEFAULT_RATE):
+        """Whole MP3 for text, for playing later with speak(audio=...)."""
+        audio = bytearray()
+        async for chunk in self.stream(text, voice, rate):
+            audio += chunk
+        return bytes(audio)
 
     def _speak_fallback(self, text):
         if self.engine:
@@ -85,4 +115,10 @@ class TTSService:
                 logger.error(f"TTS Fallback Error: {e}")
 
 # Global instance
-tts_service = TTSService()
+tts_service = TTSService(
+    cache=AudioCache(
+        directory=os.getenv("TTS_CACHE_DIR", "cache/tts"),
+        max_bytes=int(os.getenv("TTS_CACHE_MB", "64")) * 1024 * 1024,
+    ),
+    sink=NullSink() if os.getenv("AUDIO_SINK") == "null" else None,
+)
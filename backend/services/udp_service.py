@@ -1,26 +1,91 @@
+import asyncio
+import os
 import socket
 import threading
 import logging
 import time
+import numpy as np
 from services.data_store import data_store
+from services.frame_codec import decode_packet, frame_features, dashboard_fields, SequenceTracker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class _GloveDatagramProtocol(asyncio.DatagramProtocol):
+    """
+    Event-loop UDP receiver. The transport hands us one datagram per wakeup;
+    we then drain everything else already queued on the socket so a burst
+    is parsed and sent to inference as one batch.
+    """
+
+    def __init__(self, service):
+        self.service = service
+
+    def datagram_received(self, data, addr):
+        packets = [(data, addr)]
+        sock = self.service.sock
+        try:
+            while len(packets) < self.service.max_drain:
+                packets.append(sock.recvfrom(self.service.max_datagram))
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as e:
+            if self.service.running:
+                logger.error(f"Error draining UDP socket: {e}")
+        self.service._handle_packets(packets)
+
+    def error_received(self, exc):
+        logger.error(f"UDP receive error: {exc}")
+
 class UDPService:
-    def __init__(self, host="0.0.0.0", port=5005):
+    def __init__(self, host="0.0.0.0", port=5005, mode="asyncio"):
         self.host = host
         self.port = port
+        self.mode = mode # "asyncio" (event loop receiver) or "thread" (blocking fallback)
         self.sock = None
         self.running = False
         self.thread = None
+        self.transport = None
         self.lock = threading.Lock()
-        self.on_data_callback = None
+        self.on_data_callback = None # Function(flex_vals, acc_vals, device_id)
+        self.on_batch_callback = None # Function(features [n, 7], device_id)
+        self.max_datagram = 65507 # Gloves may pack many frames per datagram
+        self.max_drain = 256 # Datagrams handled per event-loop wakeup
+        self.sequences = SequenceTracker() # Loss detection for binary frames
 
     def register_callback(self, callback):
         self.on_data_callback = callback
 
+    def register_batch_callback(self, callback):
+        """Receive frames as NumPy blocks per device instead of one call per frame."""
+        self.on_batch_callback = callback
+
+    async def start_async(self):
+        """Start the receiver on the running event loop, falling back to the thread."""
+        if self.running:
+            return
+        if self.mode == "thread":
+            self.start()
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.setblocking(False)
+            self.sock.bind((self.host, self.port))
+            self.transport, _ = await loop.create_datagram_endpoint(
+                lambda: _GloveDatagramProtocol(self), sock=self.sock
+            )
+            self.running = True
+            logger.info(f"✅ UDP SERVICE STARTED (asyncio): Listening on {self.host}:{self.port}")
+        except Exception as e:
+            logger.error(f"❌ UDP ASYNC START ERROR: {e}. Falling back to thread receiver")
+            if self.sock:
+                self.sock.close()
+                self.sock = None
+            self.start()
+
     def start(self):
         if self.running:
             return
@@ -29,8 +94,8 @@ class UDPService:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.sock.bind((self.host, self.port))
             # Set timeout to allow check for 'running' flag periodically
-            self.sock.settimeout(1.0) 
-            
+            self.sock.settimeout(1.0)
+
             self.running = True
             self.thread = threading.Thread(target=self._read_loop, daemon=True)
             self.thread.start()
@@ -40,65 +105,71 @@ class UDPService:
 
     def stop(self):
         self.running = False
+        if self.transport:
+            # Closes the socket immediately, no timeout to wait out
+            self.transport.close()
+            self.transport = None
+            self.sock = None
         if self.thread:
             self.thread.join()
+            self.thread = None
         if self.sock:
             self.sock.close()
+            self.sock = None
         logger.info("UDP SERVICE STOPPED")
 
+    def _handle_packets(self, packets):
+        """
+        Parse a burst of datagrams (each may carry many frames) and hand them
+        to inference as one [n, 7] block per glove.
+        Returns the number of frames decoded.
+        """
+        frames = {} # device_id -> list of [n, 7] blocks (arrival order)
+        latest = {} # device_id -> newest block, for the dashboard snapshot
+        history = {} # device_id -> (flex, acc, gyro) of every block, for the frame history
+        count = 0
+        for data, addr in packets:
+            try:
+                # Binary frames carry their own device id, text falls back to the sender IP
+                blocks = decode_packet(data, default_device=addr[0])
+            except (ValueError, IndexError):
+                continue # Ignore corrupt packets
+            for block in blocks:
+                device_id = block.device_id
+                if block.seq is not None:
+                    self.sequences.observe(device_id, block.seq)
+                latest[device_id] = block
+                history.setdefault(device_id, []).append((block.flex, block.acc, block.gyro))
+                count += len(block.flex)
+                if block.for_ml:
+                    frames.setdefault(device_id, []).append(frame_features(block))
+
+        # One snapshot update per glove (newest frame); every frame goes to its history
+        for device_id, block in latest.items():
+            fields = dashboard_fields(block, self.sequences.lost.get(device_id))
+            data_store.update(fields, device_id=device_id, frames=history[device_id])
+
+        for device_id, blocks in frames.items():
+            try:
+                features = blocks[0] if len(blocks) == 1 else np.vstack(blocks)
+                if self.on_batch_callback:
+                    self.on_batch_callback(features, device_id)
+                elif self.on_data_callback:
+                    for row in features.tolist():
+                        self.on_data_callback(row[0:4], row[4:7], device_id)
+            except Exception as e:
+                logger.error(f"Error handling UDP batch from {device_id}: {e}")
+        return count
+
     def _read_loop(self):
         while self.running:
             try:
-                data, addr = self.sock.recvfrom(1024)
-                line = data.decode('utf-8', errors='ignore').strip()
-                
-                if not line:
-                    continue
-
-                # Expecting format: "f1,f2,f3,f4,ax,ay,az" (7 values)
-                if "," in line and "|" not in line:
-                    parts = line.split(',')
-                    if len(parts) >= 7:
-                        # Parse values
-                        vals = [float(x) for x in parts[:7]]
-                        
-                        flex_vals = vals[0:4]
-                        acc_vals = vals[4:7] # ax, ay, az
-
-                        # Update Global Data Store
-                        data_store.update({
-                            "flex": flex_vals,
-                            "ax": acc_vals[0], "ay": acc_vals[1], "az": acc_vals[2],
-                            "gx": 0, "gy": 0, "gz": 0
-                        })
-                        
-                        if self.on_data_callback:
-                            self.on_data_callback(flex_vals, acc_vals)
-                            
-                        # Debug: Show we received it (similar to Serial)
-                        print(f"UDP Recv: {flex_vals} | ACC: {acc_vals}") 
-                        # return # Skip legacy check
-
-                # Old Format: "FLEX:f1,f2,f3,f4 | ACC:ax,ay,az | GYR:gx,gy,gz"
-                if "FLEX:" in line and "| ACC:" in line:
-                    parts = line.split('|')
-                    
-                    flex_str = parts[0].split(':')[1]
-                    acc_str = parts[1].split(':')[1]
-                    gyr_str = parts[2].split(':')[1]
-
-                    flex_vals = [float(x) for x in flex_str.split(',')]
-                    acc_vals = [float(x) for x in acc_str.split(',')]
-                    gyr_vals = [float(x) for x in gyr_str.split(',')]
-
-                    # Update Global Data Store
-                    data_store.update({
-                        "flex": flex_vals,
-                        "ax": acc_vals[0], "ay": acc_vals[1], "az": acc_vals[2],
-                        "gx": gyr_vals[0], "gy": gyr_vals[1], "gz": gyr_vals[2]
-                    })
-                    print(f"RAW DATA | FLEX: {flex_vals} | ACC: {acc_vals} | GYR: {gyr_vals}")
-                    
+                data, addr = self.sock.recvfrom(self.max_datagram)
+                count = self._handle_packets([(data, addr)])
+
+                # Debug: Show we received it (similar to Serial)
+                print(f"UDP Recv: {count} frame(s) from {addr[0]}")
+
             except socket.timeout:
                 continue
             except Exception as e:
@@ -107,4 +178,4 @@ class UDPService:
                 time.sleep(0.1)
 
 # Global instance
-udp_service = UDPService()
+udp_service = UDPService(mode=os.getenv("UDP_MODE", "asyncio"))
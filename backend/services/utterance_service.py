@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import numpy as np
+from services.rolling_stats import RollingStats
+from services.session_service import session_manager
+
+logger = logging.getLogger(__name__)
+
+class UtteranceSegmenter:
+    """
+    Decides when a glove has finished a sentence and hands its buffered
+    words to the registered callback. An utterance ends on whichever comes
+    first:
+
+    - silence: no new word for `silence_threshold` seconds. Each word
+      (re)arms a cancellable loop.call_later timer for its session, so the
+      sentence is emitted right when the silence ends instead of on the
+      next tick of a polling loop
+    - an end-of-sentence gesture (e.g. STOP), which is not buffered itself
+    - hand rest: after the last word, accelerometer std stays below
+      `rest_std` for a whole `rest_window` frames (0 disables; off by
+      default, since a held sign is just as still as a resting hand and
+      would cut the utterance mid-sentence)
+
+    on_word / on_frames may be called from any thread; timers are only
+    touched on the event loop (via call_soon_threadsafe).
+    """
+
+    def __init__(self, sessions=session_manager, silence_threshold=3.0, end_gestures=("STOP",),
+                 rest_window=0, rest_std=0.15):
+        self.sessions = sessions
+        self.silence_threshold = silence_threshold
+        self.end_gestures = {g.strip().upper() for g in end_gestures if g.strip()}
+        self.rest_window = rest_window
+        self.rest_std = rest_std
+        self.loop = None
+        self.callbacks = [] # async or sync Function(device_id, words, reason)
+        self.buffer_callbacks = [] # Function(device_id, words), on the loop after each new word
+        self.timers = {} # device_id -> TimerHandle (loop thread only)
+        self.resting = {} # device_id -> RollingStats over acc, while words are pending
+        self.tasks = set() # Running async callbacks (keeps references alive)
+        self.lock = threading.Lock()
+
+    def register_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def register_buffer_callback(self, callback):
+        """Called with the glove's buffered words whenever a word is added (e.g. speculation)."""
+        self.buffer_callbacks.append(callback)
+
+    def start(self, loop=None):
+        self.loop = loop or asyncio.get_running_loop()
+        logger.info(f"✅ Utterance segmenter started (silence {self.silence_threshold}s, "
+                    f"end gestures {sorted(self.end_gestures)}, rest window {self.rest_window})")
+
+    def on_word(self, device_id, word):
+        """A stable word was detected for the glove."""
+        if word.strip().upper() in self.end_gestures:
+            session = self.sessions.get(device_id)
+            session.last_detection_time = time.time() # The end gesture is the last gesture
+            self._call_on_loop(self._end, device_id, "gesture")
+            return
+
+        self.sessions.get(device_id).add_word(word)
+        if self.rest_window:
+            with self.lock: # Rest is measured from the last word on
+                self.resting[device_id] = RollingStats(self.rest_window, ["ax", "ay", "az"])
+        self._call_on_loop(self._arm, device_id)
+
+    def on_frames(self, device_id, frames):
+        """Raw [n, 7] frames (f1..f4, ax, ay, az) for hand-rest detection."""
+        if not self.rest_window or device_id not in self.resting:
+            return # Nothing pending for this glove
+        with self.lock:
+            stats = self.resting.get(device_id)
+            if stats is None:
+                return
+            for frame in np.asarray(frames, dtype=np.float64)[:, 4:7]:
+                stats.push(frame)
+            at_rest = stats.stats.size >= self.rest_window and stats.stats.std().max() < self.rest_std
+        if at_rest:
+            self._call_on_loop(self._end_if_resting, device_id, stats)
+
+    def cancel(self, device_id):
+        """Forget a glove (session evicted)."""
+        with self.lock:
+            self.resting.pop(device_id, None)
+        self._call_on_loop(self._cancel_timer, device_id)
+
+    def _call_on_loop(self, callback, *args):
+        if self.loop is None or self.loop.is_closed():
+            logger.warning("⚠️ Utterance segmenter not started; dropping event")
+            return
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    # ---------------- Event loop only ----------------
+
+    def _arm(self, device_id):
+        self._cancel_timer(device_id)
+        self.timers[device_id] = self.loop.call_later(self.silence_threshold, self._end, device_id, "silence")
+
+        session = self.sessions.find(device_id)
+        if session is None or not self.buffer_callbacks:
+            return
+        words = session.words()
+        for callback in self.buffer_callbacks:
+            try:
+                callback(device_id, words)
+            except Exception as e:
+                logger.error(f"Buffer callback error: {e}")
+
+    def _cancel_timer(self, device_id):
+        timer = self.timers.pop(device_id, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _end_if_resting(self, device_id, stats):
+        # Skip if a new word arrived (new stats object) after rest was seen
+        if self.resting.get(device_id) is stats:
+            self._end(device_id, "rest")
+
+    def _end(self, device_id, reason):
+        self._cancel_timer(device_id)
+        with self.lock:
+            self.resting.pop(device_id, None)
+        session = self.sessions.find(device_id)
+        words = session.take_words() if session is not None else []
+        if not words:
+            return
+        logger.info(f"🛑 End of utterance for {device_id} ({reason}): {words}")
+        for callback in self.callbacks:
+            try:
+                result = callback(device_id, words, reason)
+                if asyncio.iscoroutine(result):
+                    task = self.loop.create_task(result)
+                    self.tasks.add(task)
+                    task.add_done_callback(self.tasks.discard)
+            except Exception as e:
+                logger.error(f"Utterance callback error: {e}")
+
+# Global Instance
+utterance_segmenter = UtteranceSegmenter(
+    silence_threshold=float(os.getenv("SILENCE_THRESHOLD", "3.0")),
+    end_gestures=os.getenv("END_GESTURES", "STOP").split(","),
+    rest_window=int(os.getenv("REST_WINDOW", "0")),
+    rest_std=float(os.getenv("REST_STD", "0.15")),
+)
@@ -0,0 +1,92 @@
+import numpy as np
+from services.rolling_stats import RollingWindow
+
+STATS = ["mean", "std", "min", "max", "delta", "energy"]
+
+class WindowFeatureExtractor:
+    """
+    Streaming windowed features shared by training and live inference.
+
+    For every sample the feature vector is the raw frame followed by, for
+    each window size, the rolling mean/std/min/max/delta/energy of every
+    channel. Each update is O(1) per sample, so the live path costs the
+    same whether the window is 5 or 500 frames.
+    """
+
+    def __init__(self, windows=(10, 30), columns=('f1', 'f2', 'f3', 'f4', 'ax', 'ay', 'az')):
+        self.windows = tuple(int(w) for w in windows)
+        self.columns = list(columns)
+        self.rolling = [RollingWindow(w, len(self.columns)) for w in self.windows]
+
+    @property
+    def n_features(self):
+        return len(self.columns) * (1 + len(STATS) * len(self.windows))
+
+    def feature_names(self):
+        names = list(self.columns)
+        for w in self.windows:
+            for stat in STATS:
+                names += [f"{c}_{stat}_{w}" for c in self.columns]
+        return names
+
+    def reset(self):
+        for r in self.rolling:
+            r.reset()
+
+    def update(self, frame):
+        """Push one frame and return its feature vector."""
+        frame = np.asarray(frame, dtype=np.float64)
+        parts = [frame]
+        for r in self.rolling:
+            r.push(frame)
+            parts += [r.mean(), r.std(), r.min(), r.max(), r.delta(), r.energy()]
+        return np.concatenate(parts)
+
+    def transform(self, frames):
+        """Features for consecutive frames of one stream (keeps state between calls)."""
+        out = np.empty((len(frames), self.n_features), dtype=np.float64)
+        for i, frame in enumerate(np.asarray(frames, dtype=np.float64)):
+            out[i] = self.update(frame)
+        return out
+
+    def transform_runs(self, frames, run_ids):
+        """
+        Offline features for a recording made of several independent runs
+        (e.g. one run per recorded word). State is reset at every run
+        boundary so windows never mix two recordings.
+        """
+        frames = np.asarray(frames, dtype=np.float64)
+        run_ids = np.asarray(run_ids)
+        out = np.empty((len(frames), self.n_features), dtype=np.float64)
+        starts = np.flatnonzero(np.r_[True, run_ids[1:] != run_ids[:-1]])
+        ends = np.r_[starts[1:], len(frames)]
+        for start, end in zip(starts, ends):
+            self.reset()
+            out[start:end] = self.transform(frames[start:end])
+        self.reset()
+        return out
+
+def label_runs(labels):
+    """Run id per row: increments whenever the label changes (contiguous recordings)."""
+    labels = np.asarray(labels)
+    return np.cumsum(np.r_[True, labels[1:] != labels[:-1]]) - 1
+
+def run_chunks(runs, chunk, warmup=0):
+    """
+    Train/test groups for windowed features computed over whole runs: each
+    run is split into `chunk`-frame chunks (adjacent frames are near
+    identical, so whole chunks are held out). Returns (chunk ids, keep),
+    where keep drops the first `warmup` rows of every chunk after a run's
+    first one, whose windows would still reach into the previous chunk.
+    """
+    runs = np.asarray(runs)
+    chunk_ids = np.zeros(len(runs), dtype=int)
+    keep = np.ones(len(runs), dtype=bool)
+    next_id = 0
+    for run in np.unique(runs):
+        idx = np.flatnonzero(runs == run)
+        position = np.arange(len(idx))
+        chunk_ids[idx] = next_id + position // chunk
+        keep[idx] = (position < chunk) | (position % chunk >= warmup)
+        next_id = chunk_ids[idx[-1]] + 1
+    return chunk_ids, keep
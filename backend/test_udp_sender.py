@@ -1,36 +1,59 @@
+import argparse
 import socket
 import time
 import random
 import json
 
+from services.frame_codec import encode_binary_frame
+
 UDP_IP = "127.0.0.1" # Send to Localhost backend
 UDP_PORT = 5005
 
+parser = argparse.ArgumentParser(description="Mimics the ESP32 sending sensor data over UDP")
+parser.add_argument("--rate", type=float, default=10, help="Frames per second (default 10)")
+parser.add_argument("--batch", type=int, default=1, help="Frames packed per datagram (default 1)")
+parser.add_argument("--binary", action="store_true", help="Send binary v1 frames instead of CSV text")
+parser.add_argument("--device", type=int, default=1, help="Glove id (binary frames / CSV device field)")
+parser.add_argument("--quiet", action="store_true", help="Don't print every datagram")
+args = parser.parse_args()
+
 print(f"📡 Starting UDP Test Sender to {UDP_IP}:{UDP_PORT}")
+print(f"   {args.rate:g} Hz, {args.batch} frame(s)/datagram, {'binary' if args.binary else 'CSV'} frames")
 print("This mimics the ESP32 sending sensor data.")
 print("Watch your Web Dashboard - you should see values changing!")
 print("Press Ctrl+C to stop.\n")
 
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
+def make_frame(seq):
+    # Simulate Flex (0-4095) + Acc (0-10)
+    # Format: f1,f2,f3,f4,ax,ay,az
+    flex = [random.randint(1000, 3000) for _ in range(4)]
+    acc = [round(random.uniform(-1, 1), 2), round(random.uniform(-1, 1), 2), round(random.uniform(9, 10), 2)]
+
+    if args.binary:
+        return encode_binary_frame(args.device, seq, int(time.time() * 1000), flex, acc)
+    return f"{flex[0]},{flex[1]},{flex[2]},{flex[3]},{acc[0]},{acc[1]},{acc[2]},glove-{args.device}"
+
+seq = 0
+interval = args.batch / args.rate # Seconds between datagrams
+next_send = time.perf_counter()
+
 try:
     while True:
-        # Simulate Flex (0-4095) + Acc (0-10)
-        # Format: f1,f2,f3,f4,ax,ay,az
-        f1 = random.randint(1000, 3000)
-        f2 = random.randint(1000, 3000)
-        f3 = random.randint(1000, 3000)
-        f4 = random.randint(1000, 3000)
-        ax = round(random.uniform(-1, 1), 2)
-        ay = round(random.uniform(-1, 1), 2)
-        az = round(random.uniform(9, 10), 2)
-
-        message = f"{f1},{f2},{f3},{f4},{ax},{ay},{az}"
-        
-        sock.sendto(message.encode(), (UDP_IP, UDP_PORT))
-        print(f"Sent: {message}")
-        
-        time.sleep(0.1) # 10Hz
+        frames = [make_frame(seq + i) for i in range(args.batch)]
+        seq += args.batch
+
+        # Binary frames are fixed size (packed back to back), text is newline-delimited
+        message = b"".join(frames) if args.binary else "\n".join(frames).encode()
+
+        sock.sendto(message, (UDP_IP, UDP_PORT))
+        if not args.quiet:
+            print(f"Sent: {len(frames)} frame(s), {len(message)} bytes" if args.batch > 1 or args.binary else f"Sent: {frames[0]}")
+
+        # Pace on an absolute schedule so high rates don't drift
+        next_send += interval
+        time.sleep(max(0.0, next_send - time.perf_counter()))
 
 except KeyboardInterrupt:
     print("\nStopped.")
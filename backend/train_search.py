@@ -0,0 +1,295 @@
+# train_search.py
+# Model search for the gesture classifier: grid or random search over model
+# families and sizes, each candidate scored with grouped k-fold
+# cross-validation (no frames of the same recording chunk on both sides,
+# since adjacent frames are near-identical) and timed on the live path
+# (one frame per predict call, flattened forests as MLService runs them).
+# Candidates are evaluated in a process pool across all cores; the report
+# (JSON + Markdown table) is saved so runs can be compared.
+#
+# Usage (from backend/):
+#   python train_search.py                                   (ML/ + yash/ training_data.csv)
+#   python train_search.py --data ../yash/recordings --search random --n-iter 20
+#   python train_search.py --budget 0.5 --save               (export the fastest model within 0.5 pt of the best)
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GroupKFold
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from services.flat_forest import FlatForest
+from services.recording_store import FEATURES, RecordingStore, read_csv_recording
+from services.tiny_models import load_flat_model
+from services.window_features import label_runs
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA = [os.path.join(BASE_DIR, "..", "ML", "training_data.csv"),
+                os.path.join(BASE_DIR, "..", "yash", "training_data.csv")]
+GLOVE_HZ = 33
+
+# Model family -> parameter grid
+SEARCH_SPACE = {
+    "random_forest": {"n_estimators": [10, 25, 50, 100], "max_depth": [6, 10, 15, None]},
+    "extra_trees": {"n_estimators": [10, 25, 50, 100], "max_depth": [6, 10, 15, None]},
+    "decision_tree": {"max_depth": [4, 6, 8, 12, None]},
+    "knn": {"n_neighbors": [1, 5, 15]},
+    "logistic": {"C": [0.1, 1.0, 10.0]},
+}
+
+def build_model(family, params, seed=42):
+    if family == "random_forest":
+        return RandomForestClassifier(random_state=seed, **params)
+    if family == "extra_trees":
+        return ExtraTreesClassifier(random_state=seed, **params)
+    if family == "decision_tree":
+        return DecisionTreeClassifier(random_state=seed, **params)
+    if family == "knn":
+        return make_pipeline(StandardScaler(), KNeighborsClassifier(**params))
+    if family == "logistic":
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=2000, **params))
+    raise ValueError(f"Unknown model family '{family}'")
+
+def live_predictor(model):
+    """What MLService would run: tree ensembles flattened to FlatForest, others as-is."""
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)):
+        return FlatForest.from_sklearn(model)
+    return model
+
+def candidates(families, search, n_iter, seed):
+    grid = [(family, dict(zip(SEARCH_SPACE[family], values)))
+            for family in families
+            for values in itertools.product(*SEARCH_SPACE[family].values())]
+    if search == "random" and n_iter < len(grid):
+        grid = random.Random(seed).sample(grid, n_iter)
+    return grid
+
+# ---------------- Data ----------------
+
+def load_data(paths, chunk):
+    """
+    Features, labels and CV groups from recording stores and/or CSVs. A
+    group is a `chunk`-frame piece of one recording session (a CSV's label
+    runs count as sessions), so folds never split adjacent frames.
+    """
+    X, y, sessions = [], [], []
+    next_session = 0
+    for path in paths:
+        if os.path.isdir(path):
+            data = RecordingStore(path).load()
+            labeled = np.asarray(data.labels) >= 0
+            X.append(np.asarray(data.features, dtype=np.float64)[labeled])
+            y.append(data.classes[np.asarray(data.labels)[labeled]].astype(str))
+            sessions.append(np.asarray(data.sessions)[labeled] + next_session)
+        else:
+            df = read_csv_recording(path).dropna(subset=FEATURES + ['label'])
+            X.append(df[FEATURES].to_numpy(dtype=np.float64))
+            y.append(df['label'].astype(str).str.strip().str.upper().to_numpy())
+            sessions.append(np.full(len(df), next_session))
+        next_session = sessions[-1].max() + 1 if len(sessions[-1]) else next_session
+    X, y, sessions = np.concatenate(X), np.concatenate(y), np.concatenate(sessions)
+
+    # Contiguous (session, label) runs, split into chunks
+    runs = label_runs(np.char.add(sessions.astype(str), np.char.add("/", y.astype(str))))
+    groups = np.zeros(len(y), dtype=np.int64)
+    next_id = 0
+    for run in np.unique(runs):
+        idx = np.flatnonzero(runs == run)
+        groups[idx] = next_id + np.arange(len(idx)) // chunk
+        next_id = groups[idx[-1]] + 1
+    return X, y, groups
+
+# ---------------- Worker processes ----------------
+
+_DATA = {}
+
+def _init_worker(X, y, groups, folds):
+    _DATA.update(X=X, y=y, groups=groups, folds=folds)
+
+def _evaluate(family, params):
+    """Cross-validate one candidate; returns scores and the first fold's model (timed by the parent)."""
+    X, y, groups = _DATA["X"], _DATA["y"], _DATA["groups"]
+    scores, fit_times = [], []
+    first_model = None
+    for train_idx, test_idx in GroupKFold(n_splits=_DATA["folds"]).split(X, y, groups):
+        model = build_model(family, params)
+        start = time.perf_counter()
+        model.fit(X[train_idx], y[train_idx])
+        fit_times.append(time.perf_counter() - start)
+        scores.append(float(np.mean(model.predict(X[test_idx]) == y[test_idx])))
+        if first_model is None:
+            first_model = model
+    return {
+        "family": family,
+        "params": params,
+        "accuracy": float(np.mean(scores)),
+        "accuracy_std": float(np.std(scores)),
+        "fold_accuracy": scores,
+        "fit_seconds": float(np.mean(fit_times)),
+    }, first_model
+
+def frame_latency(model, frames, repeat=3):
+    """Best mean seconds per frame over `repeat` passes, one frame per predict call."""
+    predictor = live_predictor(model)
+    predictor.predict(frames[:1]) # Warm up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            predictor.predict(frame[None, :])
+        best = min(best, (time.perf_counter() - start) / len(frames))
+    return best
+
+def save_checked(predictor, path, X, replace=True):
+    """
+    Save a flat model (FlatForest / TinyNet), load it back the way MLService
+    does and compare its predictions on X before it replaces `path`
+    (replace=False: leave the checked file next to it and return its path).
+    """
+    tmp_path = f"{path[:-len('.npz')]}.tmp.npz" # np.savez keeps a .npz suffix as-is
+    predictor.save(tmp_path)
+    try:
+        mismatches = int(np.sum(load_flat_model(tmp_path).predict(X) != predictor.predict(X)))
+        if mismatches:
+            raise ValueError(f"Reloaded {path} differs on {mismatches}/{len(X)} frames")
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    if not replace:
+        return tmp_path
+    os.replace(tmp_path, path)
+    return path
+
+# ---------------- Report ----------------
+
+def pick(results, budget):
+    """Fastest candidate whose accuracy is within `budget` percentage points of the best."""
+    best = max(r["accuracy"] for r in results)
+    eligible = [r for r in results if r["accuracy"] >= best - budget / 100.0]
+    return min(eligible, key=lambda r: r["latency_us"])
+
+def describe(result):
+    params = ", ".join(f"{k}={v}" for k, v in result["params"].items())
+    return f"{result['family']}({params})"
+
+def markdown(report):
+    lines = [
+        f"# Model search {report['created']}",
+        "",
+        f"- data: {', '.join(report['data'])} ({report['frames']} frames, {report['groups']} groups, "
+        f"{report['folds']}-fold GroupKFold, chunk {report['chunk']})",
+        f"- classes: {', '.join(report['classes'])}",
+        f"- chosen (fastest within {report['budget']} pt of best): **{describe(report['chosen'])}**",
+        "",
+        "| model | accuracy | ± | µs/frame | x realtime | fit s |",
+        "|---|---:|---:|---:|---:|---:|",
+    ]
+    for r in report["results"]:
+        lines.append(f"| {describe(r)} | {r['accuracy'] * 100:.2f}% | {r['accuracy_std'] * 100:.2f} | "
+                     f"{r['latency_us']:.0f} | {r['realtime']:.0f} | {r['fit_seconds']:.2f} |")
+    return "\n".join(lines) + "\n"
+
+def main():
+    parser = argparse.ArgumentParser(description="Grouped-CV model search with live latency")
+    parser.add_argument("--data", nargs="+", default=DEFAULT_DATA, help="Recording store dirs and/or CSVs")
+    parser.add_argument("--families", nargs="+", default=list(SEARCH_SPACE), choices=list(SEARCH_SPACE))
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--n-iter", type=int, default=20, help="Candidates for --search random")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=100, help="Frames per CV group within a session")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--budget", type=float, default=0.5, help="Accuracy budget (percentage points)")
+    parser.add_argument("--latency-frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="reports", help="Report directory")
+    parser.add_argument("--save", action="store_true",
+                        help="Fit the chosen model on all data and write models/signspeak.pkl (+ .npz for trees)")
+    args = parser.parse_args()
+
+    X, y, groups = load_data(args.data, args.chunk)
+    todo = candidates(args.families, args.search, args.n_iter, args.seed)
+    print(f"📊 {len(y)} frames, {len(np.unique(y))} classes, {len(np.unique(groups))} groups; "
+          f"{len(todo)} candidates x {args.folds} folds on {args.jobs} worker(s)\n")
+
+    evaluated = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                             initargs=(X, y, groups, args.folds)) as pool:
+        futures = [pool.submit(_evaluate, family, params) for family, params in todo]
+        for future in as_completed(futures):
+            result, model = future.result()
+            evaluated.append((result, model))
+            print(f"   {describe(result):<55} {result['accuracy'] * 100:6.2f}%  (fit {result['fit_seconds']:.2f}s)")
+    elapsed = time.perf_counter() - start
+
+    # Timed after the pool is done, one model at a time, so training does not skew latency
+    print("\n⏱️ Timing single-frame inference...")
+    latency_frames = X[np.random.default_rng(args.seed).permutation(len(X))[:args.latency_frames]]
+    results = []
+    for result, model in evaluated:
+        result["latency_us"] = frame_latency(model, latency_frames) * 1e6
+        result["realtime"] = 1e6 / (result["latency_us"] * GLOVE_HZ)
+        results.append(result)
+
+    results.sort(key=lambda r: (-r["accuracy"], r["latency_us"]))
+    chosen = pick(results, args.budget)
+    created = time.strftime("%Y%m%d-%H%M%S")
+    report = {
+        "created": created,
+        "data": [os.path.normpath(p) for p in args.data],
+        "frames": int(len(y)),
+        "groups": int(len(np.unique(groups))),
+        "classes": sorted(np.unique(y).tolist()),
+        "folds": args.folds,
+        "chunk": args.chunk,
+        "search": args.search,
+        "budget": args.budget,
+        "seconds": round(elapsed, 1),
+        "chosen": chosen,
+        "results": results,
+    }
+
+    os.makedirs(args.out, exist_ok=True)
+    base = os.path.join(args.out, f"train_search-{created}")
+    with open(f"{base}.json", "w") as f:
+        json.dump(report, f, indent=2)
+    with open(f"{base}.md", "w") as f:
+        f.write(markdown(report))
+    for r in results:
+        print(f"   {describe(r):<55} {r['accuracy'] * 100:6.2f}%  {r['latency_us']:7.0f} µs/frame")
+    print(f"\n🏁 Best accuracy: {describe(results[0])} {results[0]['accuracy'] * 100:.2f}%")
+    print(f"⚡ Chosen (fastest within {args.budget} pt): {describe(chosen)} "
+          f"{chosen['accuracy'] * 100:.2f}%, {chosen['latency_us']:.0f} µs/frame")
+    print(f"Report: {base}.json / .md ({elapsed:.1f}s)")
+
+    if args.save:
+        model = build_model(chosen["family"], chosen["params"]).fit(X, y)
+        predictor = live_predictor(model)
+        npz_path = os.path.join("models", "signspeak.npz")
+        checked = None
+        if isinstance(predictor, FlatForest):
+            # Checked before anything is replaced, so a bad export never reaches the backend
+            checked = save_checked(predictor, npz_path, X, replace=False)
+        elif os.path.exists(npz_path):
+            # MLService prefers the flat model; a non-tree model must not be shadowed by a stale one
+            os.remove(npz_path)
+        joblib.dump(model, os.path.join("models", "signspeak.pkl"))
+        if checked:
+            os.replace(checked, npz_path)
+            os.utime(npz_path) # Newer than the pickle, or MLService warns about a stale export
+        print(f"✅ Saved {describe(chosen)} to models/signspeak.pkl"
+              + (" and models/signspeak.npz" if isinstance(predictor, FlatForest) else ""))
+
+if __name__ == "__main__":
+    main()
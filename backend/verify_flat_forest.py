@@ -0,0 +1,61 @@
+# verify_flat_forest.py
+# Parity check: the flat forest, saved to .npz and loaded back the way
+# export_model.py / MLService do, must give the same labels as the sklearn
+# model on every row of the training CSVs; also reports per-frame latency.
+#
+# Usage (from backend/): python verify_flat_forest.py [models/signspeak.pkl]
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from services.flat_forest import FlatForest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_FILES = [
+    os.path.join(BASE_DIR, "..", "ML", "training_data.csv"),
+    os.path.join(BASE_DIR, "..", "yash", "training_data.csv"),
+]
+
+def load_features(path):
+    df = pd.read_csv(path, header=None).dropna()
+    return df.iloc[:, :7].to_numpy(dtype=float)
+
+def time_per_frame(predict, X, repeats=500):
+    start = time.perf_counter()
+    for i in range(repeats):
+        predict(X[i % len(X)][None, :])
+    return (time.perf_counter() - start) / repeats
+
+def main():
+    pkl_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(BASE_DIR, "models", "signspeak.pkl")
+    model = joblib.load(pkl_path)
+    # Round-trip through the file format the backend actually loads
+    with tempfile.TemporaryDirectory() as tmp:
+        npz_path = os.path.join(tmp, "signspeak.npz")
+        FlatForest.from_sklearn(model).save(npz_path)
+        forest = FlatForest.load(npz_path)
+
+    ok = True
+    for path in CSV_FILES:
+        X = load_features(path)
+        expected = model.predict(X)
+        actual = forest.predict(X)
+        mismatches = int(np.sum(expected != actual))
+        status = "✅" if mismatches == 0 else "❌"
+        print(f"{status} {os.path.normpath(path)}: {len(X)} rows, {mismatches} mismatches")
+        ok = ok and mismatches == 0
+
+    X = load_features(CSV_FILES[0])
+    sk_time = time_per_frame(model.predict, X, repeats=100)
+    flat_time = time_per_frame(forest.predict, X)
+    print(f"\nPer-frame predict: sklearn {sk_time * 1e6:.0f} µs | flat {flat_time * 1e6:.0f} µs")
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# verify_frame_codec.py
+# Parity check: decode_text_lines (vectorized path for uniform datagrams)
+# must give the same device ids and values as decoding every line on its
+# own with decode_text, for single- and multi-frame datagrams alike.
+#
+# Usage (from backend/): python verify_frame_codec.py
+import sys
+
+import numpy as np
+
+from services.frame_codec import decode_text, decode_text_lines
+
+DEFAULT_DEVICE = "10.0.0.7"
+ROW = "512,1024,2048,4095,0.12,-9.81,0.5"
+
+# name -> datagram text
+CASES = {
+    "7 values": f"{ROW}\n{ROW}\n{ROW}\n",
+    "device id": f"{ROW},glove-2\n{ROW},glove-2\n",
+    "empty device id": f"{ROW},\n{ROW},\n",
+    "numeric 8th column": f"{ROW},9\n{ROW},9\n",
+    "mixed device ids": f"{ROW},glove-1\n{ROW},glove-2\n",
+    "mixed widths": f"{ROW}\n{ROW},glove-3\n1,2,3,4,5,6,7,8,9\n",
+    "truncated line": f"{ROW},{ROW}\n1,2,3,4,5,6\n",
+    "corrupt value": f"{ROW}\n512,x,2048,4095,0.12,-9.81,0.5\n{ROW}\n",
+    "TCP 11 values": "1,2,3,4,5,0.1,0.2,0.3,4,5,6\n1,2,3,4,5,0.1,0.2,0.3,4,5,6\n",
+}
+
+def frames(blocks):
+    """(device_id, flex, acc, gyro) per frame, whatever the block grouping."""
+    out = []
+    for block in blocks:
+        for i in range(len(block.flex)):
+            out.append((block.device_id, block.flex[i].tolist(), block.acc[i].tolist(), block.gyro[i].tolist()))
+    return out
+
+def per_line(text):
+    blocks = []
+    for line in text.splitlines():
+        try:
+            block = decode_text(line, DEFAULT_DEVICE)
+        except (ValueError, IndexError):
+            continue
+        if block is not None:
+            blocks.append(block)
+    return blocks
+
+def main():
+    ok = True
+    for name, text in CASES.items():
+        expected = frames(per_line(text))
+        actual = frames(decode_text_lines(text, DEFAULT_DEVICE))
+        same = len(expected) == len(actual) and all(
+            e[0] == a[0] and all(np.allclose(x, y) for x, y in zip(e[1:], a[1:]))
+            for e, a in zip(expected, actual))
+        devices = sorted({f[0] for f in actual})
+        print(f"{'✅' if same else '❌'} {name}: {len(actual)} frames, devices {devices}"
+              + ("" if same else f" (line by line: {len(expected)} frames, devices {sorted({f[0] for f in expected})})"))
+        ok = ok and same
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
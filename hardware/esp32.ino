@@ -15,6 +15,28 @@ WiFiUDP udp;
 const char* laptopIP = "192.168.137.1";   // Laptop / Receiver IP
 const int udpPort = 5005;
 
+// ============ FRAME FORMAT ==============
+// 0 = CSV text "f1,f2,f3,f4,ax,ay,az" (default)
+// 1 = compact binary frame (v1), decoded by backend/services/frame_codec.py.
+//     Smaller packets, no float formatting/parsing, and sequence numbers let
+//     the backend count lost frames (shown as "frames_lost" in /sensors).
+#define USE_BINARY_FRAMES 0
+const uint16_t DEVICE_ID = 1;   // unique per glove -> "glove-1" in the backend
+
+// Binary frame v1: little-endian, packed, 46 bytes
+struct __attribute__((packed)) SensorFrame {
+  char magic[2];         // 'S','G'
+  uint8_t version;       // 1
+  uint8_t flags;         // reserved, 0
+  uint16_t deviceId;     // DEVICE_ID
+  uint32_t seq;          // +1 per frame
+  uint32_t timestampMs;  // millis()
+  int16_t flex[4];       // smoothed ADC counts (0-4095)
+  float acc[3];          // m/s^2
+  float gyro[3];         // rad/s
+};
+uint32_t frameSeq = 0;
+
 // ================= FLEX =================
 const int flexPins[] = {34, 35, 32, 33}; // Index, Middle, Ring, Pinky
 const int FLEX_COUNT = 4;
@@ -75,6 +97,28 @@ void loop() {
   sensors_event_t a, g, temp;
   mpu.getEvent(&a, &g, &temp);
 
+#if USE_BINARY_FRAMES
+  // ===== Binary Packet =====
+  SensorFrame frame;
+  frame.magic[0] = 'S';
+  frame.magic[1] = 'G';
+  frame.version = 1;
+  frame.flags = 0;
+  frame.deviceId = DEVICE_ID;
+  frame.seq = frameSeq++;
+  frame.timestampMs = millis();
+  for (int f = 0; f < FLEX_COUNT; f++) frame.flex[f] = getSmoothFlex(f);
+  frame.acc[0] = a.acceleration.x;
+  frame.acc[1] = a.acceleration.y;
+  frame.acc[2] = a.acceleration.z;
+  frame.gyro[0] = g.gyro.x;
+  frame.gyro[1] = g.gyro.y;
+  frame.gyro[2] = g.gyro.z;
+
+  udp.beginPacket(laptopIP, udpPort);
+  udp.write((const uint8_t*)&frame, sizeof(frame));
+  udp.endPacket();
+#else
   // ===== CSV Packet =====
   String packet =
     String(getSmoothFlex(0)) + "," +
@@ -92,6 +136,7 @@ void loop() {
 
   // Debug (optional)
   Serial.println(packet);
+#endif
 
   writeIdx = (writeIdx + 1) % WINDOW_SIZE;
   delay(30); // ~33Hz
@@ -18,6 +18,7 @@ function App() {
   const [isSystemOn, setIsSystemOn] = useState(true);
 
   const autoSpeakRef = useRef(autoSpeak);
+  const languageRef = useRef(language); // Read by the long-lived socket handlers
   const lastSpokenGesture = useRef(null);
 
   useEffect(() => {
@@ -28,82 +29,172 @@ function App() {
     autoSpeakRef.current = autoSpeak;
   }, [autoSpeak]);
 
+  useEffect(() => {
+    languageRef.current = language;
+  }, [language]);
+
   const addLog = (message) => {
     const timestamp = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
     setLogs(prev => [{ time: timestamp, message, id: Date.now() }, ...prev].slice(0, 50));
   };
 
-  // ---------------- BACKEND POLLING ----------------
+  // ---------------- BACKEND STREAM ----------------
+  // Live data is pushed over a WebSocket as JSON deltas (/ws). While the
+  // socket is down we poll /sensors and keep reconnecting with backoff.
   const BACKEND_URL = `http://${backendIP}:8000/sensors`;
+  const WS_URL = `ws://${backendIP}:8000/ws?max_hz=20`;
+
+  const gestureRef = useRef(gesture);
+  const sentenceRef = useRef(sentence);
+  useEffect(() => { gestureRef.current = gesture; }, [gesture]);
+  useEffect(() => { sentenceRef.current = sentence; }, [sentence]);
+
+  const handleData = (data) => {
+    const g = data.gesture || 'WAITING';
+    if (g !== 'WAITING' && g !== gestureRef.current) {
+      gestureRef.current = g;
+      setGesture(g);
+      addLog(`Detected: ${g}`);
+
+      // Icon Map
+      const icons = {
+        HELLO: 'fas fa-hand-peace',
+        YES: 'fas fa-thumbs-up',
+        NO: 'fas fa-thumbs-down',
+        STOP: 'fas fa-hand-paper'
+      };
+      setGestureIcon(icons[g] || 'fas fa-hand-paper');
+    }
+
+    // Always update sentence if it changes (Decoupled from gesture)
+    if (data.sentence && data.sentence !== sentenceRef.current) {
+      sentenceRef.current = data.sentence;
+      setSentence(data.sentence);
+      if (autoSpeakRef.current && data.sentence !== 'Processing...' && data.sentence !== 'Waiting for gesture...') {
+        speakSentence(data.sentence);
+      }
+    }
+    if (g === 'WAITING') {
+      setGesture('WAITING');
+      lastSpokenGesture.current = null;
+    }
+  };
+
+  const markConnected = (message) => {
+    setIsConnected(true);
+    setDeviceStatus('CONNECTED');
+    addLog(message);
+  };
 
+  // Settings go to their own endpoint, only when they change
   useEffect(() => {
+    fetch(`http://${backendIP}:8000/config`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ use_gemini: useGemini, lang: language, auto_speak: autoSpeak })
+    }).catch((e) => console.warn("Config update failed:", e));
+  }, [useGemini, language, autoSpeak, backendIP]);
+
+  useEffect(() => {
+    if (!isSystemOn) return;
     let isMounted = true;
+    let socket = null;
+    let pollInterval = null;
+    let reconnectTimer = null;
+    let reconnectDelay = 1000; // Doubles per failed attempt, up to 30 s
     const controller = new AbortController();
     const { signal } = controller;
+    const state = {}; // Merged snapshot + deltas
+
+    const startPolling = () => {
+      if (pollInterval) return;
+      pollInterval = setInterval(() => {
+        const startTime = performance.now();
+
+        fetch(BACKEND_URL, { signal })
+          .then(res => {
+            if (!res.ok) throw new Error('Network response was not ok');
+            return res.json();
+          })
+          .then(data => {
+            if (!isMounted) return;
+            const endTime = performance.now();
+            setLatency(Math.round(endTime - startTime));
+            setIsConnected(connected => {
+              if (!connected) markConnected('Connected (polling)');
+              return true;
+            });
+            handleData(data);
+          })
+          .catch((e) => {
+            if (!isMounted || e.name === 'AbortError') return;
+            // Don't aggressively disconnect on a single failure
+            console.warn("Polling error:", e);
+          });
+      }, 100);
+    };
+
+    const stopPolling = () => {
+      if (pollInterval) clearInterval(pollInterval);
+      pollInterval = null;
+    };
+
+    const scheduleReconnect = () => {
+      if (!isMounted || reconnectTimer) return;
+      startPolling(); // Keep the dashboard live until the stream is back
+      reconnectTimer = setTimeout(() => {
+        reconnectTimer = null;
+        connect();
+      }, reconnectDelay);
+      reconnectDelay = Math.min(reconnectDelay * 2, 30000);
+    };
+
+    const connect = () => {
+      try {
+        socket = new WebSocket(WS_URL);
+      } catch (e) {
+        scheduleReconnect();
+        return;
+      }
+      socket.onopen = () => {
+        if (!isMounted) return;
+        reconnectDelay = 1000;
+        stopPolling();
+        markConnected('Connected (live stream)');
+      };
+      socket.onmessage = (event) => {
+        if (!isMounted) return;
+        const msg = JSON.parse(event.data);
+        if (msg.type === 'snapshot') {
+          // Full state after (re)connecting: drop keys from the old stream
+          Object.keys(state).forEach(key => delete state[key]);
+        }
+        if (msg.type === 'snapshot' || msg.type === 'delta') {
+          Object.assign(state, msg.data);
+          handleData(state);
+        }
+      };
+      socket.onerror = () => {
+        console.warn("WebSocket error; polling until it reconnects");
+      };
+      socket.onclose = () => {
+        scheduleReconnect(); // Also follows onerror
+      };
+    };
 
-    const pollInterval = setInterval(() => {
-      if (!isSystemOn) return;
-      const startTime = performance.now();
-
-      fetch(`${BACKEND_URL}?use_gemini=${useGemini}&lang=${language}&auto_speak=${autoSpeak}`, { signal })
-        .then(res => {
-          if (!res.ok) throw new Error('Network response was not ok');
-          return res.json();
-        })
-        .then(data => {
-          if (!isMounted) return;
-          const endTime = performance.now();
-          setLatency(Math.round(endTime - startTime));
-
-          if (!isConnected) {
-            setIsConnected(true);
-            setDeviceStatus('CONNECTED');
-            addLog(`Connected: ${latency}ms`);
-          }
-
-          const g = data.gesture || 'WAITING';
-          if (g !== 'WAITING' && g !== gesture) {
-            setGesture(g);
-            addLog(`Detected: ${g}`);
-
-            // Icon Map
-            const icons = {
-              HELLO: 'fas fa-hand-peace',
-              YES: 'fas fa-thumbs-up',
-              NO: 'fas fa-thumbs-down',
-              STOP: 'fas fa-hand-paper'
-            };
-            setGestureIcon(icons[g] || 'fas fa-hand-paper');
-          }
-
-          // Always update sentence if it changes (Decoupled from gesture)
-          if (data.sentence && data.sentence !== sentence) {
-            setSentence(data.sentence);
-            if (autoSpeakRef.current && data.sentence !== 'Processing...' && data.sentence !== 'Waiting for gesture...') {
-              speakSentence(data.sentence);
-            }
-          }
-          if (g === 'WAITING') {
-            setGesture('WAITING');
-            lastSpokenGesture.current = null;
-          }
-        })
-        .catch((e) => {
-          if (!isMounted || e.name === 'AbortError') return;
-          // Only disconnect if it's a real error and we were connected
-          // To prevent flickering, maybe we should have a retry count?
-          // For now, let's just log it and NOT aggressively disconnect on single failure
-          console.warn("Polling error:", e);
-          // if (isConnected) setIsConnected(false); // DISABLED aggressive disconnect
-        });
-    }, 100);
+    connect();
 
     return () => {
       isMounted = false;
       controller.abort();
-      clearInterval(pollInterval);
+      if (reconnectTimer) clearTimeout(reconnectTimer);
+      if (socket) {
+        socket.onclose = null;
+        socket.close();
+      }
+      stopPolling();
     };
-  }, [useGemini, gesture, backendIP, language, isSystemOn]);
+  }, [backendIP, isSystemOn]);
 
   // ---------------- TTS ----------------
   const speakSentence = async (text) => {
@@ -111,7 +202,7 @@ function App() {
 
     try {
       // Use Server-Side Playback (Robust)
-      const audioUrl = `http://${backendIP}:8000/audio/speak/server?text=${encodeURIComponent(text)}`;
+      const audioUrl = `http://${backendIP}:8000/audio/speak/server?text=${encodeURIComponent(text)}&lang=${languageRef.current}`;
       await fetch(audioUrl);
     } catch (e) {
       console.warn("Backend TTS failed:", e);
@@ -1,13 +1,17 @@
 import serial
-import csv
 import time
 import os
 import sys
 
+# Columnar recording store shared with the backend (float32 segments, not CSV)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from services.recording_store import RecordingStore, import_csv
+
 # --- CONFIGURATION ---
 PORT = 'COM10'  
 BAUD = 115200
-FILENAME = "training_data.csv"
+RECORDINGS = "recordings" # Store directory (convert old CSVs with backend/convert_recordings.py)
+LEGACY_CSV = "training_data.csv" # Existing dataset; imported into the store before adding to it
 RECORD_TIME = 25  # 25 seconds per word
 GAP_TIME = 5      # 5 seconds to switch gestures
 
@@ -21,7 +25,15 @@ except Exception as e:
     sys.exit()
 
 def capture_sequence(word_list):
-    print(f"Adding data for {word_list} to: {FILENAME}")
+    print(f"Adding data for {word_list} to: {RECORDINGS}/")
+    new_store = not os.path.isdir(RECORDINGS)
+    store = RecordingStore(RECORDINGS)
+
+    # The trainers read only the store once it exists, so a new store starts with the CSV data.
+    # (An existing store already holds it, or is a fresh collect.py dataset that replaced it.)
+    if new_store and os.path.exists(LEGACY_CSV):
+        rows = import_csv(LEGACY_CSV, store)
+        print(f"Imported {rows} existing samples from {LEGACY_CSV}")
 
     for word in word_list:
         # --- PREPARATION PHASE ---
@@ -34,10 +46,9 @@ def capture_sequence(word_list):
         start_time = time.time()
         count = 0
         
-        # 2. Open in 'a' (Append) mode
+        # 2. New session in the store (frames are buffered and written in blocks)
         try:
-            with open(FILENAME, 'a', newline='') as f:
-                writer = csv.writer(f)
+            with store.writer(device=PORT, word=word) as writer:
                 ser.reset_input_buffer() 
                 
                 while (time.time() - start_time) < RECORD_TIME:
@@ -47,7 +58,7 @@ def capture_sequence(word_list):
                             parts = line.split(',')
                             # Expecting 7 values: 4 flex sensors + 3 accel axes
                             if len(parts) == 7:
-                                writer.writerow(parts + [word])
+                                writer.append([float(p) for p in parts], word)
                                 count += 1
                                 
                                 # Progress update
@@ -59,9 +70,11 @@ def capture_sequence(word_list):
             print(f"\n>>> SUCCESS: Finished recording '{word}'")
             
         except PermissionError:
-            print(f"\n❌ ERROR: Permission Denied. Close '{FILENAME}' in Excel/Notepad and try again!")
+            print(f"\n❌ ERROR: Permission Denied writing '{RECORDINGS}/'. Check the folder permissions and try again!")
             return
 
+    store.compact() # One memory-mapped segment for training
+
 # --- TARGET WORDS ---
 target_words = ["AM", "ARE"]
 
@@ -74,7 +87,7 @@ if confirm == 's':
     capture_sequence(target_words)
     print("\n" + "="*40)
     print("ALL DATA SAVED SUCCESSFULLY!")
-    print(f"Your CSV now has updated data for 'AM' and 'ARE'.")
+    print(f"'{RECORDINGS}/' now has updated data for 'AM' and 'ARE'.")
     print("="*40)
     print("Final Step: Run your 'train.py' script to update the model.")
 else:
@@ -1,12 +1,17 @@
 import serial
-import csv
 import time
 import os
+import shutil
+import sys
+
+# Columnar recording store shared with the backend (float32 segments, not CSV)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from services.recording_store import RecordingStore
 
 # --- CONFIGURATION ---
 PORT = 'COM10'
 BAUD = 115200
-FILENAME = "training_data.csv"
+RECORDINGS = "recordings" # Store directory (convert old CSVs with backend/convert_recordings.py)
 RECORD_TIME = 25  # 25 seconds per word
 GAP_TIME = 5      # 5 seconds to change gestures
 
@@ -24,12 +29,13 @@ def start_fresh_collection():
         print(f"ERROR: Could not open {PORT}. Close Arduino Serial Monitor first!")
         return
 
-    # 2. Delete old file to start from scratch
-    if os.path.exists(FILENAME):
-        os.remove(FILENAME)
+    # 2. Delete old recordings to start from scratch
+    if os.path.exists(RECORDINGS):
+        shutil.rmtree(RECORDINGS)
         print(f"Cleaned old data. Starting fresh.")
+    store = RecordingStore(RECORDINGS)
 
-    # 3. Loop through words
+    # 3. Loop through words (one session per word; frames are buffered and written in blocks)
     for word in sentence_words:
         print(f"\n\nNEXT WORD: {word}")
         for i in range(GAP_TIME, 0, -1):
@@ -40,8 +46,7 @@ def start_fresh_collection():
         start_time = time.time()
         samples_captured = 0
         
-        with open(FILENAME, 'a', newline='') as f:
-            writer = csv.writer(f)
+        with store.writer(device=PORT, word=word) as writer:
             ser.reset_input_buffer() 
             
             while (time.time() - start_time) < RECORD_TIME:
@@ -50,7 +55,7 @@ def start_fresh_collection():
                     if line and "," in line:
                         parts = line.split(',')
                         if len(parts) == 7: # Expecting 4 flex + 3 accel
-                            writer.writerow(parts + [word])
+                            writer.append([float(p) for p in parts], word)
                             samples_captured += 1
                             
                             rem = int(RECORD_TIME - (time.time() - start_time))
@@ -61,8 +66,9 @@ def start_fresh_collection():
         print(f"\n>>> SUCCESS: Finished '{word}'")
     
     ser.close()
+    store.compact() # One memory-mapped segment for training
     print("\n" + "="*40)
-    print("ALL DONE! Your new CSV is ready.")
+    print(f"ALL DONE! {len(store)} samples saved in '{RECORDINGS}/'.")
     print("="*40)
 
 # --- EXECUTION ---
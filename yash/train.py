@@ -1,17 +1,22 @@
-import pandas as pd
-import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 import joblib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from services.recording_store import load_training_frame
+
+# Recording store from collect.py (memory-mapped), else the legacy CSV
+DATA = 'recordings' if os.path.isdir('recordings') else 'training_data.csv'
 
 # 1. Load the data
-print("Loading training data...")
-# We use names based on our ESP32 output: 4 flex sensors + 3 accel axes
-cols = ['f1', 'f2', 'f3', 'f4', 'ax', 'ay', 'az', 'label']
+print(f"Loading training data from {DATA}...")
+# Columns follow our ESP32 output: 4 flex sensors + 3 accel axes, then the label
 
 try:
-    df = pd.read_csv('training_data.csv', names=cols)
+    df = load_training_frame(DATA)
     
     # Remove any rows with missing or corrupt data
     df = df.dropna()
@@ -42,6 +47,6 @@ try:
     print("\nModel saved as 'signspeak.pkl'. You are ready for the Detection step!")
 
 except FileNotFoundError:
-    print("ERROR: 'training_data.csv' not found. Did you run the collection script?")
+    print(f"ERROR: '{DATA}' not found. Did you run the collection script?")
 except Exception as e:
     print(f"An error occurred: {e}")
\ No newline at end of file
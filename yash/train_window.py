@@ -0,0 +1,61 @@
+import os
+import sys
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GroupShuffleSplit
+from sklearn.metrics import accuracy_score
+import joblib
+
+# Share the feature code with the live backend (MLService, ML_FEATURES=window)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from services.window_features import WindowFeatureExtractor, label_runs, run_chunks
+from services.recording_store import load_training_frame
+
+# --- SETTINGS ---
+# Recording store from collect.py (memory-mapped), else the legacy CSV
+FILENAME = 'recordings' if os.path.isdir('recordings') else 'training_data.csv'
+MODEL_NAME = 'signspeak_window.pkl'
+COLUMNS = ['f1', 'f2', 'f3', 'f4', 'ax', 'ay', 'az']
+WINDOWS = (10, 30)   # Frames (~0.3s and ~1s at 33Hz)
+CHUNK = 100          # Frames per train/test chunk (adjacent frames are near-identical)
+
+print("--- Starting Windowed Training ---")
+
+try:
+    df = load_training_frame(FILENAME)
+    print(f"Loaded {len(df)} rows. Labels: {list(df['label'].unique())}")
+
+    X_raw = df[COLUMNS].to_numpy(dtype=float)
+    y = df['label'].to_numpy()
+
+    # Each contiguous label run is one recording: window features run over
+    # the whole recording, like the live stream, and the recording is then
+    # split into chunks. Rows whose window still reaches into the previous
+    # chunk are left out so no window spans train and test.
+    runs = label_runs(y)
+    extractor = WindowFeatureExtractor(WINDOWS, COLUMNS)
+    X = extractor.transform_runs(X_raw, runs)
+    chunk_ids, keep = run_chunks(runs, CHUNK, warmup=max(WINDOWS))
+    print(f"Extracted {X.shape[1]} features per frame (windows {WINDOWS})")
+
+    # Hold out whole chunks (not random rows) for an honest accuracy
+    rows = np.flatnonzero(keep)
+    split = GroupShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+    train_idx, test_idx = (rows[i] for i in next(split.split(X[rows], y[rows], groups=chunk_ids[rows])))
+
+    print("Training the Random Forest model... (Please wait)")
+    model = RandomForestClassifier(n_estimators=100, max_depth=15, random_state=42, n_jobs=-1)
+    model.fit(X[train_idx], y[train_idx])
+
+    acc = accuracy_score(y[test_idx], model.predict(X[test_idx]))
+    print(f"Training Complete! Held-out chunk accuracy: {acc * 100:.2f}%")
+
+    joblib.dump({"model": model, "windows": WINDOWS, "columns": COLUMNS}, MODEL_NAME)
+    print(f"Model saved as '{MODEL_NAME}'. Copy it to backend/models/ and set ML_FEATURES=window.")
+
+except FileNotFoundError:
+    print(f"ERROR: '{FILENAME}' not found. Did you run the collection script?")
+except Exception as e:
+    print(f"AN ERROR OCCURRED DURING TRAINING: {e}")
+
+print("--- Script Finished ---")
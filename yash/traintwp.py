@@ -1,11 +1,15 @@
-import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 import joblib
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from services.recording_store import load_training_frame
 
 # --- 1. SETTINGS ---
-FILENAME = 'training_data.csv'
+# Recording store from collect.py (memory-mapped), else the legacy CSV
+FILENAME = 'recordings' if os.path.isdir('recordings') else 'training_data.csv'
 MODEL_NAME = 'signspeak.pkl'
 # 4 flex sensors + 3 accelerometer axes = 7 feature columns
 COLUMNS = ['f1', 'f2', 'f3', 'f4', 'ax', 'ay', 'az', 'label']
@@ -21,8 +25,7 @@ if not os.path.exists(FILENAME):
 # --- 3. LOAD DATA ---
 try:
     print(f"Loading {FILENAME}...")
-    # Use header=None if your CSV doesn't have names at the top
-    df = pd.read_csv(FILENAME, header=None, names=COLUMNS)
+    df = load_training_frame(FILENAME)
     
     # Remove any empty or corrupt rows
     df = df.dropna()